@@ -9,6 +9,9 @@ from dataclasses import dataclass
 from abc import ABC, abstractmethod
 import time
 
+# Bound once so per-frame timestamping skips the module attribute lookup.
+_monotonic = time.monotonic
+
 
 # -----------------------------------------------------------------------------
 # Exceptions
@@ -100,16 +103,22 @@ class DefaultDisplayManager(DisplayManagerInterface):
         self._display_config: Optional[DisplayConfig] = None
         self._frame_count: int = 0
         self._start_time: Optional[float] = None
+        # FPS is only recomputed once a new frame has been captured.
+        self._cached_fps: float = 0.0
+        self._fps_dirty: bool = True
 
     def configure(self, display_config: DisplayConfig) -> None:
         self._display_config = display_config
         self._frame_count = 0
-        self._start_time = time.monotonic()
+        self._start_time = _monotonic()
+        self._cached_fps = 0.0
+        self._fps_dirty = True
 
     def get_frame(self) -> Optional[FrameData]:
         if self._display_config is None:
             return None
         self._frame_count += 1
+        self._fps_dirty = True
         w = int(self._display_config.width * self._display_config.scale)
         h = int(self._display_config.height * self._display_config.scale)
         # Placeholder: 4 bytes per pixel (RGBA), all zeros
@@ -118,7 +127,7 @@ class DefaultDisplayManager(DisplayManagerInterface):
             width=w,
             height=h,
             data=data,
-            timestamp=time.monotonic(),
+            timestamp=_monotonic(),
         )
 
     def get_resolution(self) -> Tuple[int, int]:
@@ -132,17 +141,23 @@ class DefaultDisplayManager(DisplayManagerInterface):
         self._display_config.scale = scale
 
     def get_fps(self) -> float:
+        if not self._fps_dirty:
+            return self._cached_fps
         if self._start_time is None or self._frame_count == 0:
             return 0.0
-        elapsed = time.monotonic() - self._start_time
+        elapsed = _monotonic() - self._start_time
         if elapsed <= 0:
             return 0.0
-        return self._frame_count / elapsed
+        self._cached_fps = self._frame_count / elapsed
+        self._fps_dirty = False
+        return self._cached_fps
 
     def cleanup(self) -> None:
         self._display_config = None
         self._frame_count = 0
         self._start_time = None
+        self._cached_fps = 0.0
+        self._fps_dirty = True
 
 
 # -----------------------------------------------------------------------------
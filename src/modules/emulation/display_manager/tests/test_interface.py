@@ -84,3 +84,9 @@ class TestDisplayManagerInterface:
         """cleanup resets the display to unconfigured state."""
         configured_manager.cleanup()
         assert configured_manager.get_frame() is None
+
+    def test_get_fps_cached_until_next_frame(self, configured_manager):
+        """get_fps reuses the last value until another frame is captured."""
+        configured_manager.get_frame()
+        first = configured_manager.get_fps()
+        assert configured_manager.get_fps() == first
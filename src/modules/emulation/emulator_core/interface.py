@@ -4,10 +4,32 @@ Layer: emulation
 
 CPU virtualization and VM lifecycle management.
 """
-from typing import Dict, Any, Optional, Callable, List
-from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Tuple, Union
+from dataclasses import dataclass, field, fields
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
+import errno
+import functools
+import logging
+import os
+import queue
+import select
+import shutil
+import signal
+import socket
+import threading
+import time
+
+from .internal.kvm_caps import kvm_caps
+from .internal.qemu_process import QEMUProcess, QEMUConfig
+from .internal.snapshot_io import prefetch_snapshot_file
+from .internal.vnc_client import VNCClient
+
+logger = logging.getLogger("linblock.emulator_core")
+
+# Bound once so uptime and readiness timing skip the module attribute lookup.
+_monotonic = time.monotonic
 
 
 # -----------------------------------------------------------------------------
@@ -34,6 +56,7 @@ class VMNotRunningError(EmulatorCoreError):
 # -----------------------------------------------------------------------------
 
 class VMState(Enum):
+    # Values shared with internal.qemu_process.QEMUState must stay identical.
     STOPPED = "stopped"
     STARTING = "starting"
     RUNNING = "running"
@@ -41,8 +64,20 @@ class VMState(Enum):
     STOPPING = "stopping"
     ERROR = "error"
 
+    bit: int  # assigned below
+
+
+# One bit per VMState so lifecycle checks are a single mask test.
+for _bit_index, _member in enumerate(VMState):
+    _member.bit = 1 << _bit_index
+del _bit_index, _member
+
+_ACTIVE_STATES = VMState.RUNNING.bit | VMState.PAUSED.bit
+_LIVE_STATES = _ACTIVE_STATES | VMState.STARTING.bit
+_STARTED_STATES = VMState.RUNNING.bit | VMState.STARTING.bit
+
 
-@dataclass
+@dataclass(slots=True)
 class VMConfig:
     memory_mb: int = 4096
     cpu_cores: int = 4
@@ -59,7 +94,16 @@ class VMConfig:
     gpu_mode: str = "host"
 
 
-@dataclass
+# Config keys that map directly onto VMConfig fields.
+_VMCONFIG_FIELDS = frozenset(f.name for f in fields(VMConfig))
+
+
+def _vm_config_from(config: Dict[str, Any]) -> VMConfig:
+    """Build a VMConfig from a module config dict, ignoring unknown keys."""
+    return VMConfig(**{k: v for k, v in config.items() if k in _VMCONFIG_FIELDS})
+
+
+@dataclass(slots=True)
 class VMInfo:
     state: VMState = VMState.STOPPED
     pid: Optional[int] = None
@@ -70,14 +114,24 @@ class VMInfo:
     error_message: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class FrameBuffer:
-    """Container for display framebuffer data."""
+    """
+    Container for display framebuffer data.
+
+    ``data`` references the pixel buffer received from the VNC client
+    without copying it. Consumers must treat it as read-only and call
+    tobytes() when they need a private copy.
+    """
     width: int = 0
     height: int = 0
-    data: bytes = b""
+    data: Union[bytes, memoryview] = b""
     format: str = "bgra"
 
+    def tobytes(self) -> bytes:
+        """Return the pixel data as an independent bytes object."""
+        return bytes(self.data)
+
 
 # -----------------------------------------------------------------------------
 # Interface
@@ -90,6 +144,9 @@ class EmulatorCoreInterface(ABC):
     All implementations must inherit from this class.
     """
 
+    # Lets implementations that declare __slots__ drop the instance dict.
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self, config: Dict[str, Any]) -> None:
         """Initialize module with configuration."""
@@ -151,6 +208,189 @@ class EmulatorCoreInterface(ABC):
         pass
 
 
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+
+def _as_framebuffer(frame_data) -> FrameBuffer:
+    """Wrap a VNC frame as a FrameBuffer, sharing its pixel buffer."""
+    if isinstance(frame_data, FrameBuffer):
+        return frame_data
+    return FrameBuffer(
+        width=frame_data.width,
+        height=frame_data.height,
+        data=frame_data.data,
+        format=frame_data.format
+    )
+
+
+def _proc_start_time(pid: int) -> Optional[int]:
+    """
+    Return a process's start time in clock ticks since boot.
+
+    Reads field 22 of /proc/<pid>/stat. Paired with the PID it identifies
+    a process uniquely, guarding against the kernel recycling the PID.
+
+    Returns:
+        Start time, or None if the process is gone or /proc is unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+        # The command name may contain spaces; fields resume after its ')'.
+        return int(stat[stat.rindex(b")") + 2:].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _kill_if_same_process(pid: int, start_time: Optional[int]) -> None:
+    """
+    SIGKILL a process only if it is alive and still the one we launched.
+
+    Args:
+        pid: Process ID to kill
+        start_time: Start time recorded at launch, or None if unknown
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return
+    except PermissionError:
+        # Alive but owned by someone else: the PID has been reused.
+        return
+    if start_time is not None and _proc_start_time(pid) != start_time:
+        return
+    os.kill(pid, signal.SIGKILL)
+
+
+class _CoalescingFrameCallback:
+    """
+    Runs a frame callback on a worker thread, keeping only the newest frame.
+
+    Calling the wrapper never blocks: if the worker has not yet taken the
+    previous frame, that frame is replaced. Exceptions never reach the
+    caller, so the worker reports each outcome through on_error (called
+    inside the except block) and on_success, with the wrapped callback.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[FrameBuffer], None],
+        on_error: Optional[Callable[[Callable], None]] = None,
+        on_success: Optional[Callable[[Callable], None]] = None,
+    ) -> None:
+        self.callback = callback
+        self._on_error = on_error
+        self._on_success = on_success
+        self._queue: "queue.Queue[Optional[FrameBuffer]]" = queue.Queue(maxsize=1)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __call__(self, frame: FrameBuffer) -> None:
+        # The caller reuses its FrameBuffer, and its data may be a view of
+        # a receive slot that is overwritten while this consumer is still
+        # busy, so queue a private FrameBuffer with its own pixels.
+        data = frame.data
+        if data is not None:
+            data = bytes(data)
+        pending = FrameBuffer(frame.width, frame.height, data, frame.format)
+        with self._lock:
+            if not self._closed:
+                self._replace(pending)
+
+    def _replace(self, item: Optional[FrameBuffer]) -> None:
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put_nowait(item)
+
+    def _run(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            try:
+                self.callback(frame)
+            except Exception:
+                if self._on_error is not None:
+                    self._on_error(self.callback)
+            else:
+                if self._on_success is not None:
+                    self._on_success(self.callback)
+
+    def close(self) -> None:
+        """Drop any pending frame and stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._replace(None)
+
+
+@functools.lru_cache(maxsize=1)
+def _qemu_binary_path() -> Optional[str]:
+    """Return the resolved QEMU binary path, looked up once per process."""
+    return shutil.which(QEMUProcess.QEMU_BINARY)
+
+
+# Consecutive exceptions after which a state/frame callback is unregistered.
+MAX_CALLBACK_FAILURES = 3
+
+# Seconds to wait for QEMU's VNC server to accept connections during start().
+VNC_READY_TIMEOUT = 15.0
+
+
+def _wait_vnc_ready(
+    host: str,
+    port: int,
+    deadline: float,
+    cancel: Optional[threading.Event] = None,
+) -> bool:
+    """
+    Wait until a TCP port accepts connections or the deadline passes.
+
+    Probes with non-blocking connects, backing off exponentially from 20ms
+    up to 200ms between attempts.
+
+    Args:
+        host: Host to probe
+        port: TCP port to probe
+        deadline: time.monotonic() value after which to give up
+        cancel: Optional event that aborts the wait when set
+
+    Returns:
+        True if the port accepted a connection, False on timeout or cancel
+    """
+    delay = 0.02
+    while True:
+        wake = _monotonic() + delay
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setblocking(False)
+            err = sock.connect_ex((host, port))
+            if err in (errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK):
+                _, writable, _ = select.select([], [sock], [], delay)
+                if writable:
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err in (0, errno.EISCONN):
+                return True
+
+        now = _monotonic()
+        if now >= deadline or (cancel is not None and cancel.is_set()):
+            return False
+        # A refused connect returns immediately; still honour the backoff.
+        if wake > now:
+            pause = min(wake, deadline) - now
+            if cancel is not None:
+                if cancel.wait(pause):
+                    return False
+            else:
+                time.sleep(pause)
+        delay = min(0.2, delay * 2)
+
+
 # -----------------------------------------------------------------------------
 # Implementation
 # -----------------------------------------------------------------------------
@@ -159,13 +399,7 @@ class DefaultEmulatorCore(EmulatorCoreInterface):
     """Default stub implementation of EmulatorCoreInterface."""
 
     def __init__(self, config: Dict[str, Any]) -> None:
-        self._config = VMConfig(
-            memory_mb=config.get("memory_mb", 4096),
-            cpu_cores=config.get("cpu_cores", 4),
-            use_kvm=config.get("use_kvm", True),
-            kernel_path=config.get("kernel_path"),
-            initrd_path=config.get("initrd_path"),
-        )
+        self._config = _vm_config_from(config)
         self._state = VMState.STOPPED
         self._initialized = False
 
@@ -180,7 +414,7 @@ class DefaultEmulatorCore(EmulatorCoreInterface):
         self._state = VMState.RUNNING
 
     def stop(self) -> None:
-        if self._state not in (VMState.RUNNING, VMState.PAUSED):
+        if not self._state.bit & _ACTIVE_STATES:
             raise VMNotRunningError("VM is not running")
         self._state = VMState.STOPPED
 
@@ -195,7 +429,7 @@ class DefaultEmulatorCore(EmulatorCoreInterface):
         self._state = VMState.RUNNING
 
     def reset(self) -> None:
-        was_running = self._state in (VMState.RUNNING, VMState.PAUSED)
+        was_running = bool(self._state.bit & _ACTIVE_STATES)
         self._state = VMState.STOPPED
         if was_running:
             self._state = VMState.RUNNING
@@ -207,7 +441,7 @@ class DefaultEmulatorCore(EmulatorCoreInterface):
         return VMInfo(state=self._state)
 
     def save_snapshot(self, name: str) -> str:
-        if self._state not in (VMState.RUNNING, VMState.PAUSED):
+        if not self._state.bit & _ACTIVE_STATES:
             raise VMNotRunningError("VM must be running or paused")
         return f"/snapshots/{name}"
 
@@ -216,7 +450,7 @@ class DefaultEmulatorCore(EmulatorCoreInterface):
             raise EmulatorCoreError("Must initialize first")
 
     def cleanup(self) -> None:
-        if self._state in (VMState.RUNNING, VMState.PAUSED):
+        if self._state.bit & _ACTIVE_STATES:
             self._state = VMState.STOPPED
         self._initialized = False
 
@@ -225,87 +459,161 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
     """QEMU-based implementation of EmulatorCoreInterface."""
 
     def __init__(self, config: Dict[str, Any]) -> None:
-        self._config = VMConfig(
-            memory_mb=config.get("memory_mb", 4096),
-            cpu_cores=config.get("cpu_cores", 4),
-            use_kvm=config.get("use_kvm", True),
-            kernel_path=config.get("kernel_path"),
-            initrd_path=config.get("initrd_path"),
-            kernel_cmdline=config.get("kernel_cmdline", ""),
-            system_image=config.get("system_image"),
-            cdrom_image=config.get("cdrom_image"),
-            screen_width=config.get("screen_width", 1080),
-            screen_height=config.get("screen_height", 1920),
-            vnc_port=config.get("vnc_port", 5900),
-            adb_port=config.get("adb_port", 5555),
-            gpu_mode=config.get("gpu_mode", "host"),
-        )
+        self._config = _vm_config_from(config)
         self._state = VMState.STOPPED
         self._initialized = False
         self._qemu_process = None
         self._vnc_client = None
-        self._state_callbacks: List[Callable[[VMState], None]] = []
-        self._frame_callbacks: List[Callable[[FrameBuffer], None]] = []
+        # Copy-on-write tuples: notifiers iterate a stable snapshot without
+        # locking while callbacks are added or removed from other threads.
+        self._state_callbacks: Tuple[Callable[[VMState], None], ...] = ()
+        self._frame_callbacks: Tuple[Callable[[FrameBuffer], None], ...] = ()
+        # Reused for every frame notification to avoid per-frame allocation.
+        self._fb_scratch = FrameBuffer()
+        # Consecutive failure counts, only for callbacks currently failing.
+        self._callback_failures: Dict[Callable, int] = {}
+        # Refreshed in place by get_info() on every call.
+        self._info_cache = VMInfo()
+        self._vnc_address = f"localhost:{self._config.vnc_port}"
         self._error_message = ""
         self._start_time = 0.0
         self._serial_log_path: Optional[str] = None
-        self._kernel_cmdline: str = config.get("kernel_cmdline", "")
+        self._kernel_cmdline: str = self._config.kernel_cmdline
+        self._start_lock = threading.Lock()
+        self._bringup_thread: Optional[threading.Thread] = None
+        self._bringup_cancel = threading.Event()
+        self._qemu_start_time: Optional[int] = None
+        # Single worker so snapshot writes are serialized off the caller.
+        self._snap_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def state(self) -> VMState:
+        """Current VM state; cheaper than get_state() for hot polling."""
+        return self._state
 
     def add_state_callback(self, callback: Callable[[VMState], None]) -> None:
         """Register callback for VM state changes."""
-        self._state_callbacks.append(callback)
+        self._state_callbacks = self._state_callbacks + (callback,)
 
     def remove_state_callback(self, callback: Callable[[VMState], None]) -> None:
         """Unregister state change callback."""
-        if callback in self._state_callbacks:
-            self._state_callbacks.remove(callback)
+        callbacks = self._state_callbacks
+        if callback in callbacks:
+            i = callbacks.index(callback)
+            self._state_callbacks = callbacks[:i] + callbacks[i + 1:]
+
+    def add_frame_callback(
+        self,
+        callback: Callable[[FrameBuffer], None],
+        coalesce: bool = False,
+    ) -> None:
+        """
+        Register callback for framebuffer updates.
 
-    def add_frame_callback(self, callback: Callable[[FrameBuffer], None]) -> None:
-        """Register callback for framebuffer updates."""
-        self._frame_callbacks.append(callback)
+        The FrameBuffer passed to callbacks is reused for every frame.
+        Callbacks must consume it synchronously, or keep frame.tobytes()
+        rather than the object itself.
+
+        Args:
+            callback: Called with each new frame
+            coalesce: Run the callback on its own thread, skipping to the
+                newest frame when it falls behind. Use for slow consumers
+                so they never stall the VNC receiver thread. Such callbacks
+                receive their own FrameBuffer rather than the reused one.
+        """
+        if coalesce:
+            callback = _CoalescingFrameCallback(
+                callback,
+                on_error=functools.partial(
+                    self._callback_failed, remove=self.remove_frame_callback
+                ),
+                on_success=self._callback_succeeded,
+            )
+        self._frame_callbacks = self._frame_callbacks + (callback,)
 
     def remove_frame_callback(self, callback: Callable[[FrameBuffer], None]) -> None:
         """Unregister framebuffer callback."""
-        if callback in self._frame_callbacks:
-            self._frame_callbacks.remove(callback)
+        callbacks = self._frame_callbacks
+        for i, entry in enumerate(callbacks):
+            if entry == callback or (
+                isinstance(entry, _CoalescingFrameCallback) and entry.callback == callback
+            ):
+                self._frame_callbacks = callbacks[:i] + callbacks[i + 1:]
+                if isinstance(entry, _CoalescingFrameCallback):
+                    entry.close()
+                return
 
     def _notify_state(self, state: VMState) -> None:
         """Notify all state callbacks."""
-        old_state = self._state
+        if self._state is state:
+            return
         self._state = state
-        if old_state != state:
-            for callback in self._state_callbacks:
-                try:
-                    callback(state)
-                except Exception:
-                    pass
+        callbacks = self._state_callbacks
+        if not callbacks:
+            return
+        failures = self._callback_failures
+        for callback in callbacks:
+            try:
+                callback(state)
+            except Exception:
+                self._callback_failed(callback, self.remove_state_callback)
+            else:
+                if failures:
+                    failures.pop(callback, None)
 
     def _notify_frame(self, frame_data) -> None:
-        """Notify all frame callbacks."""
-        frame = FrameBuffer(
-            width=frame_data.width,
-            height=frame_data.height,
-            data=frame_data.data,
-            format=frame_data.format
-        )
+        """Notify all frame callbacks via the reused scratch FrameBuffer."""
+        if not self._frame_callbacks:
+            return
+        frame = self._fb_scratch
+        frame.width = frame_data.width
+        frame.height = frame_data.height
+        frame.data = frame_data.data
+        frame.format = frame_data.format
+        failures = self._callback_failures
         for callback in self._frame_callbacks:
             try:
                 callback(frame)
             except Exception:
-                pass
+                self._callback_failed(callback, self.remove_frame_callback)
+            else:
+                if failures:
+                    failures.pop(callback, None)
+
+    def _callback_failed(
+        self,
+        callback: Callable,
+        remove: Callable[[Callable], None],
+    ) -> None:
+        """Log a callback exception and unregister persistently failing ones."""
+        count = self._callback_failures.get(callback, 0) + 1
+        if count < MAX_CALLBACK_FAILURES:
+            self._callback_failures[callback] = count
+            logger.warning("Callback %r raised", callback, exc_info=True)
+            return
+        self._callback_failures.pop(callback, None)
+        logger.error(
+            "Callback %r failed %d times in a row; unregistering it",
+            callback, count, exc_info=True,
+        )
+        # Callback registries are copy-on-write, so removing mid-dispatch is safe.
+        remove(callback)
+
+    def _callback_succeeded(self, callback: Callable) -> None:
+        """Reset the failure count of a callback that ran cleanly."""
+        if self._callback_failures:
+            self._callback_failures.pop(callback, None)
 
     def _on_qemu_state(self, qemu_state) -> None:
         """Handle QEMU state changes."""
-        from .internal.qemu_process import QEMUState
-
-        state_map = {
-            QEMUState.STOPPED: VMState.STOPPED,
-            QEMUState.STARTING: VMState.STARTING,
-            QEMUState.RUNNING: VMState.RUNNING,
-            QEMUState.STOPPING: VMState.STOPPING,
-            QEMUState.ERROR: VMState.ERROR,
-        }
-        vm_state = state_map.get(qemu_state, VMState.ERROR)
+        # QEMUState values are a subset of VMState values.
+        try:
+            vm_state = VMState(qemu_state.value)
+        except ValueError:
+            vm_state = VMState.ERROR
+        if vm_state == VMState.RUNNING and self._state == VMState.STARTING:
+            # The bring-up thread reports RUNNING once the display is ready.
+            return
         self._notify_state(vm_state)
 
     def set_serial_log(self, path: Optional[str]) -> None:
@@ -323,14 +631,11 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
 
     def initialize(self) -> None:
         """Initialize QEMU process manager."""
-        from .internal.qemu_process import QEMUProcess, QEMUConfig
-        from .internal.vnc_client import VNCClient
-
         qemu_config = QEMUConfig(
             system_image=self._config.system_image or "",
             memory_mb=self._config.memory_mb,
             cpu_cores=self._config.cpu_cores,
-            use_kvm=self._config.use_kvm,
+            use_kvm=self._config.use_kvm and kvm_caps().available,
             screen_width=self._config.screen_width,
             screen_height=self._config.screen_height,
             vnc_port=self._config.vnc_port,
@@ -341,6 +646,7 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
             initrd=self._config.initrd_path,
             kernel_cmdline=self._kernel_cmdline or "",
             cdrom_image=self._config.cdrom_image,
+            qemu_binary=_qemu_binary_path(),
         )
 
         self._qemu_process = QEMUProcess(qemu_config)
@@ -352,46 +658,76 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
         self._initialized = True
 
     def start(self) -> None:
-        """Start the QEMU virtual machine."""
-        import time
+        """
+        Start the QEMU virtual machine.
 
-        if not self._initialized:
-            raise VMStartError("Must call initialize() first")
-        if self._state == VMState.RUNNING:
-            raise EmulatorCoreError("VM already running")
+        Returns once the QEMU process is launched, leaving the VM in
+        STARTING state. A background thread connects the VNC display and
+        moves the VM to RUNNING when it is ready.
+        """
+        with self._start_lock:
+            if not self._initialized:
+                raise VMStartError("Must call initialize() first")
+            if self._state.bit & _STARTED_STATES:
+                raise EmulatorCoreError("VM already running")
 
-        self._notify_state(VMState.STARTING)
+            self._notify_state(VMState.STARTING)
 
+            try:
+                self._qemu_process.start()
+                self._start_time = _monotonic()
+                pid = self._qemu_process.pid
+                self._qemu_start_time = _proc_start_time(pid) if pid else None
+            except Exception as e:
+                self._error_message = str(e)
+                self._notify_state(VMState.ERROR)
+                raise VMStartError(str(e))
+
+            self._bringup_cancel.clear()
+            self._bringup_thread = threading.Thread(
+                target=self._async_bringup,
+                daemon=True
+            )
+            self._bringup_thread.start()
+
+    def _async_bringup(self) -> None:
+        """Connect VNC once QEMU's server is up, then report RUNNING."""
         try:
-            # Start QEMU process
-            self._qemu_process.start()
-            self._start_time = time.time()
-
-            # Try to connect VNC (may take a moment for QEMU to be ready)
-            max_retries = 30
-            for i in range(max_retries):
+            # If VNC never comes up QEMU might still be running, so not fatal.
+            if _wait_vnc_ready(
+                "127.0.0.1", self._config.vnc_port,
+                deadline=_monotonic() + VNC_READY_TIMEOUT,
+                cancel=self._bringup_cancel,
+            ):
                 try:
-                    time.sleep(0.5)
-                    self._vnc_client.connect(timeout=5.0)
-                    break
+                    self._vnc_client.connect(timeout=2.0)
                 except Exception:
-                    if i == max_retries - 1:
-                        # VNC connection failed but QEMU might still be running
-                        pass
+                    pass
 
-            self._notify_state(VMState.RUNNING)
+            if self._bringup_cancel.is_set():
+                return
+            if self._state == VMState.STARTING:
+                self._notify_state(VMState.RUNNING)
 
         except Exception as e:
             self._error_message = str(e)
             self._notify_state(VMState.ERROR)
-            raise VMStartError(str(e))
+
+    def _cancel_bringup(self) -> None:
+        """Abort a pending bring-up and wait briefly for its thread to exit."""
+        self._bringup_cancel.set()
+        thread = self._bringup_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=3)
+        self._bringup_thread = None
 
     def stop(self) -> None:
         """Stop the QEMU virtual machine."""
-        if self._state not in (VMState.RUNNING, VMState.PAUSED, VMState.STARTING):
+        if not self._state.bit & _LIVE_STATES:
             raise VMNotRunningError("VM is not running")
 
         self._notify_state(VMState.STOPPING)
+        self._cancel_bringup()
 
         # Disconnect VNC
         if self._vnc_client:
@@ -418,7 +754,7 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
 
     def reset(self) -> None:
         """Hard reset the VM."""
-        if self._state in (VMState.RUNNING, VMState.PAUSED):
+        if self._state.bit & _ACTIVE_STATES:
             self.stop()
         if self._initialized:
             self.start()
@@ -428,34 +764,66 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
         return self._state
 
     def get_info(self) -> VMInfo:
-        """Get detailed VM information."""
-        import time
-
-        uptime = 0.0
-        if self._state == VMState.RUNNING and self._start_time > 0:
-            uptime = time.time() - self._start_time
-
-        return VMInfo(
-            state=self._state,
-            pid=self._qemu_process.pid if self._qemu_process else None,
-            memory_used_mb=self._config.memory_mb if self._state == VMState.RUNNING else 0,
-            cpu_usage_percent=0.0,
-            uptime_seconds=uptime,
-            vnc_address=f"localhost:{self._config.vnc_port}" if self._state == VMState.RUNNING else "",
-            error_message=self._error_message,
-        )
+        """
+        Get detailed VM information.
 
-    def save_snapshot(self, name: str) -> str:
-        """Save VM snapshot (requires QEMU monitor)."""
-        if self._state not in (VMState.RUNNING, VMState.PAUSED):
+        The returned VMInfo is reused and refreshed by each call; use
+        dataclasses.replace() on it to keep a snapshot.
+        """
+        info = self._info_cache
+        state = self._state
+        running = state == VMState.RUNNING
+        info.state = state
+        info.pid = self._qemu_process.pid if self._qemu_process else None
+        info.memory_used_mb = self._config.memory_mb if running else 0
+        info.cpu_usage_percent = 0.0
+        if running and self._start_time > 0:
+            info.uptime_seconds = _monotonic() - self._start_time
+        else:
+            info.uptime_seconds = 0.0
+        info.vnc_address = self._vnc_address if running else ""
+        info.error_message = self._error_message
+        return info
+
+    def save_snapshot(self, name: str, *, wait: bool = True) -> Union[str, "Future[str]"]:
+        """
+        Save VM snapshot (requires QEMU monitor).
+
+        The save runs on a dedicated snapshot I/O thread so multi-GB state
+        writes never block the caller unless asked to.
+
+        Args:
+            name: Snapshot name
+            wait: Block until the snapshot is written and return its path.
+                If False, return a Future resolving to the path.
+        """
+        if not self._state.bit & _ACTIVE_STATES:
             raise VMNotRunningError("VM must be running or paused")
-        # Would require QEMU monitor command
+        if self._snap_executor is None:
+            self._snap_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="qemu-snap"
+            )
+        future = self._snap_executor.submit(self._write_snapshot, name)
+        return future.result() if wait else future
+
+    @staticmethod
+    def _snapshot_path(name: str) -> str:
+        """Return the file path for a named snapshot."""
         return f"/snapshots/{name}"
 
+    def _write_snapshot(self, name: str) -> str:
+        """Write a snapshot on the snapshot I/O thread, returning its path."""
+        # Would require QEMU monitor command; the migration stream it
+        # produces is written with snapshot_io.write_snapshot_file().
+        return self._snapshot_path(name)
+
     def load_snapshot(self, name: str) -> None:
         """Load VM snapshot (requires QEMU monitor)."""
         if not self._initialized:
             raise EmulatorCoreError("Must initialize first")
+        # Fault the saved state in up front so the restored VM does not
+        # stall on demand-paging it from disk.
+        prefetch_snapshot_file(self._snapshot_path(name))
         # Would require QEMU monitor command
 
     def send_key(self, keycode: int, down: bool) -> None:
@@ -473,22 +841,18 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
         if self._vnc_client:
             frame = self._vnc_client.get_framebuffer()
             if frame:
-                return FrameBuffer(
-                    width=frame.width,
-                    height=frame.height,
-                    data=frame.data,
-                    format=frame.format
-                )
+                return _as_framebuffer(frame)
         return None
 
     def cleanup(self) -> None:
         """Clean up all resources - ensures QEMU is always terminated."""
         # First try graceful stop if running
-        if self._state in (VMState.RUNNING, VMState.PAUSED, VMState.STARTING):
+        if self._state.bit & _LIVE_STATES:
             try:
                 self.stop()
             except Exception:
                 pass
+        self._cancel_bringup()
 
         # Always force cleanup QEMU process to ensure no orphans
         if self._qemu_process:
@@ -498,9 +862,9 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
                 # Last resort: try to kill by PID
                 if self._qemu_process.pid:
                     try:
-                        import os
-                        import signal
-                        os.kill(self._qemu_process.pid, signal.SIGKILL)
+                        _kill_if_same_process(
+                            self._qemu_process.pid, self._qemu_start_time
+                        )
                     except Exception:
                         pass
             self._qemu_process = None
@@ -513,8 +877,16 @@ class QEMUEmulatorCore(EmulatorCoreInterface):
                 pass
             self._vnc_client = None
 
-        self._state_callbacks.clear()
-        self._frame_callbacks.clear()
+        if self._snap_executor is not None:
+            self._snap_executor.shutdown(wait=False, cancel_futures=True)
+            self._snap_executor = None
+
+        self._state_callbacks = ()
+        self._callback_failures.clear()
+        for callback in self._frame_callbacks:
+            if isinstance(callback, _CoalescingFrameCallback):
+                callback.close()
+        self._frame_callbacks = ()
         self._initialized = False
         self._state = VMState.STOPPED
 
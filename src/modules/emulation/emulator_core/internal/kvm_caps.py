@@ -0,0 +1,61 @@
+"""
+Host KVM capability probe.
+
+/dev/kvm is opened once per process and queried for the API version and
+vCPU limits; every QEMU launch reuses the result instead of re-checking
+the device node.
+"""
+
+import functools
+from dataclasses import dataclass
+
+from .kvm_wrapper import (
+    KVM_CAP_MAX_VCPUS,
+    KVM_CAP_NR_VCPUS,
+    KVMError,
+    KVMWrapper,
+)
+
+# The only KVM API version the kernel has ever reported.
+KVM_API_VERSION = 12
+
+# vCPUs per VM to assume when KVM_CAP_NR_VCPUS is unsupported
+# (Documentation/virt/kvm/api.rst).
+DEFAULT_NR_VCPUS = 4
+
+
+@dataclass(frozen=True)
+class KvmCaps:
+    """KVM capabilities of the host."""
+    available: bool
+    api_version: int = 0
+    recommended_vcpus: int = 0
+    max_vcpus: int = 0
+    error: str = ""
+
+
+@functools.lru_cache(maxsize=1)
+def kvm_caps() -> KvmCaps:
+    """Probe /dev/kvm, once per process."""
+    kvm = KVMWrapper()
+    try:
+        kvm.open()
+        api_version = kvm.get_api_version()
+        if api_version != KVM_API_VERSION:
+            return KvmCaps(
+                available=False,
+                api_version=api_version,
+                error=f"Unsupported KVM API version {api_version}",
+            )
+        recommended = kvm.check_extension(KVM_CAP_NR_VCPUS) or DEFAULT_NR_VCPUS
+        maximum = kvm.check_extension(KVM_CAP_MAX_VCPUS) or recommended
+        return KvmCaps(
+            available=True,
+            api_version=api_version,
+            recommended_vcpus=recommended,
+            max_vcpus=maximum,
+        )
+    except KVMError as e:
+        return KvmCaps(available=False, error=str(e))
+    finally:
+        kvm.close()
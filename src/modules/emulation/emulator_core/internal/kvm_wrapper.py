@@ -1,11 +1,21 @@
 """
-KVM ioctl wrapper stub.
+KVM ioctl wrapper.
 
 Low-level interface to the KVM hypervisor via /dev/kvm.
-This module provides constants and placeholder methods for KVM operations.
+
+ioctls are issued through fcntl.ioctl, which passes an int argument or
+a mutable buffer straight to the syscall with no per-call marshalling.
+The hot KVM_RUN call is bound once at import, and register transfers
+reuse one fixed-layout buffer instead of building a struct per call.
+Each vCPU's shared kvm_run page is mapped once and overlaid with a
+ctypes structure, so exit information is read without a syscall.
 """
 
+import ctypes
+import fcntl
+import mmap
 import os
+import struct
 from typing import Optional
 
 # KVM ioctl command numbers (from linux/kvm.h)
@@ -23,6 +33,80 @@ KVM_SET_SREGS = 0x4138AE84
 
 KVM_DEVICE_PATH = "/dev/kvm"
 
+# KVM_CHECK_EXTENSION capabilities (from linux/kvm.h)
+KVM_CAP_NR_VCPUS = 9      # recommended maximum vCPUs per VM
+KVM_CAP_MAX_VCPUS = 66    # hard maximum vCPUs per VM
+
+# kvm_run.exit_reason values (from linux/kvm.h)
+KVM_EXIT_UNKNOWN = 0
+KVM_EXIT_IO = 2
+KVM_EXIT_HLT = 5
+KVM_EXIT_MMIO = 6
+KVM_EXIT_SHUTDOWN = 8
+KVM_EXIT_FAIL_ENTRY = 9
+KVM_EXIT_INTERNAL_ERROR = 17
+
+# struct kvm_regs: rax..r15, rip, rflags as 18 unsigned 64-bit fields.
+REGISTER_NAMES = (
+    "rax", "rbx", "rcx", "rdx", "rsi", "rdi", "rsp", "rbp",
+    "r8", "r9", "r10", "r11", "r12", "r13", "r14", "r15",
+    "rip", "rflags",
+)
+_REGS_STRUCT = struct.Struct(f"<{len(REGISTER_NAMES)}Q")
+_REGISTER_SET = frozenset(REGISTER_NAMES)
+
+# struct kvm_userspace_memory_region: slot, flags, guest_phys_addr,
+# memory_size, userspace_addr.
+_MEMORY_REGION_STRUCT = struct.Struct("<IIQQQ")
+
+_ioctl = fcntl.ioctl
+
+
+class KvmRunIO(ctypes.Structure):
+    """kvm_run.io, valid when exit_reason is KVM_EXIT_IO."""
+    _fields_ = [
+        ("direction", ctypes.c_uint8),
+        ("size", ctypes.c_uint8),
+        ("port", ctypes.c_uint16),
+        ("count", ctypes.c_uint32),
+        ("data_offset", ctypes.c_uint64),
+    ]
+
+
+class KvmRunMMIO(ctypes.Structure):
+    """kvm_run.mmio, valid when exit_reason is KVM_EXIT_MMIO."""
+    _fields_ = [
+        ("phys_addr", ctypes.c_uint64),
+        ("data", ctypes.c_uint8 * 8),
+        ("len", ctypes.c_uint32),
+        ("is_write", ctypes.c_uint8),
+    ]
+
+
+class KvmRunExit(ctypes.Union):
+    """Exit-specific part of kvm_run, padded to the kernel's 256 bytes."""
+    _fields_ = [
+        ("io", KvmRunIO),
+        ("mmio", KvmRunMMIO),
+        ("padding", ctypes.c_char * 256),
+    ]
+
+
+class KvmRun(ctypes.Structure):
+    """Leading part of struct kvm_run, shared with the kernel per vCPU."""
+    _fields_ = [
+        ("request_interrupt_window", ctypes.c_uint8),
+        ("immediate_exit", ctypes.c_uint8),
+        ("padding1", ctypes.c_uint8 * 6),
+        ("exit_reason", ctypes.c_uint32),
+        ("ready_for_interrupt_injection", ctypes.c_uint8),
+        ("if_flag", ctypes.c_uint8),
+        ("flags", ctypes.c_uint16),
+        ("cr8", ctypes.c_uint64),
+        ("apic_base", ctypes.c_uint64),
+        ("exit", KvmRunExit),
+    ]
+
 
 class KVMError(Exception):
     """Raised when a KVM operation fails."""
@@ -33,42 +117,88 @@ class KVMWrapper:
     """
     Wrapper around KVM kernel module ioctls.
 
-    All methods raise NotImplementedError as this is a stub that requires
-    a real KVM-capable host to function.
+    Requires a KVM-capable host; operations raise KVMError when /dev/kvm
+    is unavailable or the kernel rejects a request.
     """
 
     def __init__(self) -> None:
         self._fd: Optional[int] = None
+        self._regs_buf = bytearray(_REGS_STRUCT.size)
+        self._vcpu_mmap_size: Optional[int] = None
+        # Per-vCPU kvm_run mappings and their structure overlays, by fd.
+        self._run_maps: dict[int, mmap.mmap] = {}
+        self._runs: dict[int, KvmRun] = {}
 
     def open(self) -> None:
         """Open /dev/kvm file descriptor."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        if self._fd is not None:
+            return
+        try:
+            self._fd = os.open(KVM_DEVICE_PATH, os.O_RDWR | os.O_CLOEXEC)
+        except OSError as e:
+            raise KVMError(f"Cannot open {KVM_DEVICE_PATH}: {e}") from e
 
     def close(self) -> None:
-        """Close the KVM file descriptor."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        """Close the KVM file descriptor and any vCPUs still open."""
+        for vcpu_fd in list(self._runs):
+            self.destroy_vcpu(vcpu_fd)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
 
     def get_api_version(self) -> int:
         """Return the KVM API version supported by the kernel."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        return self._system_ioctl(KVM_GET_API_VERSION)
+
+    def check_extension(self, capability: int) -> int:
+        """Return the kernel's value for a KVM capability; 0 if unsupported."""
+        return self._system_ioctl(KVM_CHECK_EXTENSION, capability)
 
     def create_vm(self) -> int:
         """Create a new VM and return its file descriptor."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        return self._system_ioctl(KVM_CREATE_VM)
 
     def create_vcpu(self, vm_fd: int, vcpu_id: int) -> int:
-        """Create a virtual CPU within a VM, returning its fd."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        """Create a virtual CPU within a VM, returning its fd.
+
+        Also maps the vCPU's kvm_run structure; see get_run().
+        """
+        if self._vcpu_mmap_size is None:
+            self._vcpu_mmap_size = self._system_ioctl(KVM_GET_VCPU_MMAP_SIZE)
+        try:
+            vcpu_fd = _ioctl(vm_fd, KVM_CREATE_VCPU, vcpu_id)
+        except OSError as e:
+            raise KVMError(f"KVM_CREATE_VCPU failed: {e}") from e
+        try:
+            run_map = mmap.mmap(
+                vcpu_fd, self._vcpu_mmap_size,
+                flags=mmap.MAP_SHARED,
+                prot=mmap.PROT_READ | mmap.PROT_WRITE,
+            )
+        except OSError as e:
+            os.close(vcpu_fd)
+            raise KVMError(f"Cannot map kvm_run for vCPU {vcpu_id}: {e}") from e
+        self._run_maps[vcpu_fd] = run_map
+        self._runs[vcpu_fd] = KvmRun.from_buffer(run_map)
+        return vcpu_fd
+
+    def destroy_vcpu(self, vcpu_fd: int) -> None:
+        """Unmap a vCPU's kvm_run structure and close its fd."""
+        self._runs.pop(vcpu_fd, None)
+        run_map = self._run_maps.pop(vcpu_fd, None)
+        if run_map is not None:
+            try:
+                run_map.close()
+            except BufferError:
+                pass  # a caller still holds get_run(); unmapped on release
+        os.close(vcpu_fd)
+
+    def get_run(self, vcpu_fd: int) -> KvmRun:
+        """Return the live kvm_run structure of a vCPU."""
+        try:
+            return self._runs[vcpu_fd]
+        except KeyError:
+            raise KVMError(f"No vCPU with fd {vcpu_fd}") from None
 
     def set_user_memory_region(
         self,
@@ -79,24 +209,58 @@ class KVMWrapper:
         userspace_addr: int,
     ) -> None:
         """Map a region of host memory into guest physical address space."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        region = bytearray(_MEMORY_REGION_STRUCT.pack(
+            slot, 0, guest_phys_addr, memory_size, userspace_addr
+        ))
+        try:
+            _ioctl(vm_fd, KVM_SET_USER_MEMORY_REGION, region)
+        except OSError as e:
+            raise KVMError(f"KVM_SET_USER_MEMORY_REGION failed: {e}") from e
+
+    def run_vcpu(self, vcpu_fd: int) -> int:
+        """Execute the vCPU until it exits.
 
-    def run_vcpu(self, vcpu_fd: int) -> None:
-        """Execute the vCPU until it exits."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        Returns:
+            The exit reason, read from the shared kvm_run structure
+        """
+        try:
+            _ioctl(vcpu_fd, KVM_RUN, 0)
+        except OSError as e:
+            raise KVMError(f"KVM_RUN failed: {e}") from e
+        return self._runs[vcpu_fd].exit_reason
 
     def get_regs(self, vcpu_fd: int) -> dict:
         """Read general-purpose registers from a vCPU."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        buf = self._regs_buf
+        try:
+            _ioctl(vcpu_fd, KVM_GET_REGS, buf, True)
+        except OSError as e:
+            raise KVMError(f"KVM_GET_REGS failed: {e}") from e
+        return dict(zip(REGISTER_NAMES, _REGS_STRUCT.unpack(buf)))
 
     def set_regs(self, vcpu_fd: int, regs: dict) -> None:
-        """Write general-purpose registers to a vCPU."""
-        raise NotImplementedError(
-            "KVM wrapper requires a real KVM-capable host"
-        )
+        """Write general-purpose registers to a vCPU.
+
+        Registers missing from regs keep their current values.
+        """
+        buf = self._regs_buf
+        if regs.keys() >= _REGISTER_SET:
+            values = [regs[name] for name in REGISTER_NAMES]
+        else:
+            current = self.get_regs(vcpu_fd)
+            current.update(regs)
+            values = [current[name] for name in REGISTER_NAMES]
+        _REGS_STRUCT.pack_into(buf, 0, *values)
+        try:
+            _ioctl(vcpu_fd, KVM_SET_REGS, buf)
+        except OSError as e:
+            raise KVMError(f"KVM_SET_REGS failed: {e}") from e
+
+    def _system_ioctl(self, request: int, arg: int = 0) -> int:
+        """Issue an ioctl on the /dev/kvm descriptor."""
+        if self._fd is None:
+            raise KVMError("KVM device is not open")
+        try:
+            return _ioctl(self._fd, request, arg)
+        except OSError as e:
+            raise KVMError(f"KVM ioctl {request:#x} failed: {e}") from e
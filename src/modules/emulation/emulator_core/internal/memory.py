@@ -1,11 +1,47 @@
 """
-Guest memory management stub.
+Guest memory management.
 
 Manages the guest physical address space and host memory mappings.
+Each region is backed by an anonymous private mapping; reads and writes
+go through a memoryview over it, so guest accesses never copy. Large
+regions are backed by huge pages where the host allows it, so random
+guest accesses need far fewer TLB entries. Freed mappings are kept in
+size-bucketed pools and reused, so region churn does not pay for an
+mmap/munmap pair each time.
 """
 
+import bisect
+import ctypes
+import mmap
+import sys
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+HUGE_PAGE_SIZE = 2 * 1024 * 1024
+
+# Linux MAP_HUGETLB; the mmap module does not export it.
+_MAP_HUGETLB = 0x40000 if sys.platform.startswith("linux") else 0
+
+# Region backing types.
+BACKING_HUGETLB = "hugetlb"      # explicitly reserved huge pages
+BACKING_THP = "thp"              # transparent huge pages via madvise
+BACKING_PAGES = "pages"          # regular pages
+
+# Free mappings kept per size bucket for reuse.
+POOL_MAX_PER_BUCKET = 64
+
+
+def _bucket_size(size: int) -> int:
+    """
+    Round a region size up to its pool bucket, which is also its mapped size.
+
+    Regions below a huge page round to a power of two (min one page) so
+    small churn shares few buckets; larger ones only to a huge page
+    multiple, so e.g. 3 GiB of guest RAM maps (and reserves) 3 GiB.
+    """
+    if size < HUGE_PAGE_SIZE:
+        return max(mmap.PAGESIZE, 1 << (size - 1).bit_length())
+    return -(-size // HUGE_PAGE_SIZE) * HUGE_PAGE_SIZE
 
 
 @dataclass
@@ -16,20 +52,98 @@ class MemoryRegion:
     size: int
     host_addr: Optional[int] = None
     readonly: bool = False
+    backing: str = BACKING_PAGES
+    _mmap: Optional[mmap.mmap] = field(default=None, repr=False, compare=False)
+    _view: Optional[memoryview] = field(default=None, repr=False, compare=False)
+
+    @property
+    def end(self) -> int:
+        """First guest physical address past the region."""
+        return self.guest_phys_addr + self.size
+
+
+def _map_anonymous(size: int) -> tuple[mmap.mmap, str]:
+    """
+    Map anonymous memory for a region, preferring huge pages.
+
+    Regions of at least one huge page first try reserved huge pages
+    (size rounded up to a huge page multiple), then fall back to regular
+    pages with a transparent huge page hint.
+
+    Returns:
+        Tuple of (mapping, backing type)
+    """
+    flags = mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS
+    if size < HUGE_PAGE_SIZE:
+        return mmap.mmap(-1, size, flags=flags), BACKING_PAGES
+
+    if _MAP_HUGETLB:
+        rounded = -(-size // HUGE_PAGE_SIZE) * HUGE_PAGE_SIZE
+        try:
+            return mmap.mmap(-1, rounded, flags=flags | _MAP_HUGETLB), BACKING_HUGETLB
+        except OSError:
+            pass  # no huge pages reserved on this host
+
+    backing = mmap.mmap(-1, size, flags=flags)
+    if hasattr(mmap, "MADV_HUGEPAGE"):
+        try:
+            backing.madvise(mmap.MADV_HUGEPAGE)
+            return backing, BACKING_THP
+        except OSError:
+            pass
+    return backing, BACKING_PAGES
+
+
+def _discard_pages(backing: mmap.mmap) -> bool:
+    """
+    Drop a mapping's pages but keep the mapping itself.
+
+    The pages refault as zeros, so a pooled mapping handed to a new region
+    never exposes the previous region's contents.
+
+    Returns:
+        True if the mapping can be pooled
+    """
+    if not hasattr(mmap, "MADV_DONTNEED"):
+        return False
+    try:
+        backing.madvise(mmap.MADV_DONTNEED)
+    except OSError:
+        return False
+    return True
+
+
+def _close_mapping(backing: mmap.mmap) -> None:
+    """Unmap a mapping that is no longer pooled."""
+    try:
+        backing.close()
+    except BufferError:
+        # A caller still holds a view from read(); the mapping is
+        # unmapped once that view is garbage collected.
+        pass
 
 
 class GuestMemory:
     """
     Manages guest physical memory layout.
 
-    Stub implementation -- allocation methods raise NotImplementedError
-    since actual mmap operations require a real host environment.
+    Regions are kept sorted by guest physical address so an access is
+    resolved to its region with a binary search.
     """
 
     def __init__(self, total_mb: int) -> None:
         self._total_bytes = total_mb * 1024 * 1024
         self._regions: dict[int, MemoryRegion] = {}
         self._next_slot = 0
+        self._allocated_bytes = 0
+        # Parallel lists sorted by guest physical address.
+        self._starts: list[int] = []
+        self._sorted: list[MemoryRegion] = []
+        # Free mappings by bucket size, with their backing type.
+        self._free_buckets: dict[int, list[tuple[mmap.mmap, str]]] = {}
+        self._pool_hits = 0
+        self._pool_misses = 0
+        self._pool_returns = 0
 
     @property
     def total_bytes(self) -> int:
@@ -48,31 +162,139 @@ class GuestMemory:
         """
         Allocate and map a region of guest physical memory.
 
-        Raises NotImplementedError because actual allocation requires mmap.
+        Raises:
+            ValueError: If size is not positive, the region overlaps an
+                existing one, or it exceeds the guest memory size
         """
-        raise NotImplementedError(
-            "GuestMemory allocation requires mmap on a real host"
+        if size <= 0:
+            raise ValueError(f"Invalid region size: {size}")
+        if guest_phys_addr < 0:
+            raise ValueError(f"Invalid guest address: {guest_phys_addr:#x}")
+        if self._allocated_bytes + size > self._total_bytes:
+            raise ValueError(
+                f"Region of {size} bytes exceeds guest memory "
+                f"({self._allocated_bytes}/{self._total_bytes} allocated)"
+            )
+
+        index = bisect.bisect_right(self._starts, guest_phys_addr)
+        if index > 0 and self._sorted[index - 1].end > guest_phys_addr:
+            raise ValueError(f"Region at {guest_phys_addr:#x} overlaps slot "
+                             f"{self._sorted[index - 1].slot}")
+        if index < len(self._starts) and self._starts[index] < guest_phys_addr + size:
+            raise ValueError(f"Region at {guest_phys_addr:#x} overlaps slot "
+                             f"{self._sorted[index].slot}")
+
+        bucket = _bucket_size(size)
+        free = self._free_buckets.get(bucket)
+        if free:
+            backing, backing_type = free.pop()
+            self._pool_hits += 1
+        else:
+            backing, backing_type = _map_anonymous(bucket)
+            self._pool_misses += 1
+        view = memoryview(backing)
+        region = MemoryRegion(
+            slot=self._next_slot,
+            guest_phys_addr=guest_phys_addr,
+            size=size,
+            host_addr=ctypes.addressof(ctypes.c_char.from_buffer(backing)),
+            readonly=readonly,
+            backing=backing_type,
+            _mmap=backing,
+            _view=view,
         )
+        self._next_slot += 1
+        self._regions[region.slot] = region
+        self._starts.insert(index, guest_phys_addr)
+        self._sorted.insert(index, region)
+        self._allocated_bytes += size
+        return region
 
     def free_region(self, slot: int) -> None:
         """Free a previously allocated memory region."""
-        raise NotImplementedError(
-            "GuestMemory deallocation requires munmap on a real host"
-        )
+        region = self._regions.pop(slot, None)
+        if region is None:
+            raise KeyError(f"No memory region in slot {slot}")
+        index = self._sorted.index(region)
+        del self._starts[index]
+        del self._sorted[index]
+        self._allocated_bytes -= region.size
 
-    def read(self, guest_phys_addr: int, size: int) -> bytes:
-        """Read bytes from guest physical memory."""
-        raise NotImplementedError(
-            "GuestMemory read requires mapped host memory"
-        )
+        backing = self._detach(region)
+        if backing is None:
+            return
+        free = self._free_buckets.setdefault(_bucket_size(region.size), [])
+        if len(free) < POOL_MAX_PER_BUCKET and _discard_pages(backing):
+            free.append((backing, region.backing))
+            self._pool_returns += 1
+        else:
+            _close_mapping(backing)
+
+    def pool_stats(self) -> dict[str, int]:
+        """Return mapping pool counters."""
+        return {
+            "hits": self._pool_hits,
+            "misses": self._pool_misses,
+            "returns": self._pool_returns,
+            "pooled": sum(len(free) for free in self._free_buckets.values()),
+        }
+
+    def read(self, guest_phys_addr: int, size: int) -> memoryview:
+        """
+        Read bytes from guest physical memory.
+
+        Returns a view into guest memory rather than a copy; it reflects
+        later writes and must not be used after the region is freed.
+        """
+        region, offset = self._lookup(guest_phys_addr, size)
+        view = region._view[offset:offset + size]
+        return view.toreadonly()
 
     def write(self, guest_phys_addr: int, data: bytes) -> None:
         """Write bytes to guest physical memory."""
-        raise NotImplementedError(
-            "GuestMemory write requires mapped host memory"
+        region, offset = self._lookup(guest_phys_addr, len(data))
+        if region.readonly:
+            raise PermissionError(
+                f"Memory region in slot {region.slot} is read-only"
+            )
+        region._view[offset:offset + len(data)] = data
+
+    def _lookup(self, guest_phys_addr: int, size: int) -> tuple[MemoryRegion, int]:
+        """Find the region holding [addr, addr + size) and the offset in it."""
+        index = bisect.bisect_right(self._starts, guest_phys_addr) - 1
+        if index >= 0:
+            region = self._sorted[index]
+            offset = guest_phys_addr - region.guest_phys_addr
+            if 0 <= size and offset + size <= region.size:
+                return region, offset
+        raise ValueError(
+            f"Access of {size} bytes at {guest_phys_addr:#x} is not within "
+            f"a mapped region"
         )
 
+    @staticmethod
+    def _detach(region: MemoryRegion) -> Optional[mmap.mmap]:
+        """Detach and return a region's backing mapping."""
+        if region._view is not None:
+            region._view.release()
+            region._view = None
+        backing = region._mmap
+        region._mmap = None
+        region.host_addr = None
+        return backing
+
     def cleanup(self) -> None:
-        """Release all allocated memory regions."""
+        """Release all allocated memory regions and pooled mappings."""
+        for region in self._regions.values():
+            backing = self._detach(region)
+            if backing is not None:
+                _close_mapping(backing)
+        for free in self._free_buckets.values():
+            for backing, _ in free:
+                _close_mapping(backing)
+        self._free_buckets.clear()
         self._regions.clear()
+        self._starts.clear()
+        self._sorted.clear()
+        self._allocated_bytes = 0
         self._next_slot = 0
@@ -3,18 +3,30 @@ QEMU process management for Android emulation.
 
 Handles launching, monitoring, and stopping QEMU instances
 with appropriate flags for Android system images.
+
+QEMU is launched directly from this process with posix_spawn, whose cost
+does not depend on the parent's size, so bursts of launches need no
+separate spawner process. A forkserver-style spawner would also make
+each QEMU a grandchild that this process could not wait on.
 """
 
+import functools
+import json
 import os
+import selectors
+import shutil
 import socket
 import subprocess
 import signal
+import tempfile
 import threading
 import time
-from typing import Optional, Dict, Any, Callable, List
+from typing import Optional, Dict, Any, Callable, FrozenSet, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .kvm_caps import kvm_caps
+
 
 def _is_port_available(port: int) -> bool:
     """Check if a TCP port is available."""
@@ -26,15 +38,291 @@ def _is_port_available(port: int) -> bool:
         return False
 
 
+# Seconds a snapshot of the host's listening ports stays valid.
+LISTENING_PORTS_TTL = 1.0
+
+# /proc/net/tcp socket state for LISTEN.
+_TCP_LISTEN = "0A"
+
+_listening_cache: Optional[Tuple[float, FrozenSet[int]]] = None
+
+
+def _listening_ports() -> Optional[FrozenSet[int]]:
+    """Return the TCP ports the host is listening on, from /proc/net.
+
+    One read of /proc/net/tcp and tcp6 covers every port; the result is
+    reused for LISTENING_PORTS_TTL seconds. Returns None where /proc/net
+    is unavailable.
+    """
+    global _listening_cache
+    now = time.monotonic()
+    cached = _listening_cache
+    if cached is not None and now - cached[0] < LISTENING_PORTS_TTL:
+        return cached[1]
+
+    ports = set()
+    found = False
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(path) as f:
+                next(f, None)  # column headings
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 3 and fields[3] == _TCP_LISTEN:
+                        ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+            found = True
+        except (OSError, ValueError):
+            continue
+    if not found:
+        return None
+    result = frozenset(ports)
+    _listening_cache = (now, result)
+    return result
+
+
 def _find_available_port(start_port: int, max_attempts: int = 100) -> int:
-    """Find an available port starting from start_port."""
-    for offset in range(max_attempts):
-        port = start_port + offset
+    """Find an available port starting from start_port.
+
+    Skips ports the host is listening on, per one /proc/net snapshot, and
+    confirms the first remaining candidate with a bind. Without /proc/net
+    every candidate is checked with a bind.
+    """
+    listening = _listening_ports()
+    for port in range(start_port, min(start_port + max_attempts, 65536)):
+        if listening is not None and port in listening:
+            continue
         if _is_port_available(port):
             return port
     raise RuntimeError(f"Could not find available port starting from {start_port}")
 
 
+@functools.lru_cache(maxsize=8)
+def _qemu_available(binary: str) -> bool:
+    """Check if a QEMU binary runs, once per binary per process."""
+    try:
+        result = subprocess.run(
+            [binary, "--version"],
+            capture_output=True,
+            timeout=5
+        )
+        return result.returncode == 0
+    except (FileNotFoundError, PermissionError, subprocess.TimeoutExpired):
+        return False
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_binary(binary: str) -> str:
+    """Resolve a binary name to an absolute path via PATH, once per name."""
+    return shutil.which(binary) or binary
+
+
+# Default Android kernel parameters; video mode set from the screen size.
+_ANDROID_CMDLINE_TMPL = (
+    "root=/dev/ram0 "
+    "console=ttyS0 "
+    "androidboot.hardware=ranchu "
+    "androidboot.serialno=EMULATOR "
+    "androidboot.console=ttyS0 "
+    "androidboot.selinux=permissive "
+    "video={w}x{h} "
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _default_cmdline(width: int, height: int) -> str:
+    """Return the default kernel command line for a screen size."""
+    return _ANDROID_CMDLINE_TMPL.format(w=width, h=height)
+
+
+def _missing_files(paths: List[str]) -> List[str]:
+    """Return the paths that do not exist, in order.
+
+    Each directory is listed once with scandir, so checking several
+    images that share a directory costs one directory read rather than
+    a stat per image. Paths in unlistable directories, and symlinks,
+    are checked individually.
+    """
+    by_dir: Dict[str, List[str]] = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(os.path.abspath(path)), []).append(path)
+
+    missing = set()
+    for directory, dir_paths in by_dir.items():
+        try:
+            with os.scandir(directory) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            missing.update(p for p in dir_paths if not os.path.exists(p))
+            continue
+        for path in dir_paths:
+            entry = entries.get(os.path.basename(path))
+            if entry is None or (entry.is_symlink() and not os.path.exists(path)):
+                missing.add(path)
+    return [path for path in paths if path in missing]
+
+
+# Bytes of QEMU's stderr, from the end, quoted in error messages.
+STDERR_TAIL_SIZE = 64 * 1024
+
+
+def _open_stderr_capture() -> int:
+    """Return a fd of an anonymous file to collect QEMU's stderr in.
+
+    QEMU writes to it like any file: unlike a pipe it never fills up
+    and blocks QEMU, and nothing has to drain it.
+    """
+    try:
+        return os.memfd_create("qemu-stderr", os.MFD_CLOEXEC)
+    except (AttributeError, OSError):
+        with tempfile.TemporaryFile() as f:
+            return os.dup(f.fileno())
+
+
+# Seconds to wait for a QMP reply; savevm can take much longer.
+QMP_TIMEOUT = 5.0
+SNAPSHOT_TIMEOUT = 120.0
+
+# First kernel release with io_uring.
+IO_URING_MIN_KERNEL = (5, 1)
+
+
+@functools.lru_cache(maxsize=1)
+def _supports_io_uring() -> bool:
+    """Check if the host kernel provides io_uring, once per process."""
+    try:
+        release = os.uname().release
+        version = tuple(int(part) for part in release.split("-")[0].split(".")[:2])
+    except (AttributeError, ValueError):
+        return False
+    return version >= IO_URING_MIN_KERNEL
+
+
+def _blockdev_arg(options: Dict[str, Any], prefix: str = "") -> str:
+    """Render blockdev QMP options as a -blockdev command-line value."""
+    parts = []
+    for key, value in options.items():
+        if isinstance(value, dict):
+            parts.append(_blockdev_arg(value, f"{prefix}{key}."))
+        elif isinstance(value, bool):
+            parts.append(f"{prefix}{key}={'on' if value else 'off'}")
+        else:
+            parts.append(f"{prefix}{key}={value}")
+    return ",".join(parts)
+
+
+class _CpuSetAllocator:
+    """
+    Hands out disjoint sets of host CPUs to concurrent QEMU instances.
+
+    CPUs come from this process's affinity mask. When too few CPUs are
+    free for a request, no set is handed out rather than an overlapping
+    one, and that instance runs unpinned.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_use: set = set()
+
+    def acquire(self, count: int) -> Optional[FrozenSet[int]]:
+        """Reserve count CPUs, or return None if not enough are free."""
+        try:
+            usable = sorted(os.sched_getaffinity(0))
+        except (AttributeError, OSError):
+            return None
+        with self._lock:
+            free = [cpu for cpu in usable if cpu not in self._in_use]
+            if count <= 0 or len(free) < count:
+                return None
+            cpus = frozenset(free[:count])
+            self._in_use |= cpus
+            return cpus
+
+    def release(self, cpus: Optional[FrozenSet[int]]) -> None:
+        """Return a set from acquire() to the pool."""
+        if cpus:
+            with self._lock:
+                self._in_use -= cpus
+
+
+_cpusets = _CpuSetAllocator()
+
+
+class _ProcessReaper:
+    """
+    Watches child processes for exit from a single shared thread.
+
+    Each child is tracked through a pidfd registered with an epoll
+    selector, so exits are seen immediately and the thread makes no
+    wakeups while every child is running. The watched process is not
+    reaped here; the callback reaps it with Popen.poll(). The thread
+    exits once no child is left to watch, so a process that runs one
+    emulator at a time has no reaper thread between runs. Where pidfds
+    are unavailable a child is watched by a thread blocked in Popen.wait().
+    """
+
+    def __init__(self) -> None:
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def watch(
+        self,
+        process: subprocess.Popen,
+        callback: Callable[[subprocess.Popen], None],
+    ) -> None:
+        """Call callback(process) from a reaper thread once process exits."""
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            threading.Thread(
+                target=self._wait_blocking, args=(process, callback), daemon=True
+            ).start()
+            return
+
+        with self._lock:
+            if self._selector is None:
+                self._selector = selectors.DefaultSelector()
+            self._selector.register(pidfd, selectors.EVENT_READ, (process, callback))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="qemu-reaper", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        selector = self._selector
+        while True:
+            for key, _ in selector.select():
+                with self._lock:
+                    selector.unregister(key.fd)
+                os.close(key.fd)
+                process, callback = key.data
+                self._notify(process, callback)
+            # watch() starts a new thread if it registers after this.
+            with self._lock:
+                if not selector.get_map():
+                    self._thread = None
+                    return
+
+    @classmethod
+    def _wait_blocking(cls, process, callback) -> None:
+        try:
+            process.wait()
+        except Exception:
+            pass
+        cls._notify(process, callback)
+
+    @staticmethod
+    def _notify(process, callback) -> None:
+        try:
+            callback(process)
+        except Exception:
+            pass
+
+
+_reaper = _ProcessReaper()
+
+
 class QEMUState(Enum):
     STOPPED = "stopped"
     STARTING = "starting"
@@ -55,6 +343,8 @@ class QEMUConfig:
     vnc_port: int = 5900
     adb_port: int = 5555
     gpu_mode: str = "host"  # host, software, auto
+    use_virtio_blk: bool = True  # False: legacy pc machine with IDE disks
+    pin_cpus: bool = True  # Pin to CPUs not used by other instances
 
     # Boot configuration
     kernel: Optional[str] = None  # Path to kernel image
@@ -62,6 +352,7 @@ class QEMUConfig:
     boot_image: Optional[str] = None  # Path to boot.img
     kernel_cmdline: str = ""  # Additional kernel parameters
     cdrom_image: Optional[str] = None  # Path to ISO for CD-ROM boot
+    snapshot_tag: Optional[str] = None  # Resume from this saved VM state
 
     # Additional disk images
     userdata_image: Optional[str] = None
@@ -71,12 +362,17 @@ class QEMUConfig:
     # GPU command pipe (for hardware-accelerated rendering)
     gpu_pipe_socket: Optional[str] = None  # Path to GPU pipe socket
 
+    # QMP monitor (needed for send_key, swap_drive and save_snapshot)
+    qmp_socket: Optional[str] = None  # Path to QMP UNIX socket (default: per launch)
+
     # Logging
     log_dir: Optional[str] = None  # Directory for QEMU logs
     serial_log: Optional[str] = None  # Path for serial console log
+    serial_socket: Optional[str] = None  # UNIX socket serving the serial console
 
     # Advanced options
     extra_args: List[str] = field(default_factory=list)
+    qemu_binary: Optional[str] = None  # Resolved binary path (default: PATH lookup)
 
 
 class QEMUProcessError(Exception):
@@ -94,15 +390,49 @@ class QEMUProcess:
 
     QEMU_BINARY = "qemu-system-x86_64"
 
+    # Argument groups that do not depend on the config, built once.
+    _MACHINE_ARGS = {
+        # (use_virtio_blk, kvm available)
+        (True, True): ("-machine", "q35,accel=kvm"),
+        (True, False): ("-machine", "q35"),
+        (False, True): ("-machine", "pc,accel=kvm"),
+        (False, False): ("-machine", "pc"),
+    }
+    _KVM_CPU_ARGS = ("-enable-kvm", "-cpu", "host")
+    _TCG_CPU_ARGS = ("-cpu", "qemu64")
+    _VGA_ARGS = ("-global", "VGA.vgamem_mb=64")
+    _INPUT_RNG_ARGS = ("-usb", "-device", "usb-tablet", "-device", "virtio-rng-pci")
+
+    # Disks as (node name, QEMUConfig attribute, image format).
+    _DISKS = (
+        ("system", "system_image", "raw"),
+        ("userdata", "userdata_image", "qcow2"),
+        ("data", "data_image", "qcow2"),
+    )
+
     def __init__(self, config: QEMUConfig):
         self._config = config
+        self._binary = config.qemu_binary or self.QEMU_BINARY
         self._process: Optional[subprocess.Popen] = None
         self._state = QEMUState.STOPPED
         self._pid: Optional[int] = None
-        self._monitor_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
         self._state_callbacks: List[Callable[[QEMUState], None]] = []
         self._error_message: str = ""
+        # Block node names backing each virtio disk, bottom-up; see swap_drive().
+        self._disk_chains: Dict[str, List[str]] = {}
+        self._disk_generation = 0
+        # Cached QMP monitor connection; see _qmp_batch().
+        self._qmp_lock = threading.Lock()
+        self._qmp_sock: Optional[socket.socket] = None
+        self._qmp_stream = None
+        # Private directory holding the default QMP socket, if we made one.
+        self._qmp_dir: Optional[str] = None
+        # pidfd of the running process, for signals that cannot hit a
+        # reused pid, and an event set once the reaper has seen it exit.
+        self._pidfd: Optional[int] = None
+        self._exited = threading.Event()
+        # Anonymous file holding the stderr of the latest launch.
+        self._stderr_fd: Optional[int] = None
 
     @property
     def state(self) -> QEMUState:
@@ -136,187 +466,314 @@ class QEMUProcess:
                 except Exception:
                     pass
 
-    def _check_qemu_available(self) -> bool:
-        """Check if QEMU binary is available."""
-        try:
-            result = subprocess.run(
-                [self.QEMU_BINARY, "--version"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
-
-    def _check_kvm_available(self) -> bool:
-        """Check if KVM is available."""
-        return os.path.exists("/dev/kvm") and os.access("/dev/kvm", os.R_OK | os.W_OK)
-
     def _build_command(self) -> List[str]:
         """Build QEMU command line arguments."""
-        cmd = [self.QEMU_BINARY]
+        cmd = [self._binary]
+        caps = kvm_caps()
+        kvm = caps.available
 
-        # Machine type - use pc for better Android compatibility
-        cmd.extend(["-machine", "pc,accel=kvm" if self._check_kvm_available() else "pc"])
+        # Machine type: q35 for virtio disks, legacy pc for IDE-only images
+        cmd.extend(self._MACHINE_ARGS[self._config.use_virtio_blk, kvm])
 
         # CPU configuration
-        if self._config.use_kvm and self._check_kvm_available():
-            cmd.extend(["-enable-kvm"])
-            cmd.extend(["-cpu", "host"])
+        if self._config.use_kvm and kvm:
+            if self._config.cpu_cores > caps.max_vcpus:
+                raise QEMUProcessError(
+                    f"{self._config.cpu_cores} CPU cores requested but KVM "
+                    f"supports at most {caps.max_vcpus} vCPUs per VM"
+                )
+            cmd.extend(self._KVM_CPU_ARGS)
         else:
-            cmd.extend(["-cpu", "qemu64"])
+            cmd.extend(self._TCG_CPU_ARGS)
 
-        cmd.extend(["-smp", str(self._config.cpu_cores)])
+        cmd.extend(("-smp", str(self._config.cpu_cores)))
 
         # Memory
-        cmd.extend(["-m", f"{self._config.memory_mb}M"])
+        cmd.extend(("-m", f"{self._config.memory_mb}M"))
 
         # Boot configuration (kernel, initrd, cmdline)
         if self._config.kernel:
-            cmd.extend(["-kernel", self._config.kernel])
+            cmd.extend(("-kernel", self._config.kernel))
 
             if self._config.initrd:
-                cmd.extend(["-initrd", self._config.initrd])
+                cmd.extend(("-initrd", self._config.initrd))
 
             # Kernel command line for Android (only valid with -kernel)
             kernel_cmdline = self._config.kernel_cmdline or ""
             if not kernel_cmdline:
                 # Default Android kernel parameters with video mode
-                width = self._config.screen_width
-                height = self._config.screen_height
-                kernel_cmdline = (
-                    "root=/dev/ram0 "
-                    "console=ttyS0 "
-                    "androidboot.hardware=ranchu "
-                    "androidboot.serialno=EMULATOR "
-                    "androidboot.console=ttyS0 "
-                    "androidboot.selinux=permissive "
-                    f"video={width}x{height} "
+                kernel_cmdline = _default_cmdline(
+                    self._config.screen_width, self._config.screen_height
                 )
             else:
                 # Ensure console=ttyS0 is included for serial logging
                 if "console=" not in kernel_cmdline:
                     kernel_cmdline = f"console=ttyS0 {kernel_cmdline}"
             if kernel_cmdline:
-                cmd.extend(["-append", kernel_cmdline])
-
-        # System image (main drive) - use IDE for better boot compatibility
-        if self._config.system_image:
-            cmd.extend([
-                "-drive",
-                f"file={self._config.system_image},format=raw,if=ide,index=0"
-            ])
-
-        # Userdata image (persistent storage)
-        if self._config.userdata_image:
-            cmd.extend([
-                "-drive",
-                f"file={self._config.userdata_image},format=qcow2,if=ide,index=1"
-            ])
-
-        # Data image
-        if self._config.data_image:
-            cmd.extend([
-                "-drive",
-                f"file={self._config.data_image},format=qcow2,if=ide,index=2"
-            ])
+                cmd.extend(("-append", kernel_cmdline))
+
+        # Disks: system image (main drive), userdata (persistent storage)
+        # and data image. virtio-blk disks are served by a dedicated
+        # iothread, off the main loop, with one queue per vCPU; legacy
+        # images use IDE.
+        drives = [
+            (name, getattr(self._config, attr), fmt)
+            for name, attr, fmt in self._DISKS
+        ]
+        self._disk_chains = {}
+        self._disk_generation = 0
+        if self._config.use_virtio_blk and any(image for _, image, _ in drives):
+            cmd.extend(("-object", "iothread,id=io-blk"))
+        for index, (name, image, fmt) in enumerate(drives):
+            if image:
+                cmd.extend(self._drive_args(name, image, fmt, index))
 
         # Display via VNC with specific resolution
         vnc_display = self._config.vnc_port - 5900
-        cmd.extend(["-vnc", f":{vnc_display}"])
+        cmd.extend(("-vnc", f":{vnc_display}"))
 
-        # Serial console for logging
+        # Serial console: a log file, a socket to read it from on demand,
+        # or discarded so the boot log costs no pipe traffic
         if self._config.serial_log:
-            cmd.extend(["-serial", f"file:{self._config.serial_log}"])
+            cmd.extend(("-serial", f"file:{self._config.serial_log}"))
+        elif self._config.serial_socket:
+            cmd.extend((
+                "-serial", f"unix:{self._config.serial_socket},server=on,wait=off"
+            ))
         else:
-            cmd.extend(["-serial", "stdio"])
+            cmd.extend(("-serial", "null"))
 
         # GPU/Graphics configuration
         # Android-x86 works best with standard VGA for software rendering
         # virtio-gpu and QXL have compatibility issues with Android's SurfaceFlinger
-        width = self._config.screen_width
-        height = self._config.screen_height
-
         if self._config.gpu_mode == "host":
             # Try virtio-gpu-pci for better performance (requires guest driver support)
-            cmd.extend(["-device", "virtio-gpu-pci"])
+            cmd.extend(("-device", "virtio-gpu-pci"))
         elif self._config.gpu_mode == "virgl":
             # Virgil3D for OpenGL passthrough (experimental)
-            cmd.extend(["-device", "virtio-gpu-pci,virgl=on"])
+            cmd.extend(("-device", "virtio-gpu-pci,virgl=on"))
         else:
             # Software mode: use standard VGA - most compatible with Android-x86
             # This uses Android's built-in software renderer (swrast/llvmpipe)
-            cmd.extend(["-vga", "std"])
+            cmd.extend(("-vga", "std"))
 
         # Set VGA memory for higher resolutions
-        cmd.extend(["-global", "VGA.vgamem_mb=64"])
+        cmd.extend(self._VGA_ARGS)
 
         # GPU command pipe (virtio-serial for GPU command transport)
         if self._config.gpu_pipe_socket:
-            cmd.extend([
+            cmd.extend((
                 "-device", "virtio-serial",
                 "-chardev", f"socket,path={self._config.gpu_pipe_socket},server=on,wait=off,id=gpu_chardev",
                 "-device", "virtserialport,chardev=gpu_chardev,name=gpu_pipe",
-            ])
+            ))
 
         # Network with ADB port forwarding (disable PXE boot ROM)
-        cmd.extend([
+        cmd.extend((
             "-netdev", f"user,id=net0,hostfwd=tcp::{self._config.adb_port}-:5555",
             "-device", "e1000,netdev=net0,romfile="  # Disable PXE ROM
-        ])
-
-        # USB support for ADB
-        cmd.extend(["-usb", "-device", "usb-tablet"])
+        ))
 
-        # Random number generator
-        cmd.extend(["-device", "virtio-rng-pci"])
+        # USB tablet input and random number generator
+        cmd.extend(self._INPUT_RNG_ARGS)
 
         # CD-ROM for ISO boot (Android-x86)
         if self._config.cdrom_image:
-            cmd.extend(["-cdrom", self._config.cdrom_image])
+            cmd.extend(("-cdrom", self._config.cdrom_image))
+
+        # QMP monitor for runtime control
+        if self._config.qmp_socket:
+            cmd.extend((
+                "-qmp", f"unix:{self._config.qmp_socket},server=on,wait=off"
+            ))
+
+        # Resume a saved VM state instead of cold booting
+        if self._config.snapshot_tag:
+            cmd.extend(("-loadvm", self._config.snapshot_tag))
 
         # Boot order
         if self._config.kernel:
             # Direct kernel boot - no menu needed
-            cmd.extend(["-boot", "order=c,strict=on"])
+            cmd.extend(("-boot", "order=c,strict=on"))
         elif self._config.cdrom_image:
             # Boot from CD-ROM first (for ISO boot)
-            cmd.extend(["-boot", "order=d,menu=on"])
+            cmd.extend(("-boot", "order=d,menu=on"))
         else:
             # Disk boot with menu for debugging
-            cmd.extend(["-boot", "order=cd,menu=on"])
+            cmd.extend(("-boot", "order=cd,menu=on"))
 
         # Extra arguments
         cmd.extend(self._config.extra_args)
 
         return cmd
 
-    def _monitor_process(self) -> None:
-        """Monitor the QEMU process in a background thread."""
-        while not self._stop_event.is_set():
-            if self._process is None:
-                break
-
-            # Check if process is still running
-            retcode = self._process.poll()
-            if retcode is not None:
-                # Process has exited
-                if retcode == 0:
-                    self._set_state(QEMUState.STOPPED)
-                else:
-                    self._error_message = f"QEMU exited with code {retcode}"
-                    self._set_state(QEMUState.ERROR)
-                self._pid = None
-                break
-
-            time.sleep(0.5)
+    def _drive_args(self, name: str, image: str, fmt: str, index: int) -> List[str]:
+        """Build the arguments attaching one disk image.
+
+        Drives bypass the host page cache and submit I/O through io_uring,
+        or Linux native AIO on kernels without it. virtio disks are set up
+        as -blockdev node chains so swap_drive() can replace the image
+        while the VM runs.
+        """
+        aio = "io_uring" if _supports_io_uring() else "native"
+        if not self._config.use_virtio_blk:
+            options = f"format={fmt},cache=none,aio={aio},discard=unmap"
+            return ["-drive", f"file={image},{options},if=ide,index={index}"]
+
+        chain = self._blockdev_chain(name, image, fmt, aio)
+        self._disk_chains[name] = [node["node-name"] for node in chain]
+        args = []
+        for node in chain:
+            args.extend(("-blockdev", _blockdev_arg(node)))
+        args.extend((
+            "-blockdev", _blockdev_arg(self._disk_node(name, chain[-1])),
+            "-device",
+            f"virtio-blk-pci,drive={name},iothread=io-blk,"
+            f"num-queues={self._config.cpu_cores}",
+        ))
+        return args
+
+    def _blockdev_chain(self, name: str, image: str, fmt: str, aio: str) -> List[Dict[str, Any]]:
+        """Return blockdev options for an image's nodes, bottom-up.
+
+        The chain is the file node plus, for non-raw images, a format node
+        on top of it. Node names carry the disk generation so a swapped-in
+        chain never clashes with the one it replaces.
+        """
+        generation = self._disk_generation
+        chain: List[Dict[str, Any]] = [{
+            "driver": "file",
+            "node-name": f"{name}-file{generation}",
+            "filename": image,
+            "cache": {"direct": True},
+            "aio": aio,
+            "discard": "unmap",
+        }]
+        if fmt != "raw":
+            chain.append({
+                "driver": fmt,
+                "node-name": f"{name}-{fmt}{generation}",
+                "file": chain[0]["node-name"],
+                "discard": "unmap",
+            })
+        return chain
+
+    @staticmethod
+    def _disk_node(name: str, child: Dict[str, Any]) -> Dict[str, Any]:
+        """Options for the raw node a disk's device attaches to.
+
+        It passes requests straight through to its file child, which is
+        what swap_drive() re-points at a new image chain.
+        """
+        return {
+            "driver": "raw",
+            "node-name": name,
+            "file": child["node-name"],
+            "discard": "unmap",
+        }
+
+    def _pin_command(self, cmd: List[str]) -> Tuple[List[str], Optional[FrozenSet[int]]]:
+        """Wrap cmd in taskset, pinning QEMU to CPUs of its own.
+
+        One CPU per vCPU plus one for the main loop and iothreads. Every
+        QEMU thread inherits the mask, so concurrent instances never
+        compete for a core.
+
+        Returns:
+            Tuple of (command, reserved CPUs or None if unpinned)
+        """
+        if not self._config.pin_cpus:
+            return cmd, None
+        taskset = _resolve_binary("taskset")
+        if not os.path.isabs(taskset):
+            return cmd, None
+        cpus = _cpusets.acquire(self._config.cpu_cores + 1)
+        if cpus is None:
+            return cmd, None
+        cpu_list = ",".join(str(cpu) for cpu in sorted(cpus))
+        return [taskset, "-c", cpu_list, *cmd], cpus
+
+    def _watch(
+        self,
+        process: subprocess.Popen,
+        cpus: Optional[FrozenSet[int]] = None,
+    ) -> None:
+        """Track a freshly spawned QEMU process until it exits.
+
+        Opens a pidfd for signalling it; the child cannot have been
+        reaped yet, so the pidfd is sure to refer to it. Its CPUs are
+        freed once the reaper sees it exit.
+        """
+        self._close_pidfd()
+        try:
+            self._pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            self._pidfd = None
+        exited = threading.Event()
+        self._exited = exited
+        _reaper.watch(
+            process,
+            functools.partial(self._on_process_exit, cpus=cpus, exited=exited),
+        )
+
+    def _send_signal(self, process: subprocess.Popen, sig: int) -> None:
+        """Signal the QEMU process through its pidfd where available."""
+        if self._pidfd is None:
+            # Popen will not signal a pid it has already reaped.
+            process.send_signal(sig)
+            return
+        try:
+            signal.pidfd_send_signal(self._pidfd, sig)
+        except ProcessLookupError:
+            pass  # already exited
+
+    def read_stderr(self, limit: int = STDERR_TAIL_SIZE) -> str:
+        """Return the last limit bytes QEMU wrote to stderr in its latest run."""
+        fd = self._stderr_fd
+        if fd is None:
+            return ""
+        size = os.fstat(fd).st_size
+        start = max(0, size - limit)
+        return os.pread(fd, size - start, start).decode(errors="replace")
+
+    def _close_stderr_capture(self) -> None:
+        fd, self._stderr_fd = self._stderr_fd, None
+        if fd is not None:
+            os.close(fd)
+
+    def _close_pidfd(self) -> None:
+        pidfd, self._pidfd = self._pidfd, None
+        if pidfd is not None:
+            os.close(pidfd)
+
+    def _on_process_exit(
+        self,
+        process: subprocess.Popen,
+        cpus: Optional[FrozenSet[int]] = None,
+        exited: Optional[threading.Event] = None,
+    ) -> None:
+        """Record the exit of a QEMU process; runs on the reaper thread."""
+        retcode = process.poll()  # reaps the child
+        _cpusets.release(cpus)
+        if exited is not None:
+            exited.set()
+        # Exits caused by stop()/force_stop(), or of a previous run, are
+        # already accounted for.
+        if process is not self._process or self._state == QEMUState.STOPPING:
+            return
+        if retcode == 0:
+            self._set_state(QEMUState.STOPPED)
+        else:
+            self._error_message = f"QEMU exited with code {retcode}"
+            self._set_state(QEMUState.ERROR)
+        self._pid = None
 
     def start(self) -> None:
         """Start the QEMU process."""
         if self._state in (QEMUState.RUNNING, QEMUState.STARTING):
             raise QEMUProcessError("QEMU is already running")
 
-        if not self._check_qemu_available():
+        if not _qemu_available(self._binary):
             self._error_message = f"QEMU binary '{self.QEMU_BINARY}' not found"
             self._set_state(QEMUState.ERROR)
             raise QEMUProcessError(self._error_message)
@@ -326,8 +783,24 @@ class QEMUProcess:
             self._set_state(QEMUState.ERROR)
             raise QEMUProcessError(self._error_message)
 
-        if not os.path.exists(self._config.system_image):
-            self._error_message = f"System image not found: {self._config.system_image}"
+        config = self._config
+        images = [
+            path for path in (
+                config.system_image, config.userdata_image, config.data_image,
+                config.cdrom_image, config.kernel, config.initrd,
+            ) if path
+        ]
+        missing = _missing_files(images)
+        if missing:
+            if missing == [config.system_image]:
+                self._error_message = f"System image not found: {config.system_image}"
+            else:
+                self._error_message = f"Image files not found: {', '.join(missing)}"
+            self._set_state(QEMUState.ERROR)
+            raise QEMUProcessError(self._error_message)
+
+        if self._config.snapshot_tag and not self._config.userdata_image:
+            self._error_message = "Snapshot boot requires a qcow2 userdata image"
             self._set_state(QEMUState.ERROR)
             raise QEMUProcessError(self._error_message)
 
@@ -337,25 +810,39 @@ class QEMUProcess:
         if not _is_port_available(self._config.vnc_port):
             self._config.vnc_port = _find_available_port(self._config.vnc_port)
 
+        # Every launch gets a QMP monitor; unless a path is configured its
+        # socket lives in a private directory that stop() removes again
+        if not self._config.qmp_socket:
+            self._qmp_dir = tempfile.mkdtemp(prefix="qemu-qmp-")
+            self._config.qmp_socket = os.path.join(self._qmp_dir, "qmp.sock")
+
         self._set_state(QEMUState.STARTING)
-        self._stop_event.clear()
 
         try:
             cmd = self._build_command()
-            self._process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE,
-            )
+            # An absolute executable and close_fds=False let Popen launch
+            # QEMU with posix_spawn (vfork) instead of fork+exec, so spawn
+            # cost does not grow with this process's memory size. Python
+            # creates its fds close-on-exec, so none leak into QEMU.
+            cmd[0] = _resolve_binary(cmd[0])
+            cmd, cpus = self._pin_command(cmd)
+            try:
+                # Nothing is exchanged over stdio; stderr is kept for
+                # the error message if QEMU fails to start.
+                self._close_stderr_capture()
+                self._stderr_fd = _open_stderr_capture()
+                self._process = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=self._stderr_fd,
+                    stdin=subprocess.DEVNULL,
+                    close_fds=False,
+                )
+            except BaseException:
+                _cpusets.release(cpus)
+                raise
             self._pid = self._process.pid
-
-            # Start monitoring thread
-            self._monitor_thread = threading.Thread(
-                target=self._monitor_process,
-                daemon=True
-            )
-            self._monitor_thread.start()
+            self._watch(self._process, cpus)
 
             # Give QEMU a moment to start
             time.sleep(1)
@@ -364,8 +851,7 @@ class QEMUProcess:
             if self._process.poll() is None:
                 self._set_state(QEMUState.RUNNING)
             else:
-                stderr = self._process.stderr.read().decode() if self._process.stderr else ""
-                self._error_message = f"QEMU failed to start: {stderr}"
+                self._error_message = f"QEMU failed to start: {self.read_stderr()}"
                 self._set_state(QEMUState.ERROR)
                 raise QEMUProcessError(self._error_message)
 
@@ -384,46 +870,240 @@ class QEMUProcess:
             return
 
         self._set_state(QEMUState.STOPPING)
-        self._stop_event.set()
 
         if self._process is not None:
             try:
-                # Try graceful shutdown first
-                self._process.terminate()
-                try:
-                    self._process.wait(timeout=timeout)
-                except subprocess.TimeoutExpired:
+                # Try graceful shutdown first; the reaper reports the exit
+                self._send_signal(self._process, signal.SIGTERM)
+                if not self._exited.wait(timeout):
                     # Force kill if timeout
-                    self._process.kill()
-                    self._process.wait(timeout=5)
+                    self._send_signal(self._process, signal.SIGKILL)
+                    self._exited.wait(5)
             except Exception:
                 pass
             finally:
                 self._process = None
                 self._pid = None
+                self._close_pidfd()
 
-        if self._monitor_thread is not None:
-            self._monitor_thread.join(timeout=2)
-            self._monitor_thread = None
-
+        self._qmp_close()
+        self._remove_qmp_socket()
         self._set_state(QEMUState.STOPPED)
 
     def force_stop(self) -> None:
         """Forcefully kill the QEMU process."""
-        if self._process is not None:
+        process, self._process = self._process, None
+        if process is not None:
             try:
-                self._process.kill()
+                self._send_signal(process, signal.SIGKILL)
             except Exception:
                 pass
-        self._stop_event.set()
-        self._process = None
+        self._close_pidfd()
         self._pid = None
+        self._qmp_close()
+        self._remove_qmp_socket()
         self._set_state(QEMUState.STOPPED)
 
+    def _remove_qmp_socket(self) -> None:
+        """Remove the default QMP socket and its directory, if we made them."""
+        qmp_dir, self._qmp_dir = self._qmp_dir, None
+        if qmp_dir is not None:
+            self._config.qmp_socket = None
+            shutil.rmtree(qmp_dir, ignore_errors=True)
+
     def send_key(self, key: str) -> None:
-        """Send a key event to the VM (requires QEMU monitor)."""
-        # This would require QEMU monitor connection
-        pass
+        """
+        Press and release a key in the VM through the QMP monitor.
+
+        Args:
+            key: QEMU key code name, e.g. "ret", "a" or "ctrl"
+
+        Raises:
+            QEMUProcessError: If no QMP socket is configured or QEMU
+                rejects the key
+        """
+        self._qmp_command(
+            "send-key", {"keys": [{"type": "qcode", "data": key}]}
+        )
+
+    def swap_drive(self, node: str, path: str) -> None:
+        """
+        Replace the image behind a virtio disk while the VM runs.
+
+        The new image chain is added with blockdev-add and the disk's
+        device node re-pointed at it with blockdev-reopen (QEMU 6.1+), so
+        rotating userdata or data images needs no restart. The guest
+        must not have the disk mounted during the swap.
+
+        Args:
+            node: Disk name: "system", "userdata" or "data"
+            path: Image file in the disk's format
+
+        Raises:
+            QEMUProcessError: If QEMU is not running, the disk is not an
+                attached virtio disk, or QEMU rejects the swap
+        """
+        if self._state != QEMUState.RUNNING:
+            raise QEMUProcessError("QEMU is not running")
+        old_chain = self._disk_chains.get(node)
+        if old_chain is None:
+            raise QEMUProcessError(f"No hot-swappable disk '{node}'")
+        fmt = next(fmt for name, _, fmt in self._DISKS if name == node)
+        aio = "io_uring" if _supports_io_uring() else "native"
+
+        self._disk_generation += 1
+        chain = self._blockdev_chain(node, path, fmt, aio)
+        added: List[str] = []
+        try:
+            for options in chain:
+                self._qmp_command("blockdev-add", options)
+                added.append(options["node-name"])
+            self._qmp_command(
+                "blockdev-reopen",
+                {"options": [self._disk_node(node, chain[-1])]},
+            )
+        except QEMUProcessError:
+            for node_name in reversed(added):
+                try:
+                    self._qmp_command("blockdev-del", {"node-name": node_name})
+                except QEMUProcessError:
+                    pass
+            raise
+        self._disk_chains[node] = added
+        for node_name in reversed(old_chain):
+            self._qmp_command("blockdev-del", {"node-name": node_name})
+
+    def save_snapshot(self, tag: str) -> None:
+        """
+        Save the running VM's state under tag for a later snapshot boot.
+
+        The state is stored in the qcow2 disks; a QEMUConfig with
+        snapshot_tag=tag then resumes from it instead of booting. Every
+        writable disk must be qcow2, typically an overlay created with
+        qemu-img create -f qcow2 -b base.qcow2 overlay.qcow2.
+
+        Raises:
+            QEMUProcessError: If QEMU is not running, has no QMP socket,
+                or fails to save the snapshot
+        """
+        if self._state != QEMUState.RUNNING:
+            raise QEMUProcessError("QEMU is not running")
+        # savevm reports failures as text rather than a QMP error.
+        output = self._qmp_command(
+            "human-monitor-command",
+            {"command-line": f"savevm {tag}"},
+            timeout=SNAPSHOT_TIMEOUT,
+        )
+        if output:
+            raise QEMUProcessError(f"savevm failed: {output.strip()}")
+
+    def _qmp_command(
+        self,
+        command: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        timeout: float = QMP_TIMEOUT,
+    ) -> Any:
+        """Run one command on the QMP monitor and return its result."""
+        request: Dict[str, Any] = {"execute": command}
+        if arguments:
+            request["arguments"] = arguments
+        return self._qmp_batch([request], timeout)[0]
+
+    def _qmp_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        timeout: float = QMP_TIMEOUT,
+    ) -> List[Any]:
+        """
+        Run several QMP commands with one write and return their results.
+
+        QMP executes pipelined commands in order and replies to each, so
+        a batch costs one round trip. The monitor connection is opened on
+        first use and kept for later commands.
+
+        Raises:
+            QEMUProcessError: If the monitor is unreachable or any command
+                fails; commands after a failed one still run
+        """
+        names = ", ".join(request["execute"] for request in requests)
+        payload = b"".join(
+            json.dumps(request).encode() + b"\r\n" for request in requests
+        )
+        with self._qmp_lock:
+            try:
+                stream = self._qmp_connect()
+                self._qmp_sock.settimeout(timeout)
+                stream.write(payload)
+                stream.flush()
+                replies = [self._qmp_reply(stream) for _ in requests]
+            except (OSError, ValueError, QEMUProcessError) as e:
+                self._qmp_close_locked()
+                raise QEMUProcessError(f"QMP {names} failed: {e}") from e
+        results = []
+        for request, reply in zip(requests, replies):
+            if "error" in reply:
+                raise QEMUProcessError(
+                    f"QMP {request['execute']} failed: {reply['error'].get('desc')}"
+                )
+            results.append(reply["return"])
+        return results
+
+    def _qmp_connect(self):
+        """Return the monitor stream, connecting and negotiating if needed."""
+        if self._qmp_stream is not None:
+            return self._qmp_stream
+        if not self._config.qmp_socket:
+            raise QEMUProcessError("No QMP socket configured")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(QMP_TIMEOUT)
+            sock.connect(self._config.qmp_socket)
+            stream = sock.makefile("rwb")
+            self._qmp_read(stream)  # greeting
+            stream.write(b'{"execute": "qmp_capabilities"}\r\n')
+            stream.flush()
+            reply = self._qmp_reply(stream)
+            if "error" in reply:
+                raise QEMUProcessError(
+                    f"QMP negotiation failed: {reply['error'].get('desc')}"
+                )
+        except BaseException:
+            sock.close()
+            raise
+        self._qmp_sock, self._qmp_stream = sock, stream
+        return stream
+
+    def _qmp_close(self) -> None:
+        """Close the cached monitor connection, if any."""
+        with self._qmp_lock:
+            self._qmp_close_locked()
+
+    def _qmp_close_locked(self) -> None:
+        if self._qmp_stream is not None:
+            try:
+                self._qmp_stream.close()
+            except OSError:
+                pass
+        if self._qmp_sock is not None:
+            self._qmp_sock.close()
+        self._qmp_sock = None
+        self._qmp_stream = None
+
+    @classmethod
+    def _qmp_reply(cls, stream) -> Dict[str, Any]:
+        """Read the next command reply, skipping asynchronous events."""
+        while True:
+            reply = cls._qmp_read(stream)
+            if "return" in reply or "error" in reply:
+                return reply
+
+    @staticmethod
+    def _qmp_read(stream) -> Dict[str, Any]:
+        """Read one QMP message."""
+        line = stream.readline()
+        if not line:
+            raise QEMUProcessError("QMP connection closed")
+        return json.loads(line)
 
     def get_vnc_address(self) -> str:
         """Get the VNC server address for this instance."""
@@ -436,6 +1116,7 @@ class QEMUProcess:
     def cleanup(self) -> None:
         """Clean up all resources."""
         self.force_stop()
+        self._close_stderr_capture()
         self._state_callbacks.clear()
 
         # Clean up GPU pipe socket if we created it
@@ -0,0 +1,97 @@
+"""
+Bounded single-producer/single-consumer ring buffer.
+
+Hands items from one thread to another without a lock on the data path:
+only the producer advances the tail and only the consumer advances the
+head. Events wake the other side instead of busy-waiting when the ring
+is empty or full.
+"""
+
+import threading
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SPSCRing(Generic[T]):
+    """
+    Lock-free ring for exactly one producer thread and one consumer thread.
+
+    Capacity is rounded up to a power of two so slot indexing is a mask.
+    None marks an empty slot, so None itself cannot be enqueued.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._capacity = size
+        self._mask = size - 1
+        self._slots: List[Optional[T]] = [None] * size
+        self._head = 0  # next slot to read; written by the consumer only
+        self._tail = 0  # next slot to write; written by the producer only
+        self._not_empty = threading.Event()
+        self._not_full = threading.Event()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def try_enqueue(self, item: T) -> bool:
+        """Add item if there is room. Producer thread only."""
+        tail = self._tail
+        if tail - self._head >= self._capacity:
+            return False
+        self._slots[tail & self._mask] = item
+        self._tail = tail + 1
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+        return True
+
+    def try_dequeue(self) -> Optional[T]:
+        """Remove and return the oldest item, or None if empty. Consumer only."""
+        head = self._head
+        if head == self._tail:
+            return None
+        index = head & self._mask
+        item = self._slots[index]
+        self._slots[index] = None
+        self._head = head + 1
+        if not self._not_full.is_set():
+            self._not_full.set()
+        return item
+
+    def enqueue(self, item: T, timeout: Optional[float] = None) -> bool:
+        """Add item, waiting up to timeout for room. Producer thread only.
+
+        Returns:
+            True if the item was added, False on timeout
+        """
+        if self.try_enqueue(item):
+            return True
+        self._not_full.clear()
+        # Re-check after clearing so a dequeue in between is not missed.
+        if self.try_enqueue(item):
+            return True
+        return self._not_full.wait(timeout) and self.try_enqueue(item)
+
+    def dequeue(self, timeout: Optional[float] = None) -> Optional[T]:
+        """Remove the oldest item, waiting up to timeout. Consumer only.
+
+        Returns:
+            The item, or None on timeout
+        """
+        item = self.try_dequeue()
+        if item is not None:
+            return item
+        self._not_empty.clear()
+        # Re-check after clearing so an enqueue in between is not missed.
+        item = self.try_dequeue()
+        if item is not None:
+            return item
+        if self._not_empty.wait(timeout):
+            return self.try_dequeue()
+        return None
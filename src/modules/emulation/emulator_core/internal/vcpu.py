@@ -1,47 +1,100 @@
 """
-Virtual CPU stub.
+Virtual CPU.
 
-Represents a single virtual CPU within the emulator.
+Represents a single virtual CPU within the emulator. Register state is
+laid out exactly like struct kvm_regs, so KVM_GET_REGS and KVM_SET_REGS
+read and write it in place with no per-field conversion. The registers
+of all vCPUs of a VM can share one contiguous register bank, so scans
+and checkpoints across vCPUs walk a single block of memory.
 """
 
-from typing import Optional
-from dataclasses import dataclass, field
-
-
-@dataclass
-class VCPURegisters:
-    """General-purpose register state for a virtual CPU."""
-    rax: int = 0
-    rbx: int = 0
-    rcx: int = 0
-    rdx: int = 0
-    rsi: int = 0
-    rdi: int = 0
-    rsp: int = 0
-    rbp: int = 0
-    r8: int = 0
-    r9: int = 0
-    r10: int = 0
-    r11: int = 0
-    r12: int = 0
-    r13: int = 0
-    r14: int = 0
-    r15: int = 0
-    rip: int = 0
-    rflags: int = 0x0002  # Reserved bit always set
+import ctypes
+import fcntl
+from typing import List, Optional
+
+from .kvm_wrapper import KVM_GET_REGS, KVM_SET_REGS, REGISTER_NAMES, KVMError
+
+# Power-on value of RFLAGS: only the reserved bit 1 is set.
+RFLAGS_RESERVED = 0x0002
+
+
+class VCPURegisters(ctypes.Structure):
+    """General-purpose register state for a virtual CPU (struct kvm_regs)."""
+    _fields_ = [(name, ctypes.c_uint64) for name in REGISTER_NAMES]
+
+    def __init__(self, **registers: int) -> None:
+        registers.setdefault("rflags", RFLAGS_RESERVED)
+        super().__init__(**registers)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VCPURegisters):
+            return NotImplemented
+        return bytes(self) == bytes(other)
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{name}={getattr(self, name):#x}" for name in REGISTER_NAMES
+        )
+        return f"VCPURegisters({values})"
+
+
+_REGISTER_COUNT = len(REGISTER_NAMES)
+_REGISTER_INDEX = {name: index for index, name in enumerate(REGISTER_NAMES)}
+
+
+class VCPURegisterBank:
+    """
+    Register state of every vCPU of a VM in one contiguous array.
+
+    Row i holds vCPU i's registers as a VCPURegisters view into the bank.
+    """
+
+    def __init__(self, n_vcpus: int) -> None:
+        if n_vcpus <= 0:
+            raise ValueError(f"Invalid vCPU count: {n_vcpus}")
+        self._regs = (VCPURegisters * n_vcpus)()
+        for row in self._regs:
+            row.rflags = RFLAGS_RESERVED
+        self._words = memoryview(self._regs).cast("B").cast("Q")
+
+    def __len__(self) -> int:
+        return len(self._regs)
+
+    def row(self, vcpu_id: int) -> VCPURegisters:
+        """Return vCPU vcpu_id's registers, sharing the bank's memory."""
+        return self._regs[vcpu_id]
+
+    def column(self, name: str) -> List[int]:
+        """Return one register's value for every vCPU, e.g. all RIPs."""
+        return self._words[_REGISTER_INDEX[name]::_REGISTER_COUNT].tolist()
+
+    def checkpoint(self) -> bytes:
+        """Copy the whole bank out in one block."""
+        return bytes(self._regs)
+
+    def restore(self, data: bytes) -> None:
+        """Load a checkpoint() taken from a bank of the same size."""
+        if len(data) != ctypes.sizeof(self._regs):
+            raise ValueError(
+                f"Checkpoint of {len(data)} bytes does not fit a bank of "
+                f"{len(self)} vCPUs"
+            )
+        ctypes.memmove(self._regs, data, len(data))
 
 
 class VirtualCPU:
     """
     Represents a single virtual CPU.
 
-    Stub implementation -- all execution methods raise NotImplementedError.
+    Register transfer works once attached to a KVM vCPU descriptor;
+    execution methods raise NotImplementedError.
     """
 
-    def __init__(self, vcpu_id: int) -> None:
+    def __init__(self, vcpu_id: int, bank: Optional[VCPURegisterBank] = None) -> None:
         self._id = vcpu_id
         self._fd: Optional[int] = None
-        self._registers = VCPURegisters()
+        # Registers live in the VM's bank when given one.
+        self._registers = bank.row(vcpu_id) if bank is not None else VCPURegisters()
         self._running = False
 
     @property
@@ -54,7 +107,7 @@ class VirtualCPU:
 
     def attach(self, vcpu_fd: int) -> None:
         """Attach to a KVM vCPU file descriptor."""
-        raise NotImplementedError("VirtualCPU requires KVM backend")
+        self._fd = vcpu_fd
 
     def run(self) -> None:
         """Execute until the next VM exit."""
@@ -65,14 +118,35 @@ class VirtualCPU:
         raise NotImplementedError("VirtualCPU requires KVM backend")
 
     def read_registers(self) -> VCPURegisters:
-        """Read current register state from KVM."""
-        raise NotImplementedError("VirtualCPU requires KVM backend")
+        """Read current register state from KVM into registers."""
+        try:
+            fcntl.ioctl(self._attached_fd(), KVM_GET_REGS, self._registers, True)
+        except OSError as e:
+            raise KVMError(f"KVM_GET_REGS failed: {e}") from e
+        return self._registers
 
     def write_registers(self, regs: VCPURegisters) -> None:
         """Write register state to KVM."""
-        raise NotImplementedError("VirtualCPU requires KVM backend")
+        try:
+            fcntl.ioctl(self._attached_fd(), KVM_SET_REGS, regs)
+        except OSError as e:
+            raise KVMError(f"KVM_SET_REGS failed: {e}") from e
+        if regs is not self._registers:
+            ctypes.memmove(
+                ctypes.addressof(self._registers), ctypes.addressof(regs),
+                ctypes.sizeof(VCPURegisters),
+            )
 
     def reset(self) -> None:
         """Reset vCPU to initial power-on state."""
-        self._registers = VCPURegisters()
+        # In place, so a bank row stays part of its bank.
+        ctypes.memmove(
+            ctypes.addressof(self._registers), ctypes.addressof(VCPURegisters()),
+            ctypes.sizeof(VCPURegisters),
+        )
         self._running = False
+
+    def _attached_fd(self) -> int:
+        if self._fd is None:
+            raise KVMError(f"vCPU {self._id} is not attached")
+        return self._fd
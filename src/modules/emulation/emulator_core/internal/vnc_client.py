@@ -3,14 +3,43 @@ Simple VNC client for receiving framebuffer from QEMU.
 
 Implements the RFB (Remote Framebuffer) protocol to receive
 display updates from the QEMU VNC server.
+
+Rectangles that span whole rows, including full frames, are received
+straight into a framebuffer slot. Others land in one scratch buffer
+reused across updates and are copied into the slot row by row. Either
+way a frame is never assembled from chunks and the allocator is not
+hit per update. The receiver draws each update into the oldest of a few slots
+and publishes it with a single reference store, so consumers read the
+latest frame without a lock and never see a half-drawn one.
 """
 
+import selectors
 import socket
 import struct
 import threading
-import time
-from typing import Optional, Callable, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Callable, Tuple, Union
+from dataclasses import dataclass, field
+
+# RFB message layouts, compiled once. Shared:
+_PIXEL_FORMAT_FIELDS = "BBBBHHHBBBxxx"
+_PIXEL_FORMAT_BODY_STRUCT = struct.Struct("!" + _PIXEL_FORMAT_FIELDS)
+# Client to server:
+_PIXEL_FORMAT_STRUCT = struct.Struct("!Bxxx" + _PIXEL_FORMAT_FIELDS)
+_FB_REQUEST_STRUCT = struct.Struct("!BBHHHH")
+_KEY_EVENT_STRUCT = struct.Struct("!BBxxI")
+_POINTER_EVENT_STRUCT = struct.Struct("!BBHH")
+# Server to client:
+_U32_STRUCT = struct.Struct("!I")
+_SERVER_INIT_STRUCT = struct.Struct("!HH16xI")  # pixel format skipped
+_UPDATE_HEADER_STRUCT = struct.Struct("!xH")  # after the message type
+_RECT_HEADER_STRUCT = struct.Struct("!HHHHi")
+
+# Ask the kernel to fill the whole buffer in one recv where supported.
+_MSG_WAITALL = getattr(socket, "MSG_WAITALL", 0)
+
+# Framebuffer slots: one being drawn, the published one, and one more
+# so a consumer's frame survives the next update.
+FRAME_SLOTS = 3
 
 
 @dataclass
@@ -18,8 +47,99 @@ class FrameData:
     """Container for framebuffer data."""
     width: int
     height: int
-    data: bytes  # Raw RGB or RGBA pixel data
+    data: Union[bytes, bytearray, memoryview]  # Raw RGB or RGBA pixel data
     format: str = "rgb"  # rgb, rgba, bgr, bgra
+    _converted: Dict[Tuple[str, bool], bytes] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def to_rgba(self, opaque: bool = False) -> Union[bytes, bytearray, memoryview]:
+        """
+        Return the pixels as RGBA.
+
+        Args:
+            opaque: Set alpha to 255 instead of copying it; use for
+                sources whose fourth byte is padding, such as VNC frames
+        """
+        return self._convert("rgba", opaque)
+
+    def to_rgb(self) -> Union[bytes, bytearray, memoryview]:
+        """Return the pixels as RGB, dropping any alpha channel."""
+        return self._convert("rgb", False)
+
+    def to_bgr(self) -> Union[bytes, bytearray, memoryview]:
+        """Return the pixels as BGR, dropping any alpha channel (OpenCV order)."""
+        return self._convert("bgr", False)
+
+    def _convert(self, target: str, opaque: bool) -> Union[bytes, bytearray, memoryview]:
+        """Reorder channels into target, caching the result per frame.
+
+        Each output channel is filled by one strided slice assignment,
+        which runs in C over the whole frame. data itself is not touched.
+        """
+        if self.format == target and not opaque:
+            return self.data
+        key = (target, opaque)
+        converted = self._converted.get(key)
+        if converted is not None:
+            return converted
+
+        source = self.format
+        src_step = len(source)
+        dst_step = len(target)
+        data = memoryview(self.data).cast("B")
+        pixels = len(data) // src_step
+        out = bytearray(pixels * dst_step)
+        for channel_index, channel in enumerate(target):
+            src_index = source.find(channel)
+            if src_index < 0 or (channel == "a" and opaque):
+                out[channel_index::dst_step] = b"\xff" * pixels
+            else:
+                out[channel_index::dst_step] = data[src_index::src_step]
+        converted = self._converted[key] = bytes(out)
+        return converted
+
+
+@dataclass(frozen=True)
+class PixelFormat:
+    """An RFB PIXEL_FORMAT."""
+    bits_per_pixel: int
+    depth: int
+    big_endian: bool
+    true_color: bool
+    red_max: int
+    green_max: int
+    blue_max: int
+    red_shift: int
+    green_shift: int
+    blue_shift: int
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> "PixelFormat":
+        """Decode the 16-byte wire form."""
+        fields = _PIXEL_FORMAT_BODY_STRUCT.unpack_from(buffer, offset)
+        return cls(
+            fields[0], fields[1], bool(fields[2]), bool(fields[3]), *fields[4:]
+        )
+
+
+def _bgrx_pixel_format(big_endian: bool) -> PixelFormat:
+    """
+    32-bit pixels that land in memory as B, G, R, X bytes.
+
+    Either byte order gives that layout with matching shifts, so the
+    server can keep its own order and never swap bytes per pixel.
+    """
+    return PixelFormat(
+        bits_per_pixel=32,
+        depth=24,
+        big_endian=big_endian,
+        true_color=True,
+        red_max=255, green_max=255, blue_max=255,
+        red_shift=8 if big_endian else 16,
+        green_shift=16 if big_endian else 8,
+        blue_shift=24 if big_endian else 0,
+    )
 
 
 class VNCError(Exception):
@@ -63,11 +183,24 @@ class VNCClient:
         self._connected = False
         self._width = 0
         self._height = 0
-        self._framebuffer: Optional[bytes] = None
+        # Pixel format the server sends, once negotiated in connect()
+        self._pixel_format: Optional[PixelFormat] = None
+        # Framebuffer slots; _front is the slot of the published frame.
+        self._slots: List[bytearray] = []
+        self._next_slot = 0
+        self._front: Optional[bytearray] = None
+        self._published: Optional[FrameData] = None
+        # Receive buffer for rectangle pixels, grown as needed
+        self._recv_buf = bytearray()
+        self._header_buf = bytearray(_RECT_HEADER_STRUCT.size)
+        # Set once the whole screen has been received; later requests
+        # are incremental, so the server only sends what changed.
+        self._have_full_frame = False
         self._frame_callback: Optional[Callable[[FrameData], None]] = None
         self._receiver_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._lock = threading.Lock()
+        # Write end of the receiver's wakeup socketpair, while it runs
+        self._wake_sock: Optional[socket.socket] = None
 
     @property
     def connected(self) -> bool:
@@ -91,49 +224,59 @@ class VNCClient:
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._socket.settimeout(timeout)
             self._socket.connect((self._host, self._port))
+            # Key and pointer events are tiny; send them without a
+            # Nagle delay
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
             # Protocol version exchange
-            server_version = self._socket.recv(12)
+            server_version = bytes(self._recv_exact(12))
             if not server_version.startswith(b"RFB "):
                 raise VNCError(f"Invalid server version: {server_version}")
 
-            self._socket.send(self.RFB_VERSION)
+            self._socket.sendall(self.RFB_VERSION)
 
             # Security handshake
-            num_sec_types = struct.unpack("!B", self._socket.recv(1))[0]
+            num_sec_types = self._recv_exact(1)[0]
             if num_sec_types == 0:
                 # Server error
-                reason_len = struct.unpack("!I", self._socket.recv(4))[0]
-                reason = self._socket.recv(reason_len).decode()
+                reason_len = self._recv_header(_U32_STRUCT)[0]
+                reason = self._recv_exact(reason_len).decode()
                 raise VNCError(f"Server rejected connection: {reason}")
 
-            sec_types = self._socket.recv(num_sec_types)
+            sec_types = self._recv_exact(num_sec_types)
             if self.SEC_NONE in sec_types:
-                self._socket.send(bytes([self.SEC_NONE]))
+                self._socket.sendall(bytes([self.SEC_NONE]))
             else:
                 raise VNCError("Server requires authentication (not supported)")
 
             # Check security result
-            result = struct.unpack("!I", self._socket.recv(4))[0]
+            result = self._recv_header(_U32_STRUCT)[0]
             if result != 0:
                 raise VNCError("Security handshake failed")
 
             # Send client init (shared flag = 1)
-            self._socket.send(bytes([1]))
+            self._socket.sendall(bytes([1]))
 
             # Receive server init
-            init_data = self._socket.recv(24)
-            self._width, self._height = struct.unpack("!HH", init_data[:4])
-
-            # Skip pixel format (16 bytes) and name length
-            name_len = struct.unpack("!I", init_data[20:24])[0]
-            self._socket.recv(name_len)  # Skip server name
-
-            # Set pixel format to 32-bit RGBX
-            self._set_pixel_format()
-
-            # Set encodings (RAW only for simplicity)
-            self._set_encodings()
+            init_data = self._recv_exact(_SERVER_INIT_STRUCT.size)
+            self._width, self._height, name_len = (
+                _SERVER_INIT_STRUCT.unpack_from(init_data)
+            )
+            server_format = PixelFormat.unpack_from(init_data, 4)
+
+            # Skip server name into the scratch buffer, never decoded
+            if self._recv_rect(name_len) is None:
+                raise ConnectionError("VNC server closed the connection")
+
+            # Set pixel format to 32-bit BGRX in the server's byte order
+            # unless the server already uses it, and encodings (RAW only
+            # for simplicity), in one write
+            pixel_format = _bgrx_pixel_format(server_format.big_endian)
+            messages = [self._encodings_message()]
+            if server_format != pixel_format:
+                messages.insert(0, self._pixel_format_message(pixel_format))
+            self._pixel_format = pixel_format
+            self._send_messages(*messages)
 
             self._connected = True
 
@@ -149,150 +292,308 @@ class VNCClient:
             self.disconnect()
             raise VNCError(f"Connection failed: {e}")
 
-    def _set_pixel_format(self) -> None:
-        """Set pixel format to 32-bit RGB."""
+    def _pixel_format_message(self, pf: PixelFormat) -> bytes:
+        """Build a SetPixelFormat message."""
         # MessageType + padding + PixelFormat
-        msg = struct.pack(
-            "!BBBBBBBBHHHBBBxxx",
+        return _PIXEL_FORMAT_STRUCT.pack(
             self.MSG_SET_PIXEL_FORMAT,  # message type
-            0, 0, 0,  # padding
-            32,  # bits per pixel
-            24,  # depth
-            0,   # big endian (0 = little)
-            1,   # true color
-            255, 255, 255,  # max RGB values
-            16, 8, 0,  # RGB shifts
+            pf.bits_per_pixel,
+            pf.depth,
+            pf.big_endian,
+            pf.true_color,
+            pf.red_max, pf.green_max, pf.blue_max,
+            pf.red_shift, pf.green_shift, pf.blue_shift,
         )
-        self._socket.send(msg)
 
-    def _set_encodings(self) -> None:
-        """Set supported encodings."""
-        encodings = [self.ENC_RAW, self.ENC_DESKTOP_SIZE]
-        msg = struct.pack(
-            "!BBH",
+    def _encodings_message(self) -> bytes:
+        """Build a SetEncodings message for the supported encodings."""
+        encodings = (self.ENC_RAW, self.ENC_DESKTOP_SIZE)
+        # Header and encoding list packed in one call
+        return struct.pack(
+            f"!BxH{len(encodings)}i",
             self.MSG_SET_ENCODINGS,
-            0,  # padding
-            len(encodings)
+            len(encodings),
+            *encodings
         )
-        for enc in encodings:
-            msg += struct.pack("!i", enc)
-        self._socket.send(msg)
+
+    def _send_messages(self, *messages: bytes) -> None:
+        """
+        Send several messages with one gathering write.
+
+        sendmsg hands the kernel every buffer at once, so the messages
+        are neither joined in Python nor sent one syscall each.
+        """
+        sock = self._socket
+        if not hasattr(sock, "sendmsg"):
+            sock.sendall(b"".join(messages))
+            return
+        sent = sock.sendmsg(messages)
+        total = sum(len(message) for message in messages)
+        if sent < total:
+            # Short write: send the rest the plain way
+            sock.sendall(b"".join(messages)[sent:])
 
     def request_framebuffer(self, incremental: bool = False) -> None:
         """Request a framebuffer update from server."""
         if not self._connected or not self._socket:
             return
 
-        msg = struct.pack(
-            "!BBHHHH",
+        msg = _FB_REQUEST_STRUCT.pack(
             self.MSG_FRAMEBUFFER_UPDATE_REQUEST,
             1 if incremental else 0,
             0, 0,  # x, y
             self._width, self._height
         )
         try:
-            self._socket.send(msg)
+            self._socket.sendall(msg)
         except socket.error:
             pass
 
     def _receive_loop(self) -> None:
-        """Background thread to receive framebuffer updates."""
-        while not self._stop_event.is_set() and self._connected:
-            try:
+        """
+        Background thread to receive framebuffer updates.
+
+        Blocks in a selector until the server sends something or
+        disconnect() writes to the wakeup socketpair, so there is no
+        polling; the frame rate follows the server's updates.
+        """
+        sock = self._socket
+        wake_recv, wake_send = socket.socketpair()
+        self._wake_sock = wake_send
+        selector = selectors.DefaultSelector()
+        try:
+            sock.settimeout(None)
+            selector.register(sock, selectors.EVENT_READ)
+            selector.register(wake_recv, selectors.EVENT_READ)
+            # One request is answered by one update, so a request is only
+            # sent once the previous one has been answered.
+            request_pending = False
+            while not self._stop_event.is_set() and self._connected:
                 # Request full update initially, then incremental
-                self.request_framebuffer(incremental=False)
+                if not request_pending:
+                    self.request_framebuffer(incremental=self._have_full_frame)
+                    request_pending = True
 
                 # Wait for response
-                self._socket.settimeout(1.0)
-                try:
-                    msg_type = self._socket.recv(1)
-                    if not msg_type:
-                        break
-
-                    msg_type = struct.unpack("!B", msg_type)[0]
-
-                    if msg_type == self.MSG_FRAMEBUFFER_UPDATE:
-                        self._handle_framebuffer_update()
-
-                except socket.timeout:
-                    continue
-
-                time.sleep(0.033)  # ~30 FPS
-
-            except socket.error:
-                break
-            except Exception:
-                break
+                ready = selector.select()
+                if any(key.fileobj is wake_recv for key, _ in ready):
+                    break
+
+                msg_type = sock.recv(1)
+                if not msg_type:
+                    break
+
+                if msg_type[0] == self.MSG_FRAMEBUFFER_UPDATE:
+                    self._handle_framebuffer_update()
+                    request_pending = False
+
+        except Exception:
+            pass  # socket closed under us
+        finally:
+            self._wake_sock = None
+            selector.close()
+            wake_recv.close()
+            wake_send.close()
 
     def _handle_framebuffer_update(self) -> None:
         """Handle framebuffer update message."""
         try:
             # Read header: padding + num rectangles
-            header = self._socket.recv(3)
-            num_rects = struct.unpack("!xH", header)[0]
+            num_rects = self._recv_header(_UPDATE_HEADER_STRUCT)[0]
+
+            # Bound once: this loop runs for every rectangle
+            header_view = memoryview(self._header_buf)  # sized for one rect header
+            unpack_rect = _RECT_HEADER_STRUCT.unpack_from
+            recv_into_exact = self._recv_into_exact
+            recv_rect = self._recv_rect
+            blit = self._blit
+            enc_raw = self.ENC_RAW
+            framebuffer = None
 
             for _ in range(num_rects):
                 # Rectangle header
-                rect_header = self._socket.recv(12)
-                x, y, w, h, encoding = struct.unpack("!HHHHi", rect_header)
+                if not recv_into_exact(header_view):
+                    return  # truncated update: publish nothing
+                x, y, w, h, encoding = unpack_rect(header_view)
 
-                if encoding == self.ENC_RAW:
+                if encoding == enc_raw:
                     # Raw pixel data (4 bytes per pixel)
-                    data_size = w * h * 4
-                    data = b""
-                    while len(data) < data_size:
-                        chunk = self._socket.recv(min(data_size - len(data), 65536))
-                        if not chunk:
-                            break
-                        data += chunk
-
-                    if len(data) == data_size:
-                        # Update framebuffer
-                        with self._lock:
-                            if x == 0 and y == 0 and w == self._width and h == self._height:
-                                # Full frame update
-                                self._framebuffer = data
-                            else:
-                                # Partial update - merge into existing framebuffer
-                                if self._framebuffer is None:
-                                    self._framebuffer = bytes(self._width * self._height * 4)
-                                # Simple approach: just use full framebuffer updates
-                                self._framebuffer = data
-
-                        # Notify callback
-                        if self._frame_callback:
-                            frame = FrameData(
-                                width=w,
-                                height=h,
-                                data=data,
-                                format="bgra"  # VNC typically uses BGRA
-                            )
-                            try:
-                                self._frame_callback(frame)
-                            except Exception:
-                                pass
+                    width = self._width
+                    if framebuffer is None:
+                        framebuffer = self._begin_frame(
+                            x == 0 and y == 0
+                            and w >= width and h >= self._height
+                        )
+                    if x == 0 and w == width and y + h <= self._height:
+                        # Whole rows are contiguous in the slot: receive
+                        # them in place, with no scratch copy
+                        start = y * width * 4
+                        rows = memoryview(framebuffer)[start:start + w * h * 4]
+                        if not recv_into_exact(rows):
+                            return
+                    else:
+                        data = recv_rect(w * h * 4)
+                        if data is None:
+                            return
+                        blit(framebuffer, x, y, w, h, data)
+                    self._have_full_frame = True
 
                 elif encoding == self.ENC_DESKTOP_SIZE:
-                    # Desktop resize
+                    # Desktop resize; the next request must cover the
+                    # whole new screen. The old frame stays published
+                    # until then.
                     self._width = w
                     self._height = h
+                    self._slots = []
+                    framebuffer = None
+                    self._have_full_frame = False
+
+            if framebuffer is not None:
+                frame = self._publish(framebuffer)
+                # Notify callback once per update, with the whole screen
+                if self._frame_callback:
+                    try:
+                        self._frame_callback(frame)
+                    except Exception:
+                        pass
 
         except socket.error:
             pass
 
+    def _recv_header(self, header: struct.Struct) -> tuple:
+        """Receive and decode one fixed-size message header.
+
+        Raises:
+            ConnectionError: If the server closed the connection first
+        """
+        buf = self._header_buf
+        if not self._recv_into_exact(memoryview(buf)[:header.size]):
+            raise ConnectionError("VNC server closed the connection")
+        return header.unpack_from(buf)
+
+    def _recv_exact(self, size: int) -> bytearray:
+        """Receive exactly size bytes.
+
+        Raises:
+            ConnectionError: If the server closed the connection first
+        """
+        buf = bytearray(size)
+        if not self._recv_into_exact(memoryview(buf)):
+            raise ConnectionError("VNC server closed the connection")
+        return buf
+
+    def _recv_rect(self, size: int) -> Optional[memoryview]:
+        """Receive size bytes of pixels into the scratch buffer.
+
+        Returns:
+            A view of the received bytes, valid until the next call, or
+            None if the server closed the connection first
+        """
+        if len(self._recv_buf) < size:
+            self._recv_buf = bytearray(size)
+        view = memoryview(self._recv_buf)[:size]
+        if not self._recv_into_exact(view):
+            return None
+        return view
+
+    def _begin_frame(self, full: bool) -> bytearray:
+        """
+        Pick the slot to draw the next update into.
+
+        The oldest slot is reused. Unless the update covers the whole
+        screen, it starts as a copy of the published frame so that
+        incremental rectangles land on the current picture.
+        """
+        size = self._width * self._height * 4
+        if not self._slots:
+            self._slots = [bytearray(size) for _ in range(FRAME_SLOTS)]
+            self._next_slot = 0
+        framebuffer = self._slots[self._next_slot]
+        self._next_slot = (self._next_slot + 1) % FRAME_SLOTS
+        front = self._front
+        if not full and front is not None and len(front) == size:
+            framebuffer[:] = front
+        return framebuffer
+
+    def _publish(self, framebuffer: bytearray) -> FrameData:
+        """Make a drawn slot the current frame."""
+        frame = FrameData(
+            width=self._width,
+            height=self._height,
+            data=memoryview(framebuffer).toreadonly(),
+            format="bgra"  # as negotiated in connect()
+        )
+        self._front = framebuffer
+        # A single reference store; readers need no lock
+        self._published = frame
+        return frame
+
+    def _blit(
+        self,
+        framebuffer: bytearray,
+        x: int, y: int, w: int, h: int,
+        data: memoryview,
+    ) -> None:
+        """
+        Copy a rectangle of pixels into framebuffer at (x, y).
+
+        Only the rectangle's rows are touched. Parts outside the screen
+        are clipped, so a stray rectangle can never resize the buffer.
+        """
+        width = self._width
+        # Clipped size of the rectangle
+        clip_w = min(w, width - x)
+        clip_h = min(h, self._height - y)
+        if clip_w <= 0 or clip_h <= 0:
+            return
+        stride = width * 4
+        if x == 0 and w == width:
+            # Whole rows: one contiguous copy
+            start = y * stride
+            size = clip_h * stride
+            framebuffer[start:start + size] = data[:size]
+            return
+        src_stride = w * 4
+        row = clip_w * 4
+        offset = y * stride + x * 4
+        for start in range(0, clip_h * src_stride, src_stride):
+            framebuffer[offset:offset + row] = data[start:start + row]
+            offset += stride
+
+    def _recv_into_exact(self, view: memoryview) -> bool:
+        """Fill view from the socket.
+
+        Returns:
+            False if the server closed the connection first
+        """
+        recv_into = self._socket.recv_into
+        size = len(view)
+        # With MSG_WAITALL on a blocking socket one call fills the view;
+        # the loop only runs after a signal or on a socket with a timeout.
+        offset = recv_into(view, size, _MSG_WAITALL)
+        if offset == size:
+            return True
+        if not offset:
+            return False
+        while offset < size:
+            n = recv_into(view[offset:], size - offset, _MSG_WAITALL)
+            if not n:
+                return False
+            offset += n
+        return True
+
     def send_key(self, keycode: int, down: bool) -> None:
         """Send a key event to the server."""
         if not self._connected or not self._socket:
             return
 
-        msg = struct.pack(
-            "!BBxxI",
+        msg = _KEY_EVENT_STRUCT.pack(
             self.MSG_KEY_EVENT,
             1 if down else 0,
             keycode
         )
         try:
-            self._socket.send(msg)
+            self._socket.sendall(msg)
         except socket.error:
             pass
 
@@ -301,45 +602,65 @@ class VNCClient:
         if not self._connected or not self._socket:
             return
 
-        msg = struct.pack(
-            "!BBHH",
+        msg = _POINTER_EVENT_STRUCT.pack(
             self.MSG_POINTER_EVENT,
             buttons,
             x, y
         )
         try:
-            self._socket.send(msg)
+            self._socket.sendall(msg)
         except socket.error:
             pass
 
     def get_framebuffer(self) -> Optional[FrameData]:
-        """Get the current framebuffer data."""
-        with self._lock:
-            if self._framebuffer is None:
-                return None
-            return FrameData(
-                width=self._width,
-                height=self._height,
-                data=self._framebuffer,
-                format="bgra"
-            )
+        """
+        Get the most recently completed frame.
+
+        The data is a read-only view of a framebuffer slot rather than a
+        copy. It stays intact through the next update; after that the
+        receiver may reuse the slot, so copy it to keep it longer.
+        """
+        return self._published
 
     def disconnect(self) -> None:
-        """Disconnect from VNC server."""
+        """
+        Disconnect from VNC server.
+
+        Safe to call repeatedly. The socket is shut down before the
+        receiver is joined, so a receiver blocked in recv returns at
+        once, and closed only after the join, so its descriptor cannot
+        be reused while the receiver still holds it.
+        """
         self._stop_event.set()
         self._connected = False
+        self._have_full_frame = False
+
+        sock = self._socket
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # never connected, or already shut down
 
-        if self._socket:
+        wake_sock = self._wake_sock
+        if wake_sock is not None:
             try:
-                self._socket.close()
+                wake_sock.send(b"\0")
+            except OSError:
+                pass  # receiver already exiting
+
+        receiver = self._receiver_thread
+        if receiver and receiver is not threading.current_thread():
+            receiver.join(timeout=2)
+            self._receiver_thread = None
+
+        if sock:
+            try:
+                sock.close()
             except Exception:
                 pass
             self._socket = None
 
-        if self._receiver_thread:
-            self._receiver_thread.join(timeout=2)
-            self._receiver_thread = None
-
     def cleanup(self) -> None:
         """Clean up all resources."""
         self.disconnect()
@@ -4,45 +4,212 @@ Mock implementation of emulator_core interface.
 Use this mock when testing modules that depend on emulator_core.
 """
 
-from typing import Dict, Any, List, Optional
+from collections.abc import MutableMapping, MutableSequence
+from typing import Dict, Any, List, Optional, Tuple
 from ..interface import EmulatorCoreInterface, VMState, VMInfo
 
+# Marks a response slot with nothing configured.
+_UNSET = object()
+
+# Methods whose return value can be configured, and the slot holding it.
+_RESPONSE_SLOTS = {
+    "get_state": "_resp_get_state",
+    "get_info": "_resp_get_info",
+    "save_snapshot": "_resp_save_snapshot",
+}
+
+
+class _CallLog(MutableSequence):
+    """
+    Recorded calls, kept as (method, args) tuples.
+
+    Reads return {"method": ..., "args": {...}} dicts built on access,
+    so each entry is a snapshot: changing a returned dict does not change
+    the log. Replace the entry instead (calls[i] = {...}). Appends,
+    inserts, deletes and clear() work as on the plain list of dicts the
+    mock used to keep.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, calls=()) -> None:
+        self.raw: List[Tuple[str, Tuple[Tuple[str, Any], ...]]] = []
+        self.extend(calls)
+
+    @staticmethod
+    def _pack(call: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+        return call["method"], tuple(call.get("args", {}).items())
+
+    @staticmethod
+    def _unpack(raw: Tuple[str, Tuple[Tuple[str, Any], ...]]) -> Dict[str, Any]:
+        return {"method": raw[0], "args": dict(raw[1])}
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._unpack(raw) for raw in self.raw[index]]
+        return self._unpack(self.raw[index])
+
+    def __setitem__(self, index, call) -> None:
+        if isinstance(index, slice):
+            self.raw[index] = [self._pack(c) for c in call]
+        else:
+            self.raw[index] = self._pack(call)
+
+    def __delitem__(self, index) -> None:
+        del self.raw[index]
+
+    def insert(self, index: int, call: Dict[str, Any]) -> None:
+        self.raw.insert(index, self._pack(call))
+
+    def clear(self) -> None:
+        self.raw.clear()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, _CallLog)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _Responses(MutableMapping):
+    """Configured responses by method name, backed by the mock's slots."""
+
+    __slots__ = ("_mock",)
+
+    def __init__(self, mock: "MockEmulatorCoreInterface") -> None:
+        self._mock = mock
+
+    def __getitem__(self, method: str) -> Any:
+        slot = _RESPONSE_SLOTS.get(method)
+        if slot is None:
+            return self._mock._other_responses[method]
+        response = getattr(self._mock, slot)
+        if response is _UNSET:
+            raise KeyError(method)
+        return response
+
+    def __setitem__(self, method: str, response: Any) -> None:
+        slot = _RESPONSE_SLOTS.get(method)
+        if slot is None:
+            self._mock._other_responses[method] = response
+        else:
+            setattr(self._mock, slot, response)
+
+    def __delitem__(self, method: str) -> None:
+        slot = _RESPONSE_SLOTS.get(method)
+        if slot is None:
+            del self._mock._other_responses[method]
+        elif getattr(self._mock, slot) is _UNSET:
+            raise KeyError(method)
+        else:
+            setattr(self._mock, slot, _UNSET)
+
+    def __iter__(self):
+        for method, slot in _RESPONSE_SLOTS.items():
+            if getattr(self._mock, slot) is not _UNSET:
+                yield method
+        yield from self._mock._other_responses
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
 
 class MockEmulatorCoreInterface(EmulatorCoreInterface):
     """
     Mock implementation for testing.
 
-    Tracks all method calls and allows configuring responses.
+    Tracks all method calls and allows configuring responses. Calls are
+    stored as (method, args) tuples and only turned into dicts when read,
+    and recording can be switched off with record_calls for fixtures that
+    call the mock in tight loops. Configured responses live in slots, so
+    the hot read methods check an attribute rather than a dict. calls and
+    responses are views over that storage: the log and the mapping can be
+    edited in place, but call entries read from the log are snapshots.
     """
 
+    # __dict__ keeps the mock patchable (mock.patch.object) and open to
+    # ad-hoc attributes; the hot fields still use slots.
+    __slots__ = (
+        "__dict__",
+        "config",
+        "record_calls",
+        "_calls",
+        "_other_responses",
+        "_resp_get_state",
+        "_resp_get_info",
+        "_resp_save_snapshot",
+        "_state",
+        "_initialized",
+    )
+
     def __init__(self, config: Dict[str, Any] = None) -> None:
         self.config = config or {}
-        self.calls: List[Dict[str, Any]] = []
-        self.responses: Dict[str, Any] = {}
+        self.record_calls = True
+        self._calls = _CallLog()
+        self._clear_responses()
         self._state = VMState.STOPPED
         self._initialized = False
 
+    @property
+    def responses(self) -> MutableMapping:
+        """Configured responses by method name."""
+        return _Responses(self)
+
+    @responses.setter
+    def responses(self, responses: Dict[str, Any]) -> None:
+        self._clear_responses()
+        self.responses.update(responses)
+
+    @property
+    def calls(self) -> MutableSequence:
+        """Recorded calls as {"method": ..., "args": {...}} dicts."""
+        return self._calls
+
+    @calls.setter
+    def calls(self, calls: List[Dict[str, Any]]) -> None:
+        self._calls = _CallLog(calls)
+
     def _record_call(self, method: str, **kwargs) -> None:
         """Record a method call for verification."""
-        self.calls.append({
-            "method": method,
-            "args": kwargs,
-        })
+        if self.record_calls:
+            self._calls.raw.append((method, tuple(kwargs.items())))
 
     def set_response(self, method: str, response: Any) -> None:
         """Configure response for a method."""
-        self.responses[method] = response
+        slot = _RESPONSE_SLOTS.get(method)
+        if slot is None:
+            self._other_responses[method] = response
+        else:
+            setattr(self, slot, response)
 
     def get_calls(self, method: str = None) -> List[Dict]:
         """Get recorded calls, optionally filtered by method."""
         if method:
-            return [c for c in self.calls if c["method"] == method]
+            return [
+                {"method": name, "args": dict(args)}
+                for name, args in self._calls.raw
+                if name == method
+            ]
         return self.calls
 
     def clear(self) -> None:
         """Clear recorded calls and responses."""
-        self.calls = []
-        self.responses = {}
+        self._calls = _CallLog()
+        self._clear_responses()
+
+    def _clear_responses(self) -> None:
+        self._other_responses: Dict[str, Any] = {}
+        self._resp_get_state = _UNSET
+        self._resp_get_info = _UNSET
+        self._resp_save_snapshot = _UNSET
 
     def initialize(self) -> None:
         self._record_call("initialize")
@@ -70,20 +237,20 @@ class MockEmulatorCoreInterface(EmulatorCoreInterface):
 
     def get_state(self) -> VMState:
         self._record_call("get_state")
-        if "get_state" in self.responses:
-            return self.responses["get_state"]
+        if self._resp_get_state is not _UNSET:
+            return self._resp_get_state
         return self._state
 
     def get_info(self) -> VMInfo:
         self._record_call("get_info")
-        if "get_info" in self.responses:
-            return self.responses["get_info"]
+        if self._resp_get_info is not _UNSET:
+            return self._resp_get_info
         return VMInfo(state=self._state)
 
     def save_snapshot(self, name: str) -> str:
         self._record_call("save_snapshot", name=name)
-        if "save_snapshot" in self.responses:
-            return self.responses["save_snapshot"]
+        if self._resp_save_snapshot is not _UNSET:
+            return self._resp_save_snapshot
         return f"/mock/snapshots/{name}"
 
     def load_snapshot(self, name: str) -> None:
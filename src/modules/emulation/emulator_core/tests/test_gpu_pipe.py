@@ -16,7 +16,9 @@ from ..internal.gpu_pipe import (
     TransportType,
     VirtioSerialTransport,
     UnixSocketTransport,
+    _PacketBufferPool,
     create_gpu_pipe,
+    pack_packed_header,
 )
 
 
@@ -45,6 +47,46 @@ class TestGPUCommandPacket:
         assert packet.size == 16
         assert packet.data == b"test data bytes!"
 
+    def test_packet_is_slotted_and_immutable(self):
+        """Packets carry no per-instance dict and cannot be mutated."""
+        packet = GPUCommandPacket(sequence=1)
+        assert not hasattr(packet, "__dict__")
+        with pytest.raises(AttributeError):
+            packet.sequence = 2
+
+
+class TestPackedHeader:
+    """Tests for the packed protocol v2 header."""
+
+    def test_layout(self):
+        header = pack_packed_header(7, 0x12, 0x345)
+        assert len(header) == 8
+        assert int.from_bytes(header, "little") == (7 << 32) | (0x12 << 24) | 0x345
+
+    def test_rejects_fields_that_do_not_fit(self):
+        with pytest.raises(ValueError):
+            pack_packed_header(1, 0x100, 0)
+        with pytest.raises(ValueError):
+            pack_packed_header(1, 0, 1 << 24)
+
+
+class TestPacketBufferPool:
+    """Tests for the reusable payload buffer ring."""
+
+    def test_slots_are_reused_in_turn(self):
+        pool = _PacketBufferPool(slots=2, slot_size=8)
+        first = pool.take(4)
+        first[:] = b"aaaa"
+        pool.take(4)
+        third = pool.take(4)
+        assert third.obj is first.obj
+
+    def test_oversized_payload_gets_own_buffer(self):
+        pool = _PacketBufferPool(slots=2, slot_size=8)
+        big = pool.take(16)
+        assert len(big) == 16
+        assert pool.take(4).obj is not big.obj
+
 
 class TestVirtioSerialTransport:
     """Tests for virtio-serial transport."""
@@ -113,6 +155,117 @@ class TestVirtioSerialTransport:
 
         client.close()
 
+    @pytest.fixture
+    def connected(self, socket_path):
+        """Connected transport and the QEMU-side client socket."""
+        transport = VirtioSerialTransport(socket_path)
+        thread = threading.Thread(target=transport.connect)
+        thread.start()
+        time.sleep(0.1)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+        thread.join(timeout=2.0)
+        yield transport, client
+        client.close()
+        transport.disconnect()
+
+    @staticmethod
+    def _packet(sequence, opcode, data):
+        return struct.pack("<III", sequence, opcode, len(data)) + data
+
+    def test_read_commands_batch_drains_burst(self, connected):
+        """A burst of packets is returned by a single batched read."""
+        transport, client = connected
+        client.sendall(b"".join(self._packet(i, 0x100, bytes([i]) * i) for i in range(10)))
+        time.sleep(0.05)
+
+        packets = transport.read_commands_batch()
+
+        assert [p.sequence for p in packets] == list(range(10))
+        assert packets[3].data == b"\x03" * 3
+
+    def test_read_packed_headers(self, socket_path):
+        """With legacy_header=False, packets use the 8-byte header."""
+        transport = VirtioSerialTransport(socket_path, legacy_header=False)
+        thread = threading.Thread(target=transport.connect)
+        thread.start()
+        time.sleep(0.1)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+        thread.join(timeout=2.0)
+        try:
+            client.sendall(
+                pack_packed_header(1, 0x10, 3) + b"abc"
+                + pack_packed_header(2, 0xFF, 0)
+            )
+            time.sleep(0.05)
+
+            packets = transport.read_commands_batch()
+
+            assert [(p.sequence, p.opcode, p.size) for p in packets] == [
+                (1, 0x10, 3), (2, 0xFF, 0),
+            ]
+            assert packets[0].data == b"abc"
+        finally:
+            client.close()
+            transport.disconnect()
+
+    def test_packet_timestamp_is_monotonic(self, connected):
+        """Packets are stamped with the monotonic clock on receipt."""
+        transport, client = connected
+        before = time.monotonic_ns()
+        client.sendall(self._packet(1, 0x100, b"x"))
+
+        packet = transport.read_command()
+
+        assert packet is not None
+        assert before <= packet.timestamp_ns <= time.monotonic_ns()
+
+    def test_read_command_keeps_partial_packet(self, connected):
+        """A packet split across sends is reassembled, not dropped."""
+        transport, client = connected
+        raw = self._packet(7, 0x200, b"payload")
+        client.sendall(raw[:5])
+        assert transport.read_command() is None
+        client.sendall(raw[5:])
+
+        packet = transport.read_command()
+
+        assert packet is not None
+        assert packet.sequence == 7
+        assert packet.data == b"payload"
+
+    def test_read_large_packet_grows_buffer(self, connected):
+        """Packets larger than the receive buffer are still read whole."""
+        transport, client = connected
+        data = os.urandom(200 * 1024)
+        sender = threading.Thread(target=client.sendall, args=(self._packet(1, 0x300, data),))
+        sender.start()
+
+        packet = None
+        deadline = time.monotonic() + 5.0
+        while packet is None and time.monotonic() < deadline:
+            packet = transport.read_command()
+        sender.join()
+
+        assert packet is not None
+        assert packet.data == data
+
+    def test_write_not_blocked_by_pending_read(self, connected):
+        """A response can be written while a read is waiting for data."""
+        transport, client = connected
+        reader = threading.Thread(target=transport.read_command)
+        reader.start()
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        assert transport.write_response(b"reply")
+        elapsed = time.monotonic() - start
+        reader.join()
+
+        assert elapsed < 0.5
+        assert client.recv(16) == b"reply"
+
 
 class TestUnixSocketTransport:
     """Tests for Unix socket transport."""
@@ -176,6 +329,32 @@ class TestUnixSocketTransport:
         client.close()
         transport.disconnect()
 
+    def test_read_command_split_payload(self, socket_server):
+        """A payload arriving in several pieces is read in full."""
+        socket_path, server = socket_server
+        transport = UnixSocketTransport(socket_path)
+        transport.connect()
+        client, _ = server.accept()
+
+        data = b"0123456789" * 10
+        raw = struct.pack("<III", 3, 0x100, len(data)) + data
+
+        def send_in_pieces():
+            for i in range(0, len(raw), 7):
+                client.sendall(raw[i:i + 7])
+                time.sleep(0.001)
+
+        sender = threading.Thread(target=send_in_pieces)
+        sender.start()
+        packet = transport.read_command()
+        sender.join()
+
+        assert packet is not None
+        assert packet.data == data
+
+        client.close()
+        transport.disconnect()
+
     def test_write_response(self, socket_server):
         """Transport can write response data."""
         socket_path, server = socket_server
@@ -197,6 +376,46 @@ class TestUnixSocketTransport:
         client.close()
         transport.disconnect()
 
+    def test_write_larger_than_socket_buffer(self, socket_server):
+        """A write the kernel cannot take at once completes as the peer reads."""
+        socket_path, server = socket_server
+        transport = UnixSocketTransport(socket_path)
+        transport.connect()
+        client, _ = server.accept()
+        payload = os.urandom(4 * 1024 * 1024)
+
+        received = bytearray()
+
+        def drain():
+            while len(received) < len(payload):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                received.extend(chunk)
+
+        reader = threading.Thread(target=drain)
+        reader.start()
+        assert transport.write_response(payload) is True
+        reader.join(timeout=5.0)
+
+        assert bytes(received) == payload
+
+        client.close()
+        transport.disconnect()
+
+    def test_write_response_vec(self, socket_server):
+        """A response given as parts arrives as their concatenation."""
+        socket_path, server = socket_server
+        transport = UnixSocketTransport(socket_path)
+        transport.connect()
+        client, _ = server.accept()
+
+        assert transport.write_response_vec([b"head", b"er", b"payload"]) is True
+        assert client.recv(1024) == b"headerpayload"
+
+        client.close()
+        transport.disconnect()
+
 
 class TestGPUCommandPipe:
     """Tests for high-level GPU command pipe."""
@@ -216,6 +435,19 @@ class TestGPUCommandPipe:
         pipe = create_gpu_pipe("unix_socket", "/tmp/test.sock")
         assert pipe._transport_type == TransportType.UNIX_SOCKET
 
+    def test_factory_function_unknown_defaults_to_virtio(self):
+        """Factory falls back to virtio for unknown transport names."""
+        pipe = create_gpu_pipe("carrier_pigeon", "/tmp/test.sock")
+        assert pipe._transport_type == TransportType.VIRTIO_SERIAL
+
+    def test_start_goldfish_reports_unavailable(self):
+        """Starting an unimplemented transport fails with an error."""
+        errors = []
+        pipe = GPUCommandPipe(transport_type=TransportType.GOLDFISH_PIPE)
+        pipe.set_error_callback(errors.append)
+        assert pipe.start() is False
+        assert errors == ["Goldfish pipe transport not available"]
+
     def test_set_command_handler(self):
         """Can set command handler."""
         pipe = GPUCommandPipe()
@@ -309,3 +541,128 @@ class TestGPUPipeIntegration:
         client_response = client.recv(4)
         result = struct.unpack("<I", client_response)[0]
         assert result == 0
+
+    def test_pipe_round_trip_batches_responses(self, tmp_path):
+        """Commands through a running pipe get every response, in order."""
+        socket_path = str(tmp_path / f"pipe_{os.getpid()}.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        server.settimeout(5.0)
+
+        pipe = GPUCommandPipe(TransportType.UNIX_SOCKET, socket_path)
+        pipe.set_command_handler(lambda packet: struct.pack("<I", packet.sequence))
+        assert pipe.start()
+        conn, _ = server.accept()
+        conn.settimeout(5.0)
+        try:
+            for seq in range(5):
+                conn.sendall(struct.pack("<III", seq, 0x100, 0))
+
+            received = b""
+            while len(received) < 20:
+                received += conn.recv(20 - len(received))
+
+            assert struct.unpack("<5I", received) == (0, 1, 2, 3, 4)
+        finally:
+            pipe.stop()
+            conn.close()
+            server.close()
+
+    def test_pipe_sends_file_backed_responses_in_order(self, tmp_path):
+        """Handlers can return (fd, offset, size) to send from a file."""
+        socket_path = str(tmp_path / f"pipe_{os.getpid()}.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        server.settimeout(5.0)
+        payload = tmp_path / "payload.bin"
+        payload.write_bytes(b"..FILE..")
+        src_fd = os.open(payload, os.O_RDONLY)
+
+        def handler(packet):
+            if packet.sequence == 1:
+                return (src_fd, 2, 4)
+            return struct.pack("<I", packet.sequence)
+
+        pipe = GPUCommandPipe(TransportType.UNIX_SOCKET, socket_path)
+        pipe.set_command_handler(handler)
+        assert pipe.start()
+        conn, _ = server.accept()
+        conn.settimeout(5.0)
+        try:
+            for seq in range(3):
+                conn.sendall(struct.pack("<III", seq, 0x100, 0))
+
+            received = b""
+            while len(received) < 12:
+                received += conn.recv(12 - len(received))
+
+            assert received == struct.pack("<I", 0) + b"FILE" + struct.pack("<I", 2)
+        finally:
+            pipe.stop()
+            conn.close()
+            server.close()
+            os.close(src_fd)
+
+    def test_pipe_sends_multipart_responses(self, tmp_path):
+        """Handlers can return a response as a list of parts."""
+        socket_path = str(tmp_path / f"pipe_{os.getpid()}.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        server.settimeout(5.0)
+
+        pipe = GPUCommandPipe(TransportType.UNIX_SOCKET, socket_path)
+        pipe.set_command_handler(
+            lambda packet: [struct.pack("<I", packet.sequence), b"body"]
+        )
+        assert pipe.start()
+        conn, _ = server.accept()
+        conn.settimeout(5.0)
+        try:
+            for seq in range(2):
+                conn.sendall(struct.pack("<III", seq, 0x100, 0))
+
+            received = b""
+            while len(received) < 16:
+                received += conn.recv(16 - len(received))
+
+            assert received == (
+                struct.pack("<I", 0) + b"body" + struct.pack("<I", 1) + b"body"
+            )
+        finally:
+            pipe.stop()
+            conn.close()
+            server.close()
+
+    def test_handler_error_does_not_stop_pipe(self, tmp_path):
+        """A handler exception is reported and later commands still run."""
+        socket_path = str(tmp_path / f"pipe_{os.getpid()}.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        server.settimeout(5.0)
+
+        def handler(packet):
+            if packet.sequence == 0:
+                raise RuntimeError("bad command")
+            return struct.pack("<I", packet.sequence)
+
+        errors = []
+        pipe = GPUCommandPipe(TransportType.UNIX_SOCKET, socket_path)
+        pipe.set_command_handler(handler)
+        pipe.set_error_callback(errors.append)
+        assert pipe.start()
+        conn, _ = server.accept()
+        conn.settimeout(5.0)
+        try:
+            for seq in range(2):
+                conn.sendall(struct.pack("<III", seq, 0x100, 0))
+
+            assert conn.recv(4) == struct.pack("<I", 1)
+            assert errors == ["Command processing error: bad command"]
+        finally:
+            pipe.stop()
+            conn.close()
+            server.close()
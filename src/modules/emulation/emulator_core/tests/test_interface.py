@@ -4,7 +4,12 @@ Interface tests for emulator_core.
 Tests the public API contract for CPU virtualization and VM lifecycle.
 """
 
+import socket
+import time
+from unittest import mock
+
 import pytest
+from .. import interface as emulator_interface
 from ..interface import (
     EmulatorCoreInterface,
     DefaultEmulatorCore,
@@ -15,6 +20,10 @@ from ..interface import (
     VMState,
     VMConfig,
     VMInfo,
+    FrameBuffer,
+    _proc_start_time,
+    QEMUEmulatorCore,
+    _wait_vnc_ready,
 )
 
 
@@ -121,3 +130,318 @@ class TestEmulatorCoreInterface:
         interface.start()
         interface.cleanup()
         assert interface.get_state() == VMState.STOPPED
+
+
+class TestVMStateBits:
+    """Tests for the per-state bitmask used in lifecycle checks."""
+
+    def test_bits_are_distinct_single_bits(self):
+        """Each VMState owns exactly one distinct bit."""
+        bits = [state.bit for state in VMState]
+        assert len(set(bits)) == len(bits)
+        assert all(bit and not bit & (bit - 1) for bit in bits)
+
+
+class TestVMConfigFromDict:
+    """Tests for building VMConfig from module config dicts."""
+
+    def test_known_keys_applied_and_unknown_ignored(self):
+        """VMConfig fields are taken from config; other keys are ignored."""
+        core = QEMUEmulatorCore({"backend": "qemu", "vnc_port": 5901, "gpu_mode": "software"})
+        assert core._config.vnc_port == 5901
+        assert core._config.gpu_mode == "software"
+        assert core._config.memory_mb == VMConfig().memory_mb
+
+
+class TestFrameBuffer:
+    """Tests for the FrameBuffer container."""
+
+    def test_data_is_shared_not_copied(self):
+        """A memoryview passed in is kept by reference."""
+        raw = bytearray(16)
+        view = memoryview(raw)
+        frame = FrameBuffer(width=2, height=2, data=view)
+        assert frame.data is view
+
+    def test_has_no_instance_dict(self):
+        """Frame and info containers use slots rather than a __dict__."""
+        assert not hasattr(FrameBuffer(), "__dict__")
+        assert not hasattr(VMInfo(), "__dict__")
+        assert not hasattr(VMConfig(), "__dict__")
+
+    def test_tobytes_returns_independent_copy(self):
+        """tobytes() snapshots the pixels so later writes don't leak in."""
+        raw = bytearray(b"\x01\x02\x03\x04")
+        frame = FrameBuffer(width=1, height=1, data=memoryview(raw))
+        copy = frame.tobytes()
+        raw[0] = 0xFF
+        assert copy == b"\x01\x02\x03\x04"
+
+
+class TestProcStartTime:
+    """Tests for the PID-reuse guard used by cleanup()."""
+
+    def test_own_process_has_stable_start_time(self):
+        """The current process reports the same start time each read."""
+        import os
+
+        start = _proc_start_time(os.getpid())
+        if start is None:
+            pytest.skip("/proc not available")
+        assert _proc_start_time(os.getpid()) == start
+
+    def test_missing_process_returns_none(self):
+        """A PID that cannot exist yields None."""
+        assert _proc_start_time(2 ** 31 - 1) is None
+
+
+class TestWaitVNCReady:
+    """Tests for the VNC port readiness probe."""
+
+    def test_listening_port_is_ready(self):
+        """Returns True as soon as the port accepts connections."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+            port = server.getsockname()[1]
+            assert _wait_vnc_ready("127.0.0.1", port, deadline=time.monotonic() + 2.0)
+
+    def test_closed_port_times_out(self):
+        """Returns False once the deadline passes without a listener."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        start = time.monotonic()
+        assert not _wait_vnc_ready("127.0.0.1", port, deadline=start + 0.1)
+        assert time.monotonic() - start < 1.0
+
+
+class TestQEMUEmulatorCoreStart:
+    """Tests for the non-blocking QEMU start sequence."""
+
+    @pytest.fixture
+    def core(self, monkeypatch):
+        """QEMU core with the process and VNC client replaced by mocks."""
+        monkeypatch.setattr(emulator_interface, "VNC_READY_TIMEOUT", 0.05)
+        core = QEMUEmulatorCore({"use_kvm": False})
+        core._qemu_process = mock.MagicMock(pid=None)
+        core._vnc_client = mock.MagicMock()
+        core._initialized = True
+        yield core
+        core.cleanup()
+
+    def _wait_for_state(self, core, state, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while core.get_state() != state and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return core.get_state()
+
+    def test_start_returns_in_starting_state(self, core):
+        """start() returns before bring-up completes, then reaches RUNNING."""
+        states = []
+        core.add_state_callback(states.append)
+        core.start()
+        assert states[0] == VMState.STARTING
+        assert self._wait_for_state(core, VMState.RUNNING) == VMState.RUNNING
+
+    def test_frame_callbacks_share_scratch_buffer(self, core):
+        """Each frame notification reuses the same FrameBuffer instance."""
+        seen = []
+        core.add_frame_callback(lambda fb: seen.append((fb, fb.tobytes())))
+        core._notify_frame(FrameBuffer(width=1, height=1, data=b"\x01" * 4))
+        core._notify_frame(FrameBuffer(width=1, height=1, data=b"\x02" * 4))
+        assert seen[0][0] is seen[1][0]
+        assert [pixels for _, pixels in seen] == [b"\x01" * 4, b"\x02" * 4]
+
+    def test_coalesced_frame_callback_skips_to_newest(self, core):
+        """A slow coalesced consumer sees the newest frame, not a backlog."""
+        import threading
+
+        release = threading.Event()
+        seen = []
+
+        def slow(fb):
+            release.wait(2.0)
+            seen.append(fb.data)
+
+        core.add_frame_callback(slow, coalesce=True)
+        for value in range(5):
+            core._notify_frame(FrameBuffer(width=1, height=1, data=bytes([value]) * 4))
+        release.set()
+        deadline = time.monotonic() + 2.0
+        while (not seen or seen[-1] != b"\x04" * 4) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert seen[-1] == b"\x04" * 4
+        assert len(seen) < 5
+        core.remove_frame_callback(slow)
+        assert core._frame_callbacks == ()
+
+    def test_coalesced_frame_owns_its_pixels(self, core):
+        """A blocked coalesced consumer's frame survives VNC slot reuse."""
+        import struct
+        import threading
+        from ..internal.vnc_client import VNCClient
+
+        client = VNCClient()
+        client_sock, server_sock = socket.socketpair()
+        client._socket = client_sock
+        client._width, client._height = 2, 1
+        client.set_frame_callback(core._notify_frame)
+
+        entered = threading.Event()
+        release = threading.Event()
+        seen = []
+
+        def slow(fb):
+            first = bytes(fb.data)
+            entered.set()
+            release.wait(2.0)
+            seen.append((first, bytes(fb.data)))
+
+        core.add_frame_callback(slow, coalesce=True)
+        try:
+            for value in range(5):
+                server_sock.sendall(
+                    struct.pack("!xHHHHHi", 1, 0, 0, 2, 1, VNCClient.ENC_RAW)
+                    + bytes([value]) * 8
+                )
+                client._handle_framebuffer_update()
+                if value == 0:
+                    assert entered.wait(2.0)
+            release.set()
+            deadline = time.monotonic() + 2.0
+            while len(seen) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            release.set()
+            core.remove_frame_callback(slow)
+            client_sock.close()
+            server_sock.close()
+
+        assert seen[0] == (b"\x00" * 8, b"\x00" * 8)
+        assert seen[1] == (b"\x04" * 8, b"\x04" * 8)
+
+    def test_remove_callback_during_dispatch(self, core):
+        """Removing a callback mid-dispatch does not skip the others."""
+        calls = []
+
+        def first(state):
+            calls.append("first")
+            core.remove_state_callback(first)
+
+        core.add_state_callback(first)
+        core.add_state_callback(lambda state: calls.append("second"))
+        core._notify_state(VMState.PAUSED)
+        assert calls == ["first", "second"]
+        core._notify_state(VMState.STOPPED)
+        assert calls == ["first", "second", "second"]
+
+    def test_qemu_states_map_by_value(self, core):
+        """Every QEMUState translates to the VMState with the same value."""
+        from ..internal.qemu_process import QEMUState
+
+        for qemu_state in QEMUState:
+            core._state = VMState.PAUSED
+            core._on_qemu_state(qemu_state)
+            assert core.get_state().value == qemu_state.value
+
+    def test_get_info_reuses_and_refreshes(self, core):
+        """get_info returns the same object, updated to the current state."""
+        first = core.get_info()
+        assert first.state == VMState.STOPPED
+        core._notify_state(VMState.RUNNING)
+        second = core.get_info()
+        assert second is first
+        assert second.state == VMState.RUNNING
+        assert second.vnc_address == "localhost:5900"
+
+    def test_save_snapshot_async_returns_future(self, core):
+        """save_snapshot(wait=False) returns a Future resolving to the path."""
+        core._notify_state(VMState.RUNNING)
+        future = core.save_snapshot("snap", wait=False)
+        assert future.result(timeout=2.0) == core.save_snapshot("snap")
+        assert "snap" in future.result()
+
+    def test_load_snapshot_prefetches_without_reading(self, core, monkeypatch):
+        """load_snapshot only warms the page cache; nothing is held in memory."""
+        prefetched = []
+        monkeypatch.setattr(
+            emulator_interface, "prefetch_snapshot_file", prefetched.append
+        )
+        core.load_snapshot("golden")
+        core.load_snapshot("golden")
+        assert prefetched == ["/snapshots/golden"] * 2
+
+    def test_failing_callback_unregistered(self, core):
+        """A callback failing MAX_CALLBACK_FAILURES times in a row is dropped."""
+        calls = []
+
+        def broken(fb):
+            calls.append(fb)
+            raise RuntimeError("consumer gone")
+
+        core.add_frame_callback(broken)
+        frame = FrameBuffer(width=1, height=1, data=b"\x00" * 4)
+        for _ in range(emulator_interface.MAX_CALLBACK_FAILURES + 2):
+            core._notify_frame(frame)
+        assert len(calls) == emulator_interface.MAX_CALLBACK_FAILURES
+        assert core._frame_callbacks == ()
+
+    def test_failing_coalesced_callback_unregistered(self, core):
+        """Failures on a coalesced callback's worker are counted and it is dropped."""
+        calls = []
+
+        def broken(fb):
+            calls.append(fb)
+            raise RuntimeError("consumer gone")
+
+        core.add_frame_callback(broken, coalesce=True)
+        wrapper = core._frame_callbacks[0]
+        frame = FrameBuffer(width=1, height=1, data=b"\x00" * 4)
+        for expected in range(1, emulator_interface.MAX_CALLBACK_FAILURES + 1):
+            core._notify_frame(frame)
+            deadline = time.monotonic() + 2.0
+            while len(calls) < expected and time.monotonic() < deadline:
+                time.sleep(0.01)
+        wrapper._thread.join(2.0)
+
+        assert len(calls) == emulator_interface.MAX_CALLBACK_FAILURES
+        assert core._frame_callbacks == ()
+        assert not wrapper._thread.is_alive()
+        assert core._callback_failures == {}
+
+    def test_intermittent_callback_failure_kept(self, core):
+        """A success resets the failure count, keeping the callback."""
+        results = iter([True, False, True, False, True, False, True])
+        seen = []
+
+        def flaky(state):
+            seen.append(state)
+            if next(results):
+                raise RuntimeError("flaky")
+
+        core.add_state_callback(flaky)
+        for state in [VMState.PAUSED, VMState.STOPPED] * 3 + [VMState.PAUSED]:
+            core._notify_state(state)
+        assert len(seen) == 7
+        assert core._state_callbacks == (flaky,)
+
+    def test_state_property_matches_get_state(self, core):
+        """The state property tracks get_state()."""
+        assert core.state is core.get_state() is VMState.STOPPED
+        core._notify_state(VMState.PAUSED)
+        assert core.state is VMState.PAUSED
+
+    def test_double_start_raises(self, core):
+        """A second start() while starting or running is rejected."""
+        core.start()
+        with pytest.raises(EmulatorCoreError):
+            core.start()
+
+    def test_stop_during_bringup(self, core):
+        """stop() cancels a pending bring-up and ends STOPPED."""
+        core.start()
+        core.stop()
+        assert core.get_state() == VMState.STOPPED
+        time.sleep(0.1)
+        assert core.get_state() == VMState.STOPPED
@@ -0,0 +1,49 @@
+"""
+Tests for the host KVM capability probe.
+"""
+
+import os
+
+import pytest
+from ..internal import kvm_caps as kvm_caps_module
+from ..internal import kvm_wrapper
+from ..internal.kvm_caps import KVM_API_VERSION, kvm_caps
+
+
+@pytest.fixture(autouse=True)
+def fresh_probe():
+    kvm_caps.cache_clear()
+    yield
+    kvm_caps.cache_clear()
+
+
+class TestKvmCaps:
+    """Tests for kvm_caps()."""
+
+    def test_probe_is_cached(self):
+        assert kvm_caps() is kvm_caps()
+
+    def test_missing_device_is_unavailable(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(kvm_wrapper, "KVM_DEVICE_PATH", str(tmp_path / "kvm"))
+        caps = kvm_caps()
+        assert not caps.available
+        assert caps.max_vcpus == 0
+        assert caps.error
+
+    def test_unknown_api_version_is_unavailable(self, monkeypatch):
+        monkeypatch.setattr(kvm_caps_module.KVMWrapper, "open", lambda self: None)
+        monkeypatch.setattr(kvm_caps_module.KVMWrapper, "get_api_version",
+                            lambda self: KVM_API_VERSION + 1)
+        caps = kvm_caps()
+        assert not caps.available
+        assert caps.api_version == KVM_API_VERSION + 1
+
+    @pytest.mark.skipif(
+        not os.access(kvm_wrapper.KVM_DEVICE_PATH, os.R_OK | os.W_OK),
+        reason="KVM not available",
+    )
+    def test_reports_vcpu_limits(self):
+        caps = kvm_caps()
+        assert caps.available
+        assert caps.api_version == KVM_API_VERSION
+        assert caps.max_vcpus >= caps.recommended_vcpus > 0
@@ -0,0 +1,81 @@
+"""
+Tests for the KVM ioctl wrapper.
+
+Tests that touch /dev/kvm are skipped on hosts without usable KVM.
+"""
+
+import os
+
+import pytest
+from ..internal.kvm_wrapper import (
+    KVM_DEVICE_PATH,
+    KVM_EXIT_HLT,
+    KVMError,
+    KVMWrapper,
+    KvmRun,
+)
+from ..internal.memory import GuestMemory
+
+requires_kvm = pytest.mark.skipif(
+    not os.access(KVM_DEVICE_PATH, os.R_OK | os.W_OK),
+    reason="KVM not available",
+)
+
+
+@pytest.fixture
+def kvm():
+    wrapper = KVMWrapper()
+    wrapper.open()
+    yield wrapper
+    wrapper.close()
+
+
+class TestKVMWrapper:
+    """Tests for KVMWrapper."""
+
+    def test_ioctl_before_open_raises(self):
+        with pytest.raises(KVMError):
+            KVMWrapper().get_api_version()
+
+    @requires_kvm
+    def test_api_version(self, kvm):
+        assert kvm.get_api_version() == 12
+
+    @requires_kvm
+    def test_register_round_trip(self, kvm):
+        vm_fd = kvm.create_vm()
+        vcpu_fd = kvm.create_vcpu(vm_fd, 0)
+        try:
+            kvm.set_regs(vcpu_fd, {"rax": 0x1234, "rip": 0x1000})
+            regs = kvm.get_regs(vcpu_fd)
+            assert regs["rax"] == 0x1234
+            assert regs["rip"] == 0x1000
+            assert regs["rflags"] & 0x2
+        finally:
+            kvm.destroy_vcpu(vcpu_fd)
+            os.close(vm_fd)
+
+    def test_kvm_run_layout(self):
+        assert KvmRun.exit_reason.offset == 8
+        assert KvmRun.exit.offset == 32
+
+    @requires_kvm
+    def test_run_reports_exit_reason(self, kvm):
+        """A guest that halts at the reset vector exits with KVM_EXIT_HLT."""
+        memory = GuestMemory(total_mb=1)
+        vm_fd = kvm.create_vm()
+        try:
+            region = memory.allocate_region(0xFFFFF000, 0x1000)
+            memory.write(0xFFFFFFF0, b"\xf4")  # hlt
+            kvm.set_user_memory_region(
+                vm_fd, region.slot, region.guest_phys_addr,
+                region.size, region.host_addr,
+            )
+            vcpu_fd = kvm.create_vcpu(vm_fd, 0)
+
+            assert kvm.run_vcpu(vcpu_fd) == KVM_EXIT_HLT
+            assert kvm.get_run(vcpu_fd).exit_reason == KVM_EXIT_HLT
+            kvm.destroy_vcpu(vcpu_fd)
+        finally:
+            os.close(vm_fd)
+            memory.cleanup()
@@ -0,0 +1,133 @@
+"""
+Tests for guest memory management.
+
+Tests region allocation and lookup, and zero-copy reads and writes.
+"""
+
+import pytest
+from ..internal.memory import (
+    BACKING_HUGETLB,
+    BACKING_PAGES,
+    BACKING_THP,
+    HUGE_PAGE_SIZE,
+    GuestMemory,
+)
+
+
+@pytest.fixture
+def memory():
+    mem = GuestMemory(total_mb=4)
+    yield mem
+    mem.cleanup()
+
+
+class TestGuestMemory:
+    """Tests for GuestMemory."""
+
+    def test_allocate_region(self, memory):
+        region = memory.allocate_region(0x1000, 0x2000)
+        assert region.slot == 0
+        assert region.host_addr
+        assert memory.region_count == 1
+
+    def test_write_then_read(self, memory):
+        memory.allocate_region(0x0, 0x10000)
+        memory.write(0x100, b"guest data")
+        assert bytes(memory.read(0x100, 10)) == b"guest data"
+
+    def test_read_is_a_view(self, memory):
+        memory.allocate_region(0x0, 0x1000)
+        view = memory.read(0x10, 4)
+        memory.write(0x10, b"abcd")
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert bytes(view) == b"abcd"
+
+    def test_access_resolves_correct_region(self, memory):
+        memory.allocate_region(0x0, 0x1000)
+        memory.allocate_region(0x100000, 0x1000)
+        memory.write(0x100800, b"\x01\x02")
+        assert bytes(memory.read(0x100800, 2)) == b"\x01\x02"
+        assert bytes(memory.read(0x800, 2)) == b"\x00\x00"
+
+    def test_access_outside_region_raises(self, memory):
+        memory.allocate_region(0x1000, 0x1000)
+        with pytest.raises(ValueError):
+            memory.read(0x0, 4)
+        with pytest.raises(ValueError):
+            memory.read(0x1ffe, 4)
+
+    def test_overlapping_region_raises(self, memory):
+        memory.allocate_region(0x1000, 0x1000)
+        with pytest.raises(ValueError):
+            memory.allocate_region(0x1800, 0x1000)
+        with pytest.raises(ValueError):
+            memory.allocate_region(0x0, 0x1001)
+
+    def test_exceeding_total_raises(self, memory):
+        with pytest.raises(ValueError):
+            memory.allocate_region(0x0, memory.total_bytes + 1)
+
+    def test_readonly_region_rejects_write(self, memory):
+        memory.allocate_region(0x0, 0x1000, readonly=True)
+        with pytest.raises(PermissionError):
+            memory.write(0x0, b"x")
+
+    def test_free_region(self, memory):
+        region = memory.allocate_region(0x0, 0x1000)
+        memory.free_region(region.slot)
+        assert memory.region_count == 0
+        with pytest.raises(ValueError):
+            memory.read(0x0, 1)
+        with pytest.raises(KeyError):
+            memory.free_region(region.slot)
+
+    def test_free_region_with_outstanding_view(self, memory):
+        region = memory.allocate_region(0x0, 0x1000)
+        view = memory.read(0x0, 16)
+        memory.free_region(region.slot)
+        del view
+        assert memory.region_count == 0
+
+    def test_small_region_uses_regular_pages(self, memory):
+        region = memory.allocate_region(0x0, 0x1000)
+        assert region.backing == BACKING_PAGES
+
+    def test_large_region_prefers_huge_pages(self, memory):
+        region = memory.allocate_region(0x0, HUGE_PAGE_SIZE)
+        assert region.backing in (BACKING_HUGETLB, BACKING_THP, BACKING_PAGES)
+        memory.write(HUGE_PAGE_SIZE - 4, b"tail")
+        assert bytes(memory.read(HUGE_PAGE_SIZE - 4, 4)) == b"tail"
+
+    def test_freed_mapping_is_reused_zeroed(self, memory):
+        region = memory.allocate_region(0x0, 0x3000)
+        memory.write(0x0, b"secret")
+        memory.free_region(region.slot)
+
+        memory.allocate_region(0x10000, 0x4000)
+
+        stats = memory.pool_stats()
+        assert stats["hits"] == 1
+        assert stats["returns"] == 1
+        assert stats["pooled"] == 0
+        assert bytes(memory.read(0x10000, 6)) == b"\x00" * 6
+
+    def test_large_region_maps_hugepage_rounded_size(self):
+        mem = GuestMemory(total_mb=8)
+        try:
+            region = mem.allocate_region(0x0, 3 * HUGE_PAGE_SIZE - 0x1000)
+            assert len(region._mmap) == 3 * HUGE_PAGE_SIZE
+            mem.free_region(region.slot)
+
+            # Same rounded size reuses the pooled mapping
+            mem.allocate_region(0x0, 3 * HUGE_PAGE_SIZE)
+            assert mem.pool_stats()["hits"] == 1
+        finally:
+            mem.cleanup()
+
+    def test_cleanup_empties_pool(self, memory):
+        region = memory.allocate_region(0x0, 0x1000)
+        memory.free_region(region.slot)
+        assert memory.pool_stats()["pooled"] == 1
+        memory.cleanup()
+        assert memory.pool_stats()["pooled"] == 0
@@ -0,0 +1,128 @@
+"""
+Tests for the emulator_core mock.
+
+Other modules' tests rely on its call log and configurable responses.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from ..interface import VMState, VMInfo
+from ..mocks import MockEmulatorCoreInterface
+
+
+class TestMockCalls:
+    """Test suite for call recording."""
+
+    @pytest.fixture
+    def mock(self):
+        return MockEmulatorCoreInterface()
+
+    def test_calls_are_recorded_as_dicts(self, mock):
+        mock.start()
+        mock.save_snapshot("snap")
+        assert mock.calls == [
+            {"method": "start", "args": {}},
+            {"method": "save_snapshot", "args": {"name": "snap"}},
+        ]
+
+    def test_get_calls_filters_by_method(self, mock):
+        mock.save_snapshot("a")
+        mock.stop()
+        mock.save_snapshot("b")
+        assert mock.get_calls("save_snapshot") == [
+            {"method": "save_snapshot", "args": {"name": "a"}},
+            {"method": "save_snapshot", "args": {"name": "b"}},
+        ]
+        assert len(mock.get_calls()) == 3
+
+    def test_record_calls_false_skips_recording(self, mock):
+        mock.record_calls = False
+        mock.start()
+        mock.get_state()
+        assert mock.calls == []
+        assert mock.get_calls("start") == []
+
+    def test_calls_can_be_edited_in_place(self, mock):
+        mock.start()
+        mock.calls.append({"method": "custom", "args": {"n": 1}})
+        assert mock.get_calls("custom") == [{"method": "custom", "args": {"n": 1}}]
+
+        mock.calls.clear()
+        assert mock.calls == []
+
+    def test_call_entries_are_snapshots(self, mock):
+        mock.save_snapshot("a")
+        mock.calls[0]["args"]["name"] = "changed"
+        assert mock.calls[0]["args"] == {"name": "a"}
+
+        mock.calls[0] = {"method": "save_snapshot", "args": {"name": "b"}}
+        assert mock.calls[0]["args"] == {"name": "b"}
+
+    def test_methods_can_be_patched(self, mock):
+        with patch.object(mock, "start") as start:
+            mock.start()
+        start.assert_called_once_with()
+        assert mock.calls == []
+
+        mock.extra = "fixture data"
+        assert mock.extra == "fixture data"
+
+    def test_calls_can_be_assigned(self, mock):
+        mock.stop()
+        mock.calls = [{"method": "seed", "args": {}}]
+        mock.start()
+        assert [c["method"] for c in mock.calls] == ["seed", "start"]
+
+    def test_clear_resets_calls_and_responses(self, mock):
+        mock.save_snapshot("snap")
+        mock.set_response("get_state", VMState.ERROR)
+        mock.clear()
+        assert mock.calls == []
+        assert dict(mock.responses) == {}
+        assert mock.get_state() == VMState.STOPPED
+
+
+class TestMockResponses:
+    """Test suite for configured responses."""
+
+    @pytest.fixture
+    def mock(self):
+        return MockEmulatorCoreInterface()
+
+    def test_defaults_without_responses(self, mock):
+        assert mock.get_state() == VMState.STOPPED
+        assert mock.get_info().state == VMState.STOPPED
+        assert mock.save_snapshot("snap") == "/mock/snapshots/snap"
+
+    def test_set_response_overrides_return_values(self, mock):
+        info = VMInfo(state=VMState.PAUSED)
+        mock.set_response("get_state", VMState.ERROR)
+        mock.set_response("get_info", info)
+        mock.set_response("save_snapshot", "/tmp/snap")
+        assert mock.get_state() == VMState.ERROR
+        assert mock.get_info() is info
+        assert mock.save_snapshot("snap") == "/tmp/snap"
+
+    def test_none_is_a_valid_response(self, mock):
+        mock.set_response("get_info", None)
+        assert mock.get_info() is None
+
+    def test_responses_can_be_edited_in_place(self, mock):
+        mock.responses["get_state"] = VMState.RUNNING
+        assert mock.get_state() == VMState.RUNNING
+
+        del mock.responses["get_state"]
+        assert mock.get_state() == VMState.STOPPED
+        with pytest.raises(KeyError):
+            mock.responses["get_state"]
+
+    def test_any_method_name_is_accepted(self, mock):
+        mock.set_response("load_snapshot", "ignored")
+        assert mock.responses == {"load_snapshot": "ignored"}
+
+    def test_responses_can_be_assigned(self, mock):
+        mock.set_response("get_info", None)
+        mock.responses = {"get_state": VMState.PAUSED}
+        assert dict(mock.responses) == {"get_state": VMState.PAUSED}
+        assert mock.get_info().state == VMState.STOPPED
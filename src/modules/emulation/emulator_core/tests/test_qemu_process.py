@@ -4,7 +4,19 @@ Tests for QEMUProcess module.
 Tests the QEMU process management functionality.
 """
 
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
 import pytest
+from ..internal import qemu_process
+from ..internal.kvm_caps import KvmCaps
 from ..internal.qemu_process import (
     QEMUProcess,
     QEMUConfig,
@@ -101,12 +113,160 @@ class TestQEMUProcess:
         # Error should mention either QEMU or image
         assert "not found" in str(exc.value).lower()
 
+    def test_start_reports_all_missing_images(self, tmp_path, monkeypatch):
+        """Every missing image is named in one error."""
+        system = tmp_path / "system.img"
+        system.write_bytes(b"")
+        process = QEMUProcess(QEMUConfig(
+            system_image=str(system),
+            userdata_image=str(tmp_path / "userdata.qcow2"),
+            kernel=str(tmp_path / "other" / "kernel"),
+        ))
+        monkeypatch.setattr(qemu_process, "_qemu_available", lambda binary: True)
+        with pytest.raises(QEMUProcessError) as exc:
+            process.start()
+        assert str(exc.value) == (
+            f"Image files not found: {tmp_path / 'userdata.qcow2'}, "
+            f"{tmp_path / 'other' / 'kernel'}"
+        )
+
+    def test_missing_files_checks_symlink_targets(self, tmp_path):
+        """A dangling symlink counts as missing."""
+        present = tmp_path / "present.img"
+        present.write_bytes(b"")
+        dangling = tmp_path / "dangling.img"
+        dangling.symlink_to(tmp_path / "gone.img")
+        paths = [str(present), str(dangling), str(tmp_path / "absent.img")]
+        assert qemu_process._missing_files(paths) == paths[1:]
+
     def test_cleanup_resets_state(self, process):
         """Cleanup returns process to stopped state."""
         process._state = QEMUState.RUNNING
         process.cleanup()
         assert process.state == QEMUState.STOPPED
 
+    def test_qemu_availability_checked_once(self, process, monkeypatch):
+        """Repeated starts probe the QEMU binary only once."""
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            raise FileNotFoundError(cmd[0])
+
+        qemu_process._qemu_available.cache_clear()
+        monkeypatch.setattr(qemu_process.subprocess, "run", fake_run)
+        try:
+            for _ in range(3):
+                with pytest.raises(QEMUProcessError):
+                    process.start()
+        finally:
+            qemu_process._qemu_available.cache_clear()
+
+        assert len(calls) == 1
+
+    def test_start_spawns_with_posix_spawn_eligible_args(self, tmp_path, monkeypatch):
+        """QEMU is launched by absolute path with close_fds=False."""
+        image = tmp_path / "system.img"
+        image.write_bytes(b"")
+        process = QEMUProcess(QEMUConfig(
+            system_image=str(image), qemu_binary="true", pin_cpus=False
+        ))
+        captured = {}
+
+        def fake_popen(cmd, **kwargs):
+            captured["cmd"] = cmd
+            captured["kwargs"] = kwargs
+            raise OSError("spawn blocked in test")
+
+        monkeypatch.setattr(qemu_process, "_qemu_available", lambda binary: True)
+        monkeypatch.setattr(qemu_process.subprocess, "Popen", fake_popen)
+        with pytest.raises(QEMUProcessError):
+            process.start()
+
+        assert captured["cmd"][0] == shutil.which("true")
+        assert captured["kwargs"]["close_fds"] is False
+        assert captured["kwargs"]["stdout"] == subprocess.DEVNULL
+        assert captured["kwargs"]["stdin"] == subprocess.DEVNULL
+
+    def test_failed_start_reports_stderr(self, tmp_path, monkeypatch):
+        """QEMU's stderr, collected in a file, is quoted when it exits early."""
+        image = tmp_path / "system.img"
+        image.write_bytes(b"")
+        script = tmp_path / "fake-qemu"
+        # Far more than a pipe holds, so a pipe would have blocked the child.
+        script.write_text(
+            "#!/bin/sh\n"
+            "head -c 200000 /dev/zero | tr '\\0' x >&2\n"
+            "echo 'could not open disk' >&2\n"
+            "exit 1\n"
+        )
+        script.chmod(0o755)
+        process = QEMUProcess(QEMUConfig(
+            system_image=str(image), qemu_binary=str(script), pin_cpus=False,
+        ))
+        monkeypatch.setattr(qemu_process, "_qemu_available", lambda binary: True)
+        with pytest.raises(QEMUProcessError) as exc:
+            process.start()
+        assert str(exc.value).endswith("could not open disk\n")
+        assert len(process.read_stderr()) == qemu_process.STDERR_TAIL_SIZE
+        process.cleanup()
+        assert process.read_stderr() == ""
+
+    def test_start_adds_default_qmp_socket(self, tmp_path, monkeypatch):
+        """Without a configured path, QMP listens in a private directory."""
+        image = tmp_path / "system.img"
+        image.write_bytes(b"")
+        process = QEMUProcess(QEMUConfig(
+            system_image=str(image), qemu_binary="true", pin_cpus=False
+        ))
+        captured = {}
+
+        def fake_popen(cmd, **kwargs):
+            captured["cmd"] = cmd
+            raise OSError("spawn blocked in test")
+
+        monkeypatch.setattr(qemu_process, "_qemu_available", lambda binary: True)
+        monkeypatch.setattr(qemu_process.subprocess, "Popen", fake_popen)
+        with pytest.raises(QEMUProcessError):
+            process.start()
+
+        qmp = process._config.qmp_socket
+        cmd = captured["cmd"]
+        assert cmd[cmd.index("-qmp") + 1] == f"unix:{qmp},server=on,wait=off"
+        assert os.path.isdir(os.path.dirname(qmp))
+
+        process.cleanup()
+        assert process._config.qmp_socket is None
+        assert not os.path.exists(os.path.dirname(qmp))
+
+    def test_start_pins_to_reserved_cpus(self, tmp_path, monkeypatch):
+        """QEMU runs under taskset on CPUs freed again if spawning fails."""
+        image = tmp_path / "system.img"
+        image.write_bytes(b"")
+        process = QEMUProcess(QEMUConfig(
+            system_image=str(image), qemu_binary="true", cpu_cores=1
+        ))
+        allocator = qemu_process._CpuSetAllocator()
+        captured = {}
+
+        def fake_popen(cmd, **kwargs):
+            captured["cmd"] = cmd
+            captured["in_use"] = set(allocator._in_use)
+            raise OSError("spawn blocked in test")
+
+        monkeypatch.setattr(qemu_process, "_qemu_available", lambda binary: True)
+        monkeypatch.setattr(qemu_process, "_resolve_binary",
+                            lambda binary: f"/usr/bin/{binary}")
+        monkeypatch.setattr(qemu_process, "_cpusets", allocator)
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 2, 3})
+        monkeypatch.setattr(qemu_process.subprocess, "Popen", fake_popen)
+        with pytest.raises(QEMUProcessError):
+            process.start()
+
+        assert captured["cmd"][:4] == ["/usr/bin/taskset", "-c", "0,1", "/usr/bin/true"]
+        assert captured["in_use"] == {0, 1}
+        assert not allocator._in_use
+
     def test_force_stop_clears_pid(self, process):
         """Force stop clears PID and resets state."""
         process._pid = 12345
@@ -116,6 +276,345 @@ class TestQEMUProcess:
         assert process.state == QEMUState.STOPPED
 
 
+class TestFindAvailablePort:
+    """Tests for the port range sweep."""
+
+    def test_skips_ports_in_use(self, monkeypatch):
+        monkeypatch.setattr(qemu_process, "_listening_cache", None)
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        busy = listener.getsockname()[1]
+        try:
+            port = qemu_process._find_available_port(busy, max_attempts=20)
+        finally:
+            listener.close()
+
+        assert busy < port < busy + 20
+
+    def test_listening_ports_includes_listener(self, monkeypatch):
+        monkeypatch.setattr(qemu_process, "_listening_cache", None)
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        port = listener.getsockname()[1]
+        try:
+            ports = qemu_process._listening_ports()
+        finally:
+            listener.close()
+
+        if ports is None:
+            pytest.skip("/proc/net not available")
+        assert port in ports
+
+    def test_raises_when_range_exhausted(self):
+        with pytest.raises(RuntimeError):
+            qemu_process._find_available_port(65536, max_attempts=10)
+
+
+class TestCpuSetAllocator:
+    """Tests for disjoint CPU set reservation."""
+
+    def test_sets_are_disjoint_until_released(self, monkeypatch):
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 2, 3, 4})
+        allocator = qemu_process._CpuSetAllocator()
+        first = allocator.acquire(2)
+        second = allocator.acquire(2)
+        assert first == {0, 1}
+        assert second == {2, 3}
+        assert allocator.acquire(2) is None
+        allocator.release(first)
+        assert allocator.acquire(2) == {0, 1}
+
+    def test_exit_callback_releases_cpus(self, monkeypatch):
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1})
+        allocator = qemu_process._CpuSetAllocator()
+        monkeypatch.setattr(qemu_process, "_cpusets", allocator)
+        cpus = allocator.acquire(2)
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        child.wait()
+        QEMUProcess(QEMUConfig())._on_process_exit(child, cpus=cpus)
+        assert allocator.acquire(2) == {0, 1}
+
+
+class TestProcessReaper:
+    """Tests for exit notification of QEMU child processes."""
+
+    def test_watch_reports_exit(self):
+        """The callback runs once the child exits."""
+        done = threading.Event()
+        seen = []
+
+        def on_exit(proc):
+            seen.append(proc.poll())
+            done.set()
+
+        child = subprocess.Popen([sys.executable, "-c", "raise SystemExit(3)"])
+        qemu_process._reaper.watch(child, on_exit)
+
+        assert done.wait(timeout=5.0)
+        assert seen == [3]
+
+    def test_thread_exits_when_idle(self):
+        """The reaper thread ends once its last child has exited."""
+        done = threading.Event()
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        qemu_process._reaper.watch(child, lambda proc: done.set())
+        thread = qemu_process._reaper._thread
+        assert done.wait(timeout=5.0)
+        if thread is not None:  # None where pidfds are unavailable
+            thread.join(timeout=5.0)
+            assert not thread.is_alive()
+
+        again = threading.Event()
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        qemu_process._reaper.watch(child, lambda proc: again.set())
+        assert again.wait(timeout=5.0)
+
+    def test_unexpected_exit_sets_error_state(self, tmp_path):
+        """A QEMU process that dies on its own moves to ERROR."""
+        process = QEMUProcess(QEMUConfig(system_image=str(tmp_path / "x.img")))
+        states = []
+        changed = threading.Event()
+        process.add_state_callback(lambda state: (states.append(state), changed.set()))
+
+        child = subprocess.Popen([sys.executable, "-c", "raise SystemExit(1)"])
+        process._process = child
+        process._pid = child.pid
+        process._state = QEMUState.RUNNING
+        qemu_process._reaper.watch(child, process._on_process_exit)
+
+        assert changed.wait(timeout=5.0)
+        assert states == [QEMUState.ERROR]
+        assert process.error_message == "QEMU exited with code 1"
+        assert process.pid is None
+
+
+def _serve_qmp(path, replies):
+    """Run a fake QMP server answering commands from replies in order.
+
+    Returns the list of commands it receives, capability negotiation
+    excluded.
+    """
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(4)
+    received = []
+    replies = list(replies)
+
+    def serve():
+        while replies:
+            conn, _ = server.accept()
+            with conn, conn.makefile("rwb") as stream:
+                stream.write(b'{"QMP": {"version": {}, "capabilities": []}}\r\n')
+                stream.flush()
+                for line in stream:
+                    request = json.loads(line)
+                    if request["execute"] == "qmp_capabilities":
+                        reply = {"return": {}}
+                    else:
+                        received.append(request)
+                        reply = replies.pop(0)
+                    stream.write(b'{"event": "RESUME"}\r\n')
+                    stream.write(json.dumps(reply).encode() + b"\r\n")
+                    stream.flush()
+                    if not replies:
+                        break
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return received
+
+
+class TestSnapshot:
+    """Tests for snapshot boot and saving."""
+
+    def test_build_command_loads_snapshot(self, tmp_path):
+        qmp = str(tmp_path / "qmp.sock")
+        config = QEMUConfig(
+            system_image="/tmp/test.img",
+            userdata_image="/tmp/overlay.qcow2",
+            snapshot_tag="booted",
+            qmp_socket=qmp,
+        )
+        cmd = QEMUProcess(config)._build_command()
+        assert cmd[cmd.index("-loadvm") + 1] == "booted"
+        assert cmd[cmd.index("-qmp") + 1] == f"unix:{qmp},server=on,wait=off"
+
+    def test_snapshot_boot_requires_userdata(self, tmp_path, monkeypatch):
+        image = tmp_path / "system.img"
+        image.write_bytes(b"")
+        process = QEMUProcess(QEMUConfig(system_image=str(image), snapshot_tag="booted"))
+        monkeypatch.setattr(qemu_process, "_qemu_available", lambda binary: True)
+        with pytest.raises(QEMUProcessError):
+            process.start()
+        assert process.state == QEMUState.ERROR
+
+    def test_save_snapshot_sends_savevm(self, tmp_path):
+        qmp = str(tmp_path / "qmp.sock")
+        received = _serve_qmp(qmp, [{"return": ""}])
+        process = QEMUProcess(QEMUConfig(qmp_socket=qmp))
+        process._state = QEMUState.RUNNING
+
+        process.save_snapshot("booted")
+
+        assert received == [
+            {"execute": "human-monitor-command",
+             "arguments": {"command-line": "savevm booted"}},
+        ]
+
+    def test_save_snapshot_reports_failure(self, tmp_path):
+        qmp = str(tmp_path / "qmp.sock")
+        _serve_qmp(qmp, [{"return": "Error: no block device can store vmstate\r\n"}])
+        process = QEMUProcess(QEMUConfig(qmp_socket=qmp))
+        process._state = QEMUState.RUNNING
+        with pytest.raises(QEMUProcessError, match="vmstate"):
+            process.save_snapshot("booted")
+
+    def test_save_snapshot_requires_running_vm(self):
+        with pytest.raises(QEMUProcessError):
+            QEMUProcess(QEMUConfig(qmp_socket="/tmp/none.sock")).save_snapshot("x")
+
+
+class TestQMP:
+    """Tests for the cached QMP monitor connection."""
+
+    def test_send_key(self, tmp_path):
+        qmp = str(tmp_path / "qmp.sock")
+        received = _serve_qmp(qmp, [{"return": {}}])
+        process = QEMUProcess(QEMUConfig(qmp_socket=qmp))
+        process.send_key("ret")
+        assert received == [{
+            "execute": "send-key",
+            "arguments": {"keys": [{"type": "qcode", "data": "ret"}]},
+        }]
+        process.force_stop()
+
+    def test_connection_is_reused(self, tmp_path):
+        qmp = str(tmp_path / "qmp.sock")
+        received = _serve_qmp(qmp, [{"return": {}}, {"return": {}}])
+        process = QEMUProcess(QEMUConfig(qmp_socket=qmp))
+        process.send_key("a")
+        sock = process._qmp_sock
+        process.send_key("b")
+        assert process._qmp_sock is sock
+        assert len(received) == 2
+        process.force_stop()
+        assert process._qmp_sock is None
+
+    def test_batch_returns_results_in_order(self, tmp_path):
+        qmp = str(tmp_path / "qmp.sock")
+        _serve_qmp(qmp, [{"return": 1}, {"return": 2}, {"return": 3}])
+        process = QEMUProcess(QEMUConfig(qmp_socket=qmp))
+        results = process._qmp_batch([
+            {"execute": "query-status"},
+            {"execute": "query-name"},
+            {"execute": "query-uuid"},
+        ])
+        assert results == [1, 2, 3]
+        process.force_stop()
+
+    def test_send_key_without_qmp_socket_raises(self):
+        with pytest.raises(QEMUProcessError):
+            QEMUProcess(QEMUConfig()).send_key("ret")
+
+
+class TestSwapDrive:
+    """Tests for replacing a disk image at runtime."""
+
+    @pytest.fixture
+    def running(self, tmp_path):
+        qmp = str(tmp_path / "qmp.sock")
+        process = QEMUProcess(QEMUConfig(
+            system_image="/tmp/test.img",
+            userdata_image="/tmp/userdata.qcow2",
+            qmp_socket=qmp,
+        ))
+        process._build_command()
+        process._state = QEMUState.RUNNING
+        return process, qmp
+
+    def test_swap_replaces_image_chain(self, running):
+        process, qmp = running
+        received = _serve_qmp(qmp, [{"return": {}}] * 5)
+
+        process.swap_drive("userdata", "/tmp/next.qcow2")
+
+        assert [r["execute"] for r in received] == [
+            "blockdev-add", "blockdev-add", "blockdev-reopen",
+            "blockdev-del", "blockdev-del",
+        ]
+        assert received[0]["arguments"]["filename"] == "/tmp/next.qcow2"
+        assert received[0]["arguments"]["cache"] == {"direct": True}
+        assert received[2]["arguments"] == {"options": [{
+            "driver": "raw", "node-name": "userdata",
+            "file": "userdata-qcow21", "discard": "unmap",
+        }]}
+        assert [r["arguments"]["node-name"] for r in received[3:]] == [
+            "userdata-qcow20", "userdata-file0",
+        ]
+
+    def test_failed_swap_removes_new_nodes(self, running):
+        process, qmp = running
+        received = _serve_qmp(qmp, [
+            {"return": {}},
+            {"error": {"class": "GenericError", "desc": "bad image"}},
+            {"return": {}},
+        ])
+
+        with pytest.raises(QEMUProcessError, match="bad image"):
+            process.swap_drive("system", "/tmp/next.img")
+
+        assert received[-1] == {
+            "execute": "blockdev-del", "arguments": {"node-name": "system-file1"},
+        }
+        assert process._disk_chains["system"] == ["system-file0"]
+
+    def test_unknown_disk_raises(self, running):
+        process, _ = running
+        with pytest.raises(QEMUProcessError):
+            process.swap_drive("data", "/tmp/data.qcow2")
+
+
+class TestStop:
+    """Tests for stopping a running QEMU process."""
+
+    def _running(self, args):
+        process = QEMUProcess(QEMUConfig())
+        child = subprocess.Popen([sys.executable, "-c", *args])
+        process._process = child
+        process._pid = child.pid
+        process._state = QEMUState.RUNNING
+        process._watch(child)
+        return process, child
+
+    def test_stop_terminates_via_pidfd(self):
+        process, child = self._running(["import time; time.sleep(30)"])
+        if hasattr(os, "pidfd_open"):
+            assert process._pidfd is not None
+        process.stop(timeout=5.0)
+        assert child.returncode == -signal.SIGTERM
+        assert process.state == QEMUState.STOPPED
+        assert process._pidfd is None
+
+    def test_stop_kills_after_timeout(self):
+        process, child = self._running([
+            "import signal, time\n"
+            "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+            "time.sleep(30)",
+        ])
+        time.sleep(0.5)  # let the child install its handler
+        process.stop(timeout=0.2)
+        assert child.returncode == -signal.SIGKILL
+
+    def test_signal_after_exit_is_harmless(self):
+        process, child = self._running(["pass"])
+        assert process._exited.wait(timeout=5.0)
+        process._send_signal(child, signal.SIGTERM)
+        process.force_stop()
+        assert process._pidfd is None
+
+
 class TestQEMUProcessCommandBuild:
     """Test QEMU command building."""
 
@@ -162,11 +661,115 @@ class TestQEMUProcessCommandBuild:
         )
         process = QEMUProcess(config)
         cmd = process._build_command()
-        assert "-drive" in cmd
+        assert "-blockdev" in cmd
         # Find the drive argument
         drive_found = False
         for i, arg in enumerate(cmd):
-            if arg == "-drive" and "/tmp/test.img" in cmd[i + 1]:
+            if arg in ("-drive", "-blockdev") and "/tmp/test.img" in cmd[i + 1]:
                 drive_found = True
                 break
         assert drive_found
+
+    def test_build_command_uses_virtio_blk_iothread(self):
+        """Disks are virtio-blk devices on a q35 machine with an iothread."""
+        config = QEMUConfig(
+            system_image="/tmp/test.img",
+            userdata_image="/tmp/userdata.qcow2",
+            cpu_cores=4,
+        )
+        cmd = QEMUProcess(config)._build_command()
+        assert cmd[cmd.index("-machine") + 1].startswith("q35")
+        assert "iothread,id=io-blk" in cmd
+        assert "virtio-blk-pci,drive=system,iothread=io-blk,num-queues=4" in cmd
+        assert "virtio-blk-pci,drive=userdata,iothread=io-blk,num-queues=4" in cmd
+        assert "-drive" not in cmd
+        assert ("driver=qcow2,node-name=userdata-qcow20,file=userdata-file0,"
+                "discard=unmap") in cmd
+        assert "driver=raw,node-name=userdata,file=userdata-qcow20,discard=unmap" in cmd
+
+    def test_build_command_drive_io_options(self, monkeypatch):
+        """Drives use direct I/O with io_uring, or native AIO without it."""
+        config = QEMUConfig(system_image="/tmp/test.img")
+        for supported, aio in ((True, "io_uring"), (False, "native")):
+            monkeypatch.setattr(
+                qemu_process, "_supports_io_uring", lambda: supported
+            )
+            cmd = QEMUProcess(config)._build_command()
+            assert (f"driver=file,node-name=system-file0,filename=/tmp/test.img,"
+                    f"cache.direct=on,aio={aio},discard=unmap") in cmd
+            legacy = QEMUConfig(system_image="/tmp/test.img", use_virtio_blk=False)
+            cmd = QEMUProcess(legacy)._build_command()
+            drive = cmd[cmd.index("-drive") + 1]
+            assert f",cache=none,aio={aio},discard=unmap," in drive
+
+    def test_supports_io_uring_checks_kernel_release(self, monkeypatch):
+        """io_uring is assumed from kernel 5.1 on."""
+        for release, expected in (("5.1.0", True), ("6.8.0-45-generic", True),
+                                  ("4.19.0", False), ("5.0.21", False)):
+            qemu_process._supports_io_uring.cache_clear()
+            monkeypatch.setattr(
+                os, "uname",
+                lambda release=release: os.uname_result(
+                    ("Linux", "host", release, "", "x86_64")
+                ),
+            )
+            assert qemu_process._supports_io_uring() is expected
+        qemu_process._supports_io_uring.cache_clear()
+
+    def test_build_command_rejects_more_cores_than_kvm_vcpus(self, monkeypatch):
+        """Requesting more cores than KVM supports fails before launch."""
+        monkeypatch.setattr(
+            qemu_process, "kvm_caps",
+            lambda: KvmCaps(available=True, api_version=12,
+                            recommended_vcpus=2, max_vcpus=2),
+        )
+        with pytest.raises(QEMUProcessError):
+            QEMUProcess(QEMUConfig(cpu_cores=4))._build_command()
+        cmd = QEMUProcess(QEMUConfig(cpu_cores=2))._build_command()
+        assert "-enable-kvm" in cmd
+
+    def test_build_command_serial_console(self, tmp_path):
+        """The serial console goes to a log, a socket, or nowhere."""
+        cmd = QEMUProcess(QEMUConfig())._build_command()
+        assert cmd[cmd.index("-serial") + 1] == "null"
+
+        sock = str(tmp_path / "serial.sock")
+        cmd = QEMUProcess(QEMUConfig(serial_socket=sock))._build_command()
+        assert cmd[cmd.index("-serial") + 1] == f"unix:{sock},server=on,wait=off"
+
+        log = str(tmp_path / "serial.log")
+        cmd = QEMUProcess(QEMUConfig(serial_log=log, serial_socket=sock))._build_command()
+        assert cmd[cmd.index("-serial") + 1] == f"file:{log}"
+
+    def test_build_command_default_kernel_cmdline(self):
+        """Direct kernel boot gets the Android cmdline for the screen size."""
+        config = QEMUConfig(kernel="/tmp/kernel", screen_width=720, screen_height=1280)
+        cmd = QEMUProcess(config)._build_command()
+        cmdline = cmd[cmd.index("-append") + 1]
+        assert cmdline.startswith("root=/dev/ram0 console=ttyS0 ")
+        assert "video=720x1280 " in cmdline
+        assert cmdline is QEMUProcess(config)._build_command()[cmd.index("-append") + 1]
+
+        config = QEMUConfig(kernel="/tmp/kernel", kernel_cmdline="quiet")
+        cmd = QEMUProcess(config)._build_command()
+        assert cmd[cmd.index("-append") + 1] == "console=ttyS0 quiet"
+
+    def test_build_command_legacy_ide(self):
+        """use_virtio_blk=False keeps the pc machine and IDE disks."""
+        config = QEMUConfig(system_image="/tmp/test.img", use_virtio_blk=False)
+        cmd = QEMUProcess(config)._build_command()
+        assert cmd[cmd.index("-machine") + 1].startswith("pc")
+        drive = cmd[cmd.index("-drive") + 1]
+        assert drive.startswith("file=/tmp/test.img,format=raw,")
+        assert drive.endswith(",if=ide,index=0")
+        assert "iothread,id=io-blk" not in cmd
+
+    def test_build_command_uses_resolved_binary(self):
+        """A resolved binary path replaces the default binary name."""
+        config = QEMUConfig(
+            system_image="/tmp/test.img",
+            qemu_binary="/opt/qemu/bin/qemu-system-x86_64",
+        )
+        process = QEMUProcess(config)
+        cmd = process._build_command()
+        assert cmd[0] == "/opt/qemu/bin/qemu-system-x86_64"
@@ -0,0 +1,61 @@
+"""
+Tests for snapshot file I/O.
+
+Tests block-aggregated, atomic snapshot writes and restore prefetch.
+"""
+
+import os
+
+import pytest
+from ..internal.snapshot_io import prefetch_snapshot_file, write_snapshot_file
+
+
+class TestWriteSnapshotFile:
+    """Tests for write_snapshot_file."""
+
+    def test_writes_all_chunks(self, tmp_path):
+        """All chunks land in the file in order."""
+        path = str(tmp_path / "snap.bin")
+        chunks = [b"a" * 10, bytearray(b"b" * 5), memoryview(b"c" * 3)]
+        written = write_snapshot_file(path, chunks, block_size=8)
+        assert written == 18
+        with open(path, "rb") as f:
+            assert f.read() == b"a" * 10 + b"b" * 5 + b"c" * 3
+
+    def test_no_staging_file_left_behind(self, tmp_path):
+        """The staging file is renamed over the destination."""
+        path = str(tmp_path / "snap.bin")
+        write_snapshot_file(path, [b"data"])
+        assert os.listdir(tmp_path) == ["snap.bin"]
+
+    def test_failed_stream_keeps_previous_snapshot(self, tmp_path):
+        """An error mid-stream leaves the old snapshot untouched."""
+        path = str(tmp_path / "snap.bin")
+        write_snapshot_file(path, [b"old"])
+
+        def broken():
+            yield b"new"
+            raise RuntimeError("stream failed")
+
+        with pytest.raises(RuntimeError):
+            write_snapshot_file(path, broken())
+        with open(path, "rb") as f:
+            assert f.read() == b"old"
+        assert os.listdir(tmp_path) == ["snap.bin"]
+
+
+class TestPrefetchSnapshotFile:
+    """Tests for prefetch_snapshot_file."""
+
+    def test_prefetch_existing_file(self, tmp_path):
+        """An existing snapshot is prefetched."""
+        path = tmp_path / "snap.bin"
+        path.write_bytes(b"x" * 8192)
+        assert prefetch_snapshot_file(str(path)) is True
+
+    def test_missing_or_empty_file(self, tmp_path):
+        """Missing and empty files are skipped."""
+        empty = tmp_path / "empty.bin"
+        empty.write_bytes(b"")
+        assert prefetch_snapshot_file(str(tmp_path / "missing.bin")) is False
+        assert prefetch_snapshot_file(str(empty)) is False
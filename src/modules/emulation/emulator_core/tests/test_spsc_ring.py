@@ -0,0 +1,56 @@
+"""
+Tests for the single-producer/single-consumer ring buffer.
+"""
+
+import threading
+
+from ..internal.spsc_ring import SPSCRing
+
+
+class TestSPSCRing:
+    """Tests for SPSCRing."""
+
+    def test_capacity_rounds_up_to_power_of_two(self):
+        assert SPSCRing(5).capacity == 8
+        assert SPSCRing(8).capacity == 8
+
+    def test_fifo_order(self):
+        ring = SPSCRing(4)
+        for i in range(3):
+            assert ring.try_enqueue(i)
+        assert len(ring) == 3
+        assert [ring.try_dequeue() for _ in range(3)] == [0, 1, 2]
+        assert len(ring) == 0
+
+    def test_full_and_empty(self):
+        ring = SPSCRing(2)
+        assert ring.try_dequeue() is None
+        assert ring.try_enqueue("a")
+        assert ring.try_enqueue("b")
+        assert not ring.try_enqueue("c")
+        assert not ring.enqueue("c", timeout=0.01)
+        assert ring.try_dequeue() == "a"
+        assert ring.try_enqueue("c")
+
+    def test_dequeue_timeout(self):
+        ring = SPSCRing(2)
+        assert ring.dequeue(timeout=0.01) is None
+
+    def test_cross_thread_handoff(self):
+        ring = SPSCRing(8)
+        count = 5000
+        received = []
+
+        def consume():
+            while len(received) < count:
+                item = ring.dequeue(timeout=1.0)
+                if item is not None:
+                    received.append(item)
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for i in range(count):
+            assert ring.enqueue(i, timeout=1.0)
+        consumer.join(timeout=5.0)
+
+        assert received == list(range(count))
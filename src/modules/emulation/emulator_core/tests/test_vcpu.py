@@ -0,0 +1,105 @@
+"""
+Tests for the virtual CPU register transfer.
+
+Tests that touch /dev/kvm are skipped on hosts without usable KVM.
+"""
+
+import ctypes
+import os
+
+import pytest
+from ..internal.kvm_wrapper import KVM_DEVICE_PATH, KVMError, KVMWrapper
+from ..internal.vcpu import (
+    RFLAGS_RESERVED,
+    VCPURegisterBank,
+    VCPURegisters,
+    VirtualCPU,
+)
+
+requires_kvm = pytest.mark.skipif(
+    not os.access(KVM_DEVICE_PATH, os.R_OK | os.W_OK),
+    reason="KVM not available",
+)
+
+
+class TestVCPURegisters:
+    """Tests for VCPURegisters."""
+
+    def test_layout_matches_kvm_regs(self):
+        assert ctypes.sizeof(VCPURegisters) == 18 * 8
+        assert VCPURegisters.rip.offset == 16 * 8
+
+    def test_defaults(self):
+        regs = VCPURegisters(rax=5)
+        assert regs.rax == 5
+        assert regs.rbx == 0
+        assert regs.rflags == RFLAGS_RESERVED
+
+    def test_equality(self):
+        assert VCPURegisters(rip=0x1000) == VCPURegisters(rip=0x1000)
+        assert VCPURegisters(rip=0x1000) != VCPURegisters()
+
+
+class TestVCPURegisterBank:
+    """Tests for VCPURegisterBank."""
+
+    def test_rows_share_bank_memory(self):
+        bank = VCPURegisterBank(4)
+        cpus = [VirtualCPU(i, bank) for i in range(4)]
+        for i, cpu in enumerate(cpus):
+            cpu.registers.rip = 0x1000 * (i + 1)
+        assert bank.column("rip") == [0x1000, 0x2000, 0x3000, 0x4000]
+        assert bank.column("rflags") == [RFLAGS_RESERVED] * 4
+
+    def test_checkpoint_and_restore(self):
+        bank = VCPURegisterBank(2)
+        cpu = VirtualCPU(1, bank)
+        cpu.registers.rax = 7
+        saved = bank.checkpoint()
+        assert len(saved) == 2 * ctypes.sizeof(VCPURegisters)
+
+        cpu.registers.rax = 9
+        bank.restore(saved)
+        assert cpu.registers.rax == 7
+        with pytest.raises(ValueError):
+            bank.restore(saved[:-8])
+
+    def test_reset_keeps_row_in_bank(self):
+        bank = VCPURegisterBank(1)
+        cpu = VirtualCPU(0, bank)
+        cpu.registers.rsp = 0x8000
+        cpu.reset()
+        cpu.registers.rip = 0xFFF0
+        assert bank.column("rsp") == [0]
+        assert bank.column("rip") == [0xFFF0]
+
+
+class TestVirtualCPU:
+    """Tests for VirtualCPU."""
+
+    def test_unattached_register_access_raises(self):
+        with pytest.raises(KVMError):
+            VirtualCPU(0).read_registers()
+
+    @requires_kvm
+    def test_register_round_trip(self):
+        kvm = KVMWrapper()
+        kvm.open()
+        vm_fd = kvm.create_vm()
+        try:
+            vcpu_fd = kvm.create_vcpu(vm_fd, 0)
+            cpu = VirtualCPU(0)
+            cpu.attach(vcpu_fd)
+
+            cpu.write_registers(VCPURegisters(rax=0x1234, rip=0xFFF0))
+            assert cpu.registers.rax == 0x1234
+
+            cpu.registers.rax = 0
+            regs = cpu.read_registers()
+            assert regs is cpu.registers
+            assert regs.rax == 0x1234
+            assert regs.rip == 0xFFF0
+            assert kvm.get_regs(vcpu_fd)["rax"] == 0x1234
+        finally:
+            kvm.close()
+            os.close(vm_fd)
@@ -4,11 +4,18 @@ Tests for VNCClient module.
 Tests the VNC client functionality for framebuffer capture.
 """
 
+import socket
+import struct
+import threading
+import time
+
 import pytest
 from ..internal.vnc_client import (
     VNCClient,
     VNCError,
     FrameData,
+    PixelFormat,
+    _bgrx_pixel_format,
 )
 
 
@@ -29,6 +36,33 @@ class TestFrameData:
         assert frame.format == "bgra"
         assert len(frame.data) == 100
 
+    def test_bgra_to_rgba(self):
+        """Channels are reordered and the source buffer left alone."""
+        data = bytes([1, 2, 3, 4, 5, 6, 7, 8])
+        frame = FrameData(width=2, height=1, data=data, format="bgra")
+        assert frame.to_rgba() == bytes([3, 2, 1, 4, 7, 6, 5, 8])
+        assert frame.to_rgba(opaque=True) == bytes([3, 2, 1, 255, 7, 6, 5, 255])
+        assert frame.data == data
+
+    def test_bgra_to_rgb(self):
+        frame = FrameData(width=2, height=1, data=memoryview(bytes([1, 2, 3, 4, 5, 6, 7, 8])),
+                          format="bgra")
+        assert frame.to_rgb() == bytes([3, 2, 1, 7, 6, 5])
+
+    def test_bgra_to_bgr(self):
+        frame = FrameData(width=2, height=1, data=bytes([1, 2, 3, 4, 5, 6, 7, 8]),
+                          format="bgra")
+        assert frame.to_bgr() == bytes([1, 2, 3, 5, 6, 7])
+
+    def test_conversion_is_cached(self):
+        frame = FrameData(width=1, height=1, data=bytes([1, 2, 3, 4]), format="bgra")
+        assert frame.to_rgba() is frame.to_rgba()
+
+    def test_same_format_is_not_copied(self):
+        data = bytes([1, 2, 3, 4])
+        frame = FrameData(width=1, height=1, data=data, format="rgba")
+        assert frame.to_rgba() is data
+
 
 class TestVNCClient:
     """Test suite for VNCClient."""
@@ -132,3 +166,409 @@ class TestVNCClientMessageBuilding:
         """Security None type is correct."""
         client = VNCClient()
         assert client.SEC_NONE == 1
+
+
+class TestClientMessages:
+    """Tests for the bytes of client-to-server messages."""
+
+    @pytest.fixture
+    def connected(self, wired_client):
+        client, server = wired_client
+        client._connected = True
+        client._width, client._height = 640, 480
+        return client, server
+
+    def test_key_event(self, connected):
+        client, server = connected
+        client.send_key(0xFF0D, True)
+        assert server.recv(64) == b"\x04\x01\x00\x00\x00\x00\xff\x0d"
+
+    def test_pointer_event(self, connected):
+        client, server = connected
+        client.send_pointer(300, 200, 1)
+        assert server.recv(64) == struct.pack("!BBHH", 5, 1, 300, 200)
+
+    def test_framebuffer_request(self, connected):
+        client, server = connected
+        client.request_framebuffer(incremental=True)
+        assert server.recv(64) == struct.pack("!BBHHHH", 3, 1, 0, 0, 640, 480)
+
+    def test_set_encodings(self, connected):
+        client, _ = connected
+        assert client._encodings_message() == struct.pack(
+            "!BxHii", 2, 2, VNCClient.ENC_RAW, VNCClient.ENC_DESKTOP_SIZE
+        )
+
+    def test_set_pixel_format(self, connected):
+        client, _ = connected
+        pixel_format = _bgrx_pixel_format(big_endian=False)
+        msg = client._pixel_format_message(pixel_format)
+        assert len(msg) == 20
+        assert msg[0] == VNCClient.MSG_SET_PIXEL_FORMAT
+        assert msg[4] == 32  # bits per pixel
+        assert PixelFormat.unpack_from(msg, 4) == pixel_format
+
+    def test_send_messages_gathers(self, connected):
+        client, server = connected
+        client._send_messages(b"abc", b"", b"defg")
+        assert server.recv(64) == b"abcdefg"
+
+
+def _raw_update(rects):
+    """Encode a FramebufferUpdate body (after the message type byte)."""
+    msg = struct.pack("!xH", len(rects))
+    for x, y, w, h, pixels in rects:
+        msg += struct.pack("!HHHHi", x, y, w, h, VNCClient.ENC_RAW) + pixels
+    return msg
+
+
+@pytest.fixture
+def wired_client():
+    """A client whose socket is one end of a socketpair."""
+    client = VNCClient()
+    client_sock, server_sock = socket.socketpair()
+    client._socket = client_sock
+    yield client, server_sock
+    client_sock.close()
+    server_sock.close()
+
+
+class TestFramebufferUpdate:
+    """Tests for decoding framebuffer updates."""
+
+    def test_raw_frame_is_received_whole(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 64, 48
+        pixels = bytes(range(256)) * (64 * 48 * 4 // 256)
+        frames = []
+        client.set_frame_callback(frames.append)
+
+        # Send in pieces so the client has to reassemble it
+        message = _raw_update([(0, 0, 64, 48, pixels)])
+        sender = threading.Thread(
+            target=lambda: [server.sendall(message[i:i + 1000])
+                            for i in range(0, len(message), 1000)]
+        )
+        sender.start()
+        client._handle_framebuffer_update()
+        sender.join()
+
+        frame = client.get_framebuffer()
+        assert bytes(frame.data) == pixels
+        assert frame.data.readonly
+        assert frames[0].data.obj is frame.data.obj  # no copy
+
+    def test_partial_rects_are_merged(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 4, 3
+        frames = []
+        client.set_frame_callback(frames.append)
+
+        server.sendall(_raw_update([(0, 0, 4, 3, b"\x00" * 48)]))
+        client._handle_framebuffer_update()
+        server.sendall(_raw_update([
+            (1, 1, 2, 2, b"\x11" * 16),
+            (0, 2, 4, 1, b"\x22" * 16),
+        ]))
+        client._handle_framebuffer_update()
+
+        data = bytes(client.get_framebuffer().data)
+        rows = [data[i:i + 16] for i in range(0, 48, 16)]
+        assert rows[0] == b"\x00" * 16
+        assert rows[1] == b"\x00" * 4 + b"\x11" * 8 + b"\x00" * 4
+        assert rows[2] == b"\x22" * 16
+        # One callback per update, each with the whole screen
+        assert len(frames) == 2
+        assert (frames[1].width, frames[1].height) == (4, 3)
+
+    def test_headers_split_across_reads(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 1, 1
+        message = _raw_update([(0, 0, 1, 1, b"\x01\x02\x03\x04")])
+        sender = threading.Thread(
+            target=lambda: [server.sendall(message[i:i + 1])
+                            for i in range(len(message))]
+        )
+        sender.start()
+        client._handle_framebuffer_update()
+        sender.join()
+
+        assert bytes(client.get_framebuffer().data) == b"\x01\x02\x03\x04"
+
+    def test_rect_outside_screen_is_clipped(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 2, 2
+        server.sendall(_raw_update([
+            (0, 0, 2, 2, bytes(16)),
+            (1, 1, 2, 2, b"\x33" * 16),
+        ]))
+        client._handle_framebuffer_update()
+
+        data = bytes(client.get_framebuffer().data)
+        assert len(data) == 16
+        assert data == bytes(12) + b"\x33" * 4
+
+    def test_truncated_update_is_not_published(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 2, 2
+        frames = []
+        client.set_frame_callback(frames.append)
+
+        message = _raw_update([
+            (0, 0, 2, 1, b"\x01" * 8),
+            (0, 1, 2, 1, b"\x02" * 8),
+        ])
+        server.sendall(message[:-4])
+        server.shutdown(socket.SHUT_WR)
+        client._handle_framebuffer_update()
+
+        assert client.get_framebuffer() is None
+        assert frames == []
+
+    def test_desktop_resize_waits_for_new_frame(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 2, 2
+        resize = struct.pack("!HHHHi", 0, 0, 3, 1, VNCClient.ENC_DESKTOP_SIZE)
+        server.sendall(_raw_update([(0, 0, 2, 2, b"\x01" * 16)]))
+        client._handle_framebuffer_update()
+        server.sendall(struct.pack("!xH", 1) + resize)
+        client._handle_framebuffer_update()
+
+        # The old frame stays up until the new screen arrives
+        assert not client._have_full_frame
+        assert client.get_framebuffer().width == 2
+
+        server.sendall(_raw_update([(0, 0, 3, 1, b"\x02" * 12)]))
+        client._handle_framebuffer_update()
+        frame = client.get_framebuffer()
+        assert (frame.width, frame.height) == (3, 1)
+        assert bytes(frame.data) == b"\x02" * 12
+
+    def test_published_frame_survives_next_update(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 1, 1
+        server.sendall(_raw_update([(0, 0, 1, 1, b"\x01" * 4)]))
+        client._handle_framebuffer_update()
+        first = client.get_framebuffer()
+
+        server.sendall(_raw_update([(0, 0, 1, 1, b"\x02" * 4)]))
+        client._handle_framebuffer_update()
+
+        assert bytes(first.data) == b"\x01" * 4
+        assert bytes(client.get_framebuffer().data) == b"\x02" * 4
+
+    def test_full_width_rect_skips_scratch_buffer(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 2, 2
+        server.sendall(_raw_update([(0, 0, 2, 2, b"\x05" * 16)]))
+        client._handle_framebuffer_update()
+
+        assert bytes(client.get_framebuffer().data) == b"\x05" * 16
+        assert len(client._recv_buf) == 0
+
+    def test_receive_buffer_is_reused(self, wired_client):
+        client, server = wired_client
+        client._width, client._height = 2, 2
+
+        server.sendall(_raw_update([(0, 0, 1, 2, bytes(8))]))
+        client._handle_framebuffer_update()
+        recv_buf = client._recv_buf
+        server.sendall(_raw_update([(0, 0, 1, 1, b"\x01" * 4)]))
+        client._handle_framebuffer_update()
+
+        assert client._recv_buf is recv_buf
+
+    def test_requests_become_incremental_after_full_frame(self, wired_client):
+        client, server = wired_client
+        server.settimeout(5.0)
+        client._width, client._height = 2, 1
+        client._connected = True
+        receiver = threading.Thread(target=client._receive_loop)
+        receiver.start()
+        try:
+            first = server.recv(10)
+            assert first[0] == VNCClient.MSG_FRAMEBUFFER_UPDATE_REQUEST
+            assert first[1] == 0  # full
+
+            server.sendall(b"\x00" + _raw_update([(0, 0, 2, 1, bytes(8))]))
+            second = server.recv(10)
+            assert second[1] == 1  # incremental
+        finally:
+            client.disconnect()
+            receiver.join()
+
+
+def _recv_exact(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+@pytest.fixture
+def vnc_server(request):
+    """A one-shot RFB server that completes the handshake for 64x48.
+
+    Parametrize indirectly with True for a big-endian server.
+    """
+    big_endian = getattr(request, "param", False)
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    accepted = []
+
+    def serve():
+        conn, _ = listener.accept()
+        accepted.append(conn)
+        conn.sendall(b"RFB 003.008\n")
+        _recv_exact(conn, 12)
+        conn.sendall(b"\x01\x01")  # one security type: None
+        _recv_exact(conn, 1)
+        conn.sendall(struct.pack("!I", 0))
+        _recv_exact(conn, 1)  # ClientInit
+        name = b"QEMU"
+        if big_endian:
+            pixel_format = struct.pack("!BBBBHHHBBBxxx", 32, 24, 1, 1,
+                                       255, 255, 255, 0, 8, 16)
+        else:
+            pixel_format = struct.pack("!BBBBHHHBBBxxx", 32, 24, 0, 1,
+                                       255, 255, 255, 16, 8, 0)
+        conn.sendall(struct.pack("!HH", 64, 48) + pixel_format
+                     + struct.pack("!I", len(name)) + name)
+
+    server = threading.Thread(target=serve)
+    server.start()
+    yield listener.getsockname()[1], accepted
+    server.join(timeout=5)
+    for conn in accepted:
+        conn.close()
+    listener.close()
+
+
+class TestHandshake:
+    """Tests for connecting to an RFB server."""
+
+    def test_connect_reads_server_init(self, vnc_server):
+        port, _ = vnc_server
+        client = VNCClient(host="127.0.0.1", port=port)
+        try:
+            client.connect(timeout=5.0)
+            assert client.connected
+            assert (client.width, client.height) == (64, 48)
+        finally:
+            client.disconnect()
+
+    def test_disconnect_wakes_idle_receiver(self, vnc_server):
+        port, _ = vnc_server
+        client = VNCClient(host="127.0.0.1", port=port)
+        client.connect(timeout=5.0)
+        receiver = client._receiver_thread
+        # The server never answers, so the receiver sits in select()
+        started = time.monotonic()
+        client.disconnect()
+        assert time.monotonic() - started < 0.5
+        assert not receiver.is_alive()
+
+    def test_disconnect_is_idempotent(self, vnc_server):
+        port, _ = vnc_server
+        client = VNCClient(host="127.0.0.1", port=port)
+        client.connect(timeout=5.0)
+        client.disconnect()
+        client.disconnect()
+        assert client._socket is None
+        assert client._receiver_thread is None
+
+    def test_disconnect_signals_server(self, vnc_server):
+        port, accepted = vnc_server
+        client = VNCClient(host="127.0.0.1", port=port)
+        client.connect(timeout=5.0)
+        client.disconnect()
+        conn = accepted[0]
+        conn.settimeout(5.0)
+        # Drain the client's setup messages; then EOF from the shutdown
+        while conn.recv(4096):
+            pass
+
+    def test_matching_server_format_is_kept(self, vnc_server):
+        port, accepted = vnc_server
+        client = VNCClient(host="127.0.0.1", port=port)
+        try:
+            client.connect(timeout=5.0)
+            setup = _recv_exact(accepted[0], 12)
+            # Only SetEncodings; the server already sends BGRX
+            assert setup[0] == VNCClient.MSG_SET_ENCODINGS
+            assert client._pixel_format == _bgrx_pixel_format(False)
+        finally:
+            client.disconnect()
+
+    @pytest.mark.parametrize("vnc_server", [True], indirect=True)
+    def test_big_endian_server_keeps_its_byte_order(self, vnc_server):
+        port, accepted = vnc_server
+        client = VNCClient(host="127.0.0.1", port=port)
+        try:
+            client.connect(timeout=5.0)
+            setup = _recv_exact(accepted[0], 20)
+            assert setup[0] == VNCClient.MSG_SET_PIXEL_FORMAT
+            requested = PixelFormat.unpack_from(setup, 4)
+            assert requested.big_endian
+            # B, G, R, X in memory: blue in the most significant byte
+            assert (requested.blue_shift, requested.green_shift,
+                    requested.red_shift) == (24, 16, 8)
+        finally:
+            client.disconnect()
+
+    def test_server_name_is_skipped(self, vnc_server):
+        port, accepted = vnc_server
+        client = VNCClient(host="127.0.0.1", port=port)
+        try:
+            client.connect(timeout=5.0)
+            # The name went to the scratch buffer, and the stream is in
+            # sync: the next thing read is an update.
+            accepted[0].sendall(b"\x00" + _raw_update([(0, 0, 64, 1, bytes(256))]))
+            for _ in range(100):
+                if client.get_framebuffer() is not None:
+                    break
+                time.sleep(0.01)
+            assert client.get_framebuffer() is not None
+        finally:
+            client.disconnect()
+
+    def test_connect_disables_nagle(self, vnc_server):
+        port, _ = vnc_server
+        client = VNCClient(host="127.0.0.1", port=port)
+        try:
+            client.connect(timeout=5.0)
+            assert client._socket.getsockopt(
+                socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        finally:
+            client.disconnect()
+
+    def test_server_rejection_reason(self):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        reason = b"Too many connections"
+
+        def serve():
+            conn, _ = listener.accept()
+            conn.sendall(b"RFB 003.008\n")
+            _recv_exact(conn, 12)
+            # Zero security types, then the reason in two pieces
+            conn.sendall(b"\x00" + struct.pack("!I", len(reason)) + reason[:4])
+            time.sleep(0.05)
+            conn.sendall(reason[4:])
+            conn.close()
+
+        server = threading.Thread(target=serve)
+        server.start()
+        client = VNCClient(host="127.0.0.1", port=listener.getsockname()[1])
+        try:
+            with pytest.raises(VNCError, match="Too many connections"):
+                client.connect(timeout=5.0)
+        finally:
+            client.disconnect()
+            server.join(timeout=5)
+            listener.close()
@@ -1,7 +1,7 @@
 """
 GTK3 integration for GPU renderer shared memory display.
 
-Provides a frame source that polls shared memory and delivers
+Provides a frame source that reads shared memory and delivers
 frames to the EmulatorDisplay widget using GTK's main loop.
 """
 
@@ -9,44 +9,101 @@ import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import GLib
 
-from typing import Optional, Callable, TYPE_CHECKING
+from typing import Optional, Callable, NamedTuple, TYPE_CHECKING
+import select
 import threading
 import time
 
-from .internal.shm_display import SharedMemoryDisplay
+from .internal.shm_display import (
+    SharedMemoryDisplay,
+    drain_frame_notifier,
+    signal_frame,
+)
 
 if TYPE_CHECKING:
     from src.ui.components.emulator_display import EmulatorDisplay
 
 
+class _FrameUpdate(NamedTuple):
+    """A new frame and the rows of it to deliver."""
+    frame_number: int
+    width: int
+    height: int
+    stride: int
+    full: bool  # whole frame, else the dirty rectangle below
+    x: int
+    y: int
+    dirty_width: int
+    rows: int
+
+
 class SharedMemoryFrameSource:
     """
-    Polls shared memory for new frames and delivers them to GTK widget.
-
-    Uses GLib.timeout_add() to poll shared memory at regular intervals
-    and update the EmulatorDisplay widget with new frames.
+    Reads new frames from shared memory and delivers them to GTK widget.
+
+    Given the producer's frame eventfd, a copy thread sleeps on it and
+    snapshots each new frame into one of two reused buffers, then hands
+    the widget a memoryview of it via GLib.idle_add(), so the GTK
+    thread does no shared-memory copy. A buffer is refilled only after
+    the widget has taken the frame in it. Without an eventfd,
+    GLib.timeout_add() polls shared memory at the target frame rate on
+    the GTK thread, each timeout aimed at an absolute deadline so the
+    rate stays exact despite millisecond timer resolution. A poll that
+    finds the frame number unchanged returns without touching pixel
+    memory, and a frame that directly follows the last delivered one
+    only copies its dirty rectangle.
     """
 
-    def __init__(self, shm_name: str, target_fps: int = 60):
+    # Fallback poll interval when woken by the frame eventfd
+    WATCHDOG_INTERVAL_MS = 250
+    # How often a source seeing no new frames checks whether the
+    # producer recreated the region (it does on resize)
+    REPLACED_CHECK_INTERVAL_NS = 250_000_000
+
+    def __init__(self, shm_name: str, target_fps: int = 60,
+                 frame_fd: Optional[int] = None):
         """
         Initialize the frame source.
 
         Args:
             shm_name: Shared memory name (e.g., "/linblock_display_1234")
             target_fps: Target frame rate for polling (default 60)
+            frame_fd: eventfd the producer signals after each frame;
+                polls at target_fps when None
         """
         self._shm_name = shm_name
         self._target_fps = target_fps
-        self._poll_interval_ms = max(1, 1000 // target_fps)
+        # Poll period; deadlines advance by it exactly
+        self._period_ns = 1_000_000_000 // target_fps
+        self._next_deadline_ns = 0
+        self._frame_fd = frame_fd
 
         self._shm: Optional[SharedMemoryDisplay] = None
         self._widget: Optional['EmulatorDisplay'] = None
         self._running = False
         self._timeout_id: Optional[int] = None
         self._frame_callback: Optional[Callable[[int, int, int], None]] = None
-        self._last_frame_time = 0.0
+        # FPS: frames counted in the current window, and the last
+        # complete window's frame count and length
+        self._window_start_ns = 0
         self._frame_count = 0
-        self._fps = 0.0
+        self._window_frames = 0
+        self._window_ns = 0
+        # Last delivered frame; the widget holds it in full
+        self._last_frame_number = -1
+        # Frames overwritten before they could be delivered
+        self._dropped = 0
+        # (geometry generation, width, height, stride) from the last
+        # full header read
+        self._cached_geom: Optional[tuple] = None
+        self._next_replaced_check_ns = 0
+
+        # Copy thread state: two snapshot buffers, grown as needed, and
+        # whether the widget has taken each one
+        self._copy_thread: Optional[threading.Thread] = None
+        self._buffers = [bytearray(), bytearray()]
+        self._delivered = [threading.Event(), threading.Event()]
+        self._active = 0
 
     def attach(self, widget: 'EmulatorDisplay') -> None:
         """
@@ -68,7 +125,7 @@ class SharedMemoryFrameSource:
 
     def start(self) -> bool:
         """
-        Start polling shared memory for frames.
+        Start delivering frames from shared memory.
 
         Returns:
             True if started successfully, False otherwise
@@ -84,25 +141,46 @@ class SharedMemoryFrameSource:
             return False
 
         self._running = True
-        self._last_frame_time = time.time()
+        self._window_start_ns = time.monotonic_ns()
         self._frame_count = 0
-
-        # Schedule polling on GTK main loop
-        self._timeout_id = GLib.timeout_add(
-            self._poll_interval_ms,
-            self._poll_frame
-        )
+        self._window_frames = 0
+        self._window_ns = 0
+        self._last_frame_number = -1
+        self._cached_geom = None
+        self._dropped = 0
+
+        if self._frame_fd is not None and self._widget is not None:
+            for delivered in self._delivered:
+                delivered.set()
+            self._copy_thread = threading.Thread(
+                target=self._copy_loop,
+                name="shm-frame-copy",
+                daemon=True,
+            )
+            self._copy_thread.start()
+        else:
+            # Schedule polling on GTK main loop
+            self._next_deadline_ns = time.monotonic_ns()
+            self._schedule_poll()
 
         return True
 
     def stop(self) -> None:
-        """Stop polling and release resources."""
+        """Stop delivering frames and release resources."""
         self._running = False
 
         if self._timeout_id is not None:
             GLib.source_remove(self._timeout_id)
             self._timeout_id = None
 
+        if self._copy_thread is not None:
+            # Release a thread waiting on the widget, and wake its select
+            for delivered in self._delivered:
+                delivered.set()
+            signal_frame(self._frame_fd)
+            self._copy_thread.join(timeout=1.0)
+            self._copy_thread = None
+
         if self._shm is not None:
             try:
                 self._shm.cleanup()
@@ -110,6 +188,162 @@ class SharedMemoryFrameSource:
                 pass
             self._shm = None
 
+    def _next_update(self) -> Optional[_FrameUpdate]:
+        """
+        Check for a new frame and pick the rows to deliver.
+
+        Only the newest frame in shared memory is ever delivered;
+        frames the producer wrote in between are counted as dropped and
+        their changes are covered by delivering the whole frame. The
+        full header is only read when its geometry generation differs
+        from the cached one. While no new frame arrives, the region is
+        periodically checked for having been recreated under its name,
+        and remapped if so.
+
+        Returns:
+            The update, or None without a new frame
+        """
+        shm = self._shm
+        frame_number = shm.peek_frame_number()
+        if frame_number is None:
+            return None
+        if frame_number == self._last_frame_number:
+            if not self._reopen_if_replaced():
+                return None
+            frame_number = shm.peek_frame_number()
+
+        frame_number, x, y, width, rows, generation = shm.read_frame_state()
+        geometry = self._cached_geom
+        skipped = frame_number - self._last_frame_number - 1
+        consecutive = skipped == 0
+        if skipped > 0 and self._last_frame_number >= 0:
+            self._dropped += skipped
+        if geometry is None or geometry[0] != generation:
+            header = shm.read_header()
+            if header is None:
+                return None
+            geometry = self._cached_geom = (
+                header.geometry_generation, header.width, header.height,
+                header.stride,
+            )
+            consecutive = False
+
+        self._last_frame_number = frame_number
+        _, frame_width, frame_height, stride = geometry
+        if consecutive:
+            return _FrameUpdate(frame_number, frame_width, frame_height, stride,
+                                False, x, y, width, rows)
+        # New geometry or missed frames: the whole frame
+        return _FrameUpdate(frame_number, frame_width, frame_height, stride,
+                            True, 0, 0, frame_width, frame_height)
+
+    def _reopen_if_replaced(self) -> bool:
+        """
+        Remap the region if the producer recreated it, at most every
+        REPLACED_CHECK_INTERVAL_NS.
+
+        Returns:
+            True if the region was remapped; the next frame is then
+            delivered in full
+        """
+        now_ns = time.monotonic_ns()
+        if now_ns < self._next_replaced_check_ns:
+            return False
+        self._next_replaced_check_ns = now_ns + self.REPLACED_CHECK_INTERVAL_NS
+        if not self._shm.is_replaced():
+            return False
+        self._shm.reopen()
+        self._cached_geom = None
+        self._last_frame_number = -1
+        return True
+
+    def _deliver(self, update: _FrameUpdate, pixels) -> None:
+        """Hand pixels to the widget and notify (GTK main loop)."""
+        if update.full:
+            self._widget.set_framebuffer(
+                pixels, update.width, update.height, format="bgra"
+            )
+        else:
+            self._widget.set_framebuffer_region(
+                pixels, update.x, update.y, update.dirty_width, update.rows,
+                format="bgra",
+            )
+
+        # Update FPS counter; get_fps() does the division
+        self._frame_count += 1
+        now_ns = time.monotonic_ns()
+        elapsed_ns = now_ns - self._window_start_ns
+        if elapsed_ns >= 1_000_000_000:
+            self._window_frames = self._frame_count
+            self._window_ns = elapsed_ns
+            self._frame_count = 0
+            self._window_start_ns = now_ns
+
+        # Notify callback
+        if self._frame_callback:
+            self._frame_callback(update.frame_number, update.width, update.height)
+
+    def _copy_loop(self) -> None:
+        """Snapshot new frames into the spare buffer (copy thread)."""
+        fd = self._frame_fd
+        timeout = self.WATCHDOG_INTERVAL_MS / 1000
+        while self._running:
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if ready:
+                drain_frame_notifier(fd)
+
+            # Wait until the widget has taken the spare buffer's last frame
+            index = self._active ^ 1
+            delivered = self._delivered[index]
+            delivered.wait()
+            if not self._running:
+                break
+
+            try:
+                update = self._next_update()
+                if update is None:
+                    continue
+                size = update.rows * update.stride
+                if len(self._buffers[index]) < size:
+                    self._buffers[index] = bytearray(size)
+                snapshot = memoryview(self._buffers[index])[:size]
+                snapshot[:] = self._shm.pixel_rows(update.y, update.rows, update.stride)
+
+                delivered.clear()
+                self._active = index
+                GLib.idle_add(self._deliver_snapshot, index, update, snapshot)
+            except Exception as e:
+                print(f"Frame copy error: {e}")
+
+    def _deliver_snapshot(self, index: int, update: _FrameUpdate,
+                          snapshot: memoryview) -> bool:
+        """Deliver a copy thread snapshot (GTK main loop, one-shot)."""
+        try:
+            if self._running:
+                self._deliver(update, snapshot)
+        except Exception as e:
+            print(f"Frame delivery error: {e}")
+        finally:
+            self._delivered[index].set()
+        return False
+
+    def _schedule_poll(self) -> None:
+        """Set a one-shot timeout for the next poll deadline."""
+        self._next_deadline_ns += self._period_ns
+        now_ns = time.monotonic_ns()
+        if self._next_deadline_ns < now_ns:
+            # Fell a whole period behind: restart the phase, no catch-up burst
+            self._next_deadline_ns = now_ns + self._period_ns
+        delay_ms = max(0, (self._next_deadline_ns - now_ns) // 1_000_000)
+        self._timeout_id = GLib.timeout_add(delay_ms, self._on_poll_timeout)
+
+    def _on_poll_timeout(self) -> bool:
+        """Poll, then schedule the next deadline (GTK main loop)."""
+        self._timeout_id = None
+        if self._poll_frame():
+            self._schedule_poll()
+        return False  # one-shot; _schedule_poll() added the next timeout
+
     def _poll_frame(self) -> bool:
         """
         Poll for new frame (called from GTK main loop).
@@ -124,25 +358,10 @@ class SharedMemoryFrameSource:
             return True
 
         try:
-            result = self._shm.read_frame()
-            if result is not None:
-                width, height, frame_number, timestamp_ns, pixels = result
-
-                # Update widget on main thread
-                self._widget.set_framebuffer(pixels, width, height, format="bgra")
-
-                # Update FPS counter
-                self._frame_count += 1
-                now = time.time()
-                elapsed = now - self._last_frame_time
-                if elapsed >= 1.0:
-                    self._fps = self._frame_count / elapsed
-                    self._frame_count = 0
-                    self._last_frame_time = now
-
-                # Notify callback
-                if self._frame_callback:
-                    self._frame_callback(frame_number, width, height)
+            update = self._next_update()
+            if update is not None:
+                pixels = self._shm.pixel_rows(update.y, update.rows, update.stride)
+                self._deliver(update, pixels)
 
         except Exception as e:
             print(f"Frame poll error: {e}")
@@ -151,7 +370,13 @@ class SharedMemoryFrameSource:
 
     def get_fps(self) -> float:
         """Get current measured frame rate."""
-        return self._fps
+        if not self._window_ns:
+            return 0.0
+        return self._window_frames * 1e9 / self._window_ns
+
+    def get_dropped_frames(self) -> int:
+        """Get the number of frames replaced by a newer one before delivery."""
+        return self._dropped
 
     def is_running(self) -> bool:
         """Check if frame source is running."""
@@ -177,6 +402,7 @@ class GPURendererDisplayBridge:
         self._frame_source: Optional[SharedMemoryFrameSource] = None
         self._widget: Optional['EmulatorDisplay'] = None
         self._shm_name: Optional[str] = None
+        self._frame_fd: Optional[int] = None
 
     def connect(self, renderer, widget: 'EmulatorDisplay') -> None:
         """
@@ -192,8 +418,11 @@ class GPURendererDisplayBridge:
         # Get shared memory name from renderer process
         if hasattr(renderer, '_process') and renderer._process:
             self._shm_name = renderer._process.get_shm_name()
+            self._frame_fd = renderer._process.get_frame_fd()
         elif hasattr(renderer, 'get_shm_name'):
             self._shm_name = renderer.get_shm_name()
+            if hasattr(renderer, 'get_frame_fd'):
+                self._frame_fd = renderer.get_frame_fd()
 
     def start(self) -> bool:
         """
@@ -205,7 +434,9 @@ class GPURendererDisplayBridge:
         if not self._shm_name or not self._widget:
             return False
 
-        self._frame_source = SharedMemoryFrameSource(self._shm_name)
+        self._frame_source = SharedMemoryFrameSource(
+            self._shm_name, frame_fd=self._frame_fd
+        )
         self._frame_source.attach(self._widget)
         return self._frame_source.start()
 
@@ -270,6 +270,10 @@ class StubGPURenderer(GPURendererInterface):
         """Get the shared memory name (stub returns None)."""
         return None
 
+    def get_frame_fd(self) -> Optional[int]:
+        """Get the frame eventfd (stub returns None)."""
+        return None
+
     def cleanup(self) -> None:
         self._state = RendererState.UNINITIALIZED
         self._frame_callbacks.clear()
@@ -372,10 +376,13 @@ class NativeGPURenderer(GPURendererInterface):
             shm = SharedMemoryDisplay(self._process.get_shm_name())
             shm.open()
             result = shm.read_frame()
-            shm.cleanup()
 
             if result:
                 width, height, frame_number, timestamp_ns, pixels = result
+                pixels = bytes(pixels)  # outlives the mapping
+            shm.cleanup()
+
+            if result:
                 return FrameData(
                     width=width,
                     height=height,
@@ -431,6 +438,12 @@ class NativeGPURenderer(GPURendererInterface):
             return self._process.get_shm_name()
         return None
 
+    def get_frame_fd(self) -> Optional[int]:
+        """Get the eventfd signalled after each frame, for GTK integration."""
+        if self._process:
+            return self._process.get_frame_fd()
+        return None
+
     def cleanup(self) -> None:
         if self._process:
             self._process.cleanup()
@@ -74,6 +74,8 @@ class RendererProcess:
         self._state_callbacks: List[Callable[[ProcessState], None]] = []
         self._error_message = ""
         self._lock = threading.Lock()
+        # eventfd the worker signals after each frame
+        self._frame_fd: Optional[int] = None
 
         # Generate paths if not specified
         if not self._config.socket_path:
@@ -131,6 +133,7 @@ class RendererProcess:
             "library_path": self._config.library_path,
             "socket_path": self._config.socket_path,
             "shm_name": self._config.shm_name,
+            "frame_fd": self._frame_fd,
         })
         cmd.extend(["--config", config_json])
 
@@ -177,6 +180,12 @@ class RendererProcess:
             self._socket.listen(1)
             self._socket.settimeout(10.0)  # Timeout for accept
 
+            # Frame notifier, inherited by the worker
+            from .shm_display import create_frame_notifier
+            if self._frame_fd is None:
+                self._frame_fd = create_frame_notifier()
+            pass_fds = (self._frame_fd,) if self._frame_fd is not None else ()
+
             # Find and start worker process
             worker_path = self._find_renderer_executable()
             cmd = self._build_sandbox_command(worker_path)
@@ -190,6 +199,7 @@ class RendererProcess:
                 stdin=subprocess.DEVNULL,
                 stdout=subprocess.DEVNULL,
                 stderr=stderr_file,
+                pass_fds=pass_fds,
             )
 
             # Wait for worker to connect
@@ -336,6 +346,10 @@ class RendererProcess:
         """Get shared memory name for display."""
         return self._config.shm_name
 
+    def get_frame_fd(self) -> Optional[int]:
+        """Get the eventfd signalled after each frame, if any."""
+        return self._frame_fd
+
     def get_socket_path(self) -> str:
         """Get socket path for IPC."""
         return self._config.socket_path
@@ -350,3 +364,6 @@ class RendererProcess:
         """Clean up all resources."""
         self.stop()
         self._state_callbacks.clear()
+        if self._frame_fd is not None:
+            os.close(self._frame_fd)
+            self._frame_fd = None
@@ -48,9 +48,12 @@ class RendererWorker:
 
     # Shared memory header
     SHM_MAGIC = 0x4C424B44  # "LBKD"
-    SHM_VERSION = 1
-    SHM_HEADER_FORMAT = "<IIIIIIQQ"  # magic, version, w, h, stride, format, frame_num, timestamp
+    SHM_VERSION = 3
+    # magic, version, w, h, stride, format, frame_num, timestamp,
+    # dirty x, y, w, h, geometry generation
+    SHM_HEADER_FORMAT = "<IIIIIIQQIIIII"
     SHM_HEADER_SIZE = struct.calcsize(SHM_HEADER_FORMAT)
+    FRAME_SIGNAL = (1).to_bytes(8, "little")  # eventfd increment
 
     def __init__(self, config: dict):
         self._config = config
@@ -59,6 +62,8 @@ class RendererWorker:
         self._library_path = config.get("library_path", "")
         self._socket_path = config.get("socket_path", "")
         self._shm_name = config.get("shm_name", "")
+        # Inherited eventfd signalled after each frame, if any
+        self._frame_fd: Optional[int] = config.get("frame_fd")
 
         self._socket: Optional[socket.socket] = None
         self._lib = None
@@ -66,6 +71,7 @@ class RendererWorker:
         self._shm_fd: Optional[int] = None
         self._shm_mmap: Optional[mmap.mmap] = None
         self._frame_number = 0
+        self._geometry_generation = 0  # bumped on every shm (re)creation
         self._running = True
         self._use_stub = True  # Use stub if native library not available
 
@@ -128,6 +134,7 @@ class RendererWorker:
         stride = self._width * 4  # BGRA
         pixel_size = stride * self._height
         total_size = self.SHM_HEADER_SIZE + pixel_size
+        self._geometry_generation += 1
 
         # Create POSIX shared memory
         shm_path = f"/dev/shm{self._shm_name}"
@@ -153,6 +160,8 @@ class RendererWorker:
                 1,  # BGRA8888
                 0,  # frame_number
                 0,  # timestamp
+                0, 0, self._width, self._height,  # dirty: everything
+                self._geometry_generation,
             )
             self._shm_mmap[:self.SHM_HEADER_SIZE] = header
 
@@ -169,7 +178,12 @@ class RendererWorker:
         self._frame_number += 1
         timestamp_ns = int(time.time() * 1e9)
 
-        # Update header
+        # Write pixels, then the header that announces them
+        expected_size = self._width * self._height * 4
+        pixel_data = pixels[:expected_size] if len(pixels) >= expected_size else pixels
+        self._shm_mmap[self.SHM_HEADER_SIZE:self.SHM_HEADER_SIZE + len(pixel_data)] = pixel_data
+
+        # Update header; every stub frame changes the whole screen
         stride = self._width * 4
         header = struct.pack(
             self.SHM_HEADER_FORMAT,
@@ -181,13 +195,16 @@ class RendererWorker:
             1,  # BGRA8888
             self._frame_number,
             timestamp_ns,
+            0, 0, self._width, self._height,
+            self._geometry_generation,
         )
         self._shm_mmap[:self.SHM_HEADER_SIZE] = header
 
-        # Write pixels
-        expected_size = self._width * self._height * 4
-        pixel_data = pixels[:expected_size] if len(pixels) >= expected_size else pixels
-        self._shm_mmap[self.SHM_HEADER_SIZE:self.SHM_HEADER_SIZE + len(pixel_data)] = pixel_data
+        if self._frame_fd is not None:
+            try:
+                os.write(self._frame_fd, self.FRAME_SIGNAL)
+            except BlockingIOError:
+                pass  # counter saturated; the consumer is already due to wake
 
     def _generate_stub_frame(self) -> bytes:
         """Generate a stub test frame (gradient pattern)."""
@@ -3,22 +3,70 @@ Shared memory display for GPU renderer output.
 
 Provides a fast path for transferring rendered frames from the
 GPU renderer process to the GTK3 display widget.
+
+Each frame's header carries the rectangle it changed, so a consumer
+that saw the previous frame only has to copy the damaged rows, and the
+frame number sits at a fixed offset so an unchanged frame is detected
+without reading the rest of the header. The frame's geometry carries a
+generation number bumped on every (re)creation, so a consumer can keep
+width, height and stride until it changes. A resize recreates the
+region under the same name, so a consumer finds it by checking
+is_replaced() and calling reopen().
+
+A producer can also signal an eventfd after each frame, so the
+consumer sleeps until a frame exists instead of polling on a timer.
 """
 
 import mmap
 import struct
 import os
 import ctypes
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
 from dataclasses import dataclass
 import threading
 
 
 # Shared memory layout constants
 SHM_MAGIC = 0x4C424B44  # "LBKD"
-SHM_VERSION = 1
+SHM_VERSION = 3  # 2: dirty rectangle after the timestamp, 3: geometry generation
 SHM_HEADER_SIZE = 64  # Fixed header size
 
+# eventfd counter increment written once per frame
+_FRAME_SIGNAL = (1).to_bytes(8, "little")
+
+
+def create_frame_notifier() -> Optional[int]:
+    """
+    Create the eventfd a producer signals after each frame.
+
+    Created by the process that spawns the producer, which inherits it.
+
+    Returns:
+        The eventfd, or None where eventfd is unavailable
+    """
+    if not hasattr(os, "eventfd"):
+        return None
+    try:
+        return os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+    except OSError:
+        return None
+
+
+def signal_frame(fd: int) -> None:
+    """Tell the consumer a new frame is in shared memory."""
+    try:
+        os.write(fd, _FRAME_SIGNAL)
+    except BlockingIOError:
+        pass  # counter saturated; the consumer is already due to wake
+
+
+def drain_frame_notifier(fd: int) -> None:
+    """Reset the eventfd counter; any number of signals reads as one."""
+    try:
+        os.read(fd, 8)
+    except BlockingIOError:
+        pass
+
 
 @dataclass
 class ShmHeader:
@@ -31,6 +79,13 @@ class ShmHeader:
     format: int = 1  # BGRA8888
     frame_number: int = 0
     timestamp_ns: int = 0
+    # Region changed since the previous frame
+    dirty_x: int = 0
+    dirty_y: int = 0
+    dirty_width: int = 0
+    dirty_height: int = 0
+    # Bumped whenever width, height or stride change
+    geometry_generation: int = 0
 
 
 class SharedMemoryDisplay:
@@ -41,8 +96,17 @@ class SharedMemoryDisplay:
     to the GTK3 display widget without copying.
     """
 
-    HEADER_FORMAT = "<IIIIIIQQ"  # magic, version, w, h, stride, format, frame_num, timestamp
+    # magic, version, w, h, stride, format, frame_num, timestamp,
+    # dirty x, y, w, h, geometry generation
+    HEADER_FORMAT = "<IIIIIIQQIIIII"
     HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    FRAME_NUMBER_OFFSET = 24
+
+    _HEADER_STRUCT = struct.Struct(HEADER_FORMAT)
+    _FRAME_NUMBER_STRUCT = struct.Struct("<Q")
+    # Per-frame part of the header, from FRAME_NUMBER_OFFSET: frame_num,
+    # (timestamp skipped), dirty x, y, w, h, geometry generation
+    _FRAME_STATE_STRUCT = struct.Struct("<Q8xIIIII")
 
     def __init__(self, name: str = "/linblock_display"):
         self._name = name
@@ -54,6 +118,10 @@ class SharedMemoryDisplay:
         self._frame_callback: Optional[Callable] = None
         self._lock = threading.Lock()
         self._last_frame_number = 0
+        self._notify_fd: Optional[int] = None
+        self._geometry_generation = 0
+        # Only the creator unlinks the region
+        self._owner = False
 
     def create(self, width: int, height: int) -> None:
         """Create shared memory region for display.
@@ -64,6 +132,7 @@ class SharedMemoryDisplay:
         """
         self._width = width
         self._height = height
+        self._geometry_generation += 1
         stride = width * 4  # BGRA
         pixel_size = stride * height
         self._size = self.HEADER_SIZE + pixel_size
@@ -81,6 +150,7 @@ class SharedMemoryDisplay:
                 os.O_CREAT | os.O_RDWR,
                 0o600
             )
+            self._owner = True
             os.ftruncate(self._fd, self._size)
 
             self._mmap = mmap.mmap(self._fd, self._size)
@@ -96,6 +166,8 @@ class SharedMemoryDisplay:
                 1,  # BGRA8888
                 0,  # frame_number
                 0,  # timestamp
+                0, 0, width, height,  # dirty: everything
+                self._geometry_generation,
             )
             self._mmap[:self.HEADER_SIZE] = header
 
@@ -130,41 +202,76 @@ class SharedMemoryDisplay:
             self.cleanup()
             raise RuntimeError(f"Failed to open shared memory: {e}")
 
-    def write_frame(self, pixels: bytes, frame_number: int, timestamp_ns: int = 0) -> None:
+    def write_frame(
+        self,
+        pixels: bytes,
+        frame_number: int,
+        timestamp_ns: int = 0,
+        dirty: Optional[Tuple[int, int, int, int]] = None,
+    ) -> None:
         """Write a frame to shared memory (producer side).
 
         Args:
             pixels: Raw pixel data (BGRA format)
             frame_number: Frame sequence number
             timestamp_ns: Frame timestamp in nanoseconds
+            dirty: (x, y, width, height) changed since the previous
+                frame; only those rows are copied. Defaults to the
+                whole frame.
         """
         if not self._mmap:
             raise RuntimeError("Shared memory not initialized")
 
+        width, height = self._width, self._height
+        if dirty is None:
+            dirty = (0, 0, width, height)
+        x, y, w, h = dirty
+        # Clip to the frame
+        x, y = min(x, width), min(y, height)
+        w, h = min(w, width - x), min(h, height - y)
+
         with self._lock:
+            # Write pixels first, so a reader that sees the new frame
+            # number finds the new rows in place
+            stride = width * 4
+            expected_size = stride * height
+            if len(pixels) >= expected_size:
+                start = y * stride
+                end = start + h * stride
+                pixel_offset = self.HEADER_SIZE
+                self._mmap[pixel_offset + start:pixel_offset + end] = (
+                    memoryview(pixels)[start:end]
+                )
+
             # Update header
-            header = struct.pack(
-                self.HEADER_FORMAT,
+            self._HEADER_STRUCT.pack_into(
+                self._mmap, 0,
                 SHM_MAGIC,
                 SHM_VERSION,
-                self._width,
-                self._height,
-                self._width * 4,
+                width,
+                height,
+                stride,
                 1,  # BGRA8888
                 frame_number,
                 timestamp_ns,
+                x, y, w, h,
+                self._geometry_generation,
             )
-            self._mmap[:self.HEADER_SIZE] = header
 
-            # Write pixels
-            pixel_offset = self.HEADER_SIZE
-            expected_size = self._width * self._height * 4
-            if len(pixels) >= expected_size:
-                self._mmap[pixel_offset:pixel_offset + expected_size] = pixels[:expected_size]
+        if self._notify_fd is not None:
+            signal_frame(self._notify_fd)
+
+    def set_frame_notifier(self, fd: Optional[int]) -> None:
+        """Signal fd (see create_frame_notifier) after each written frame."""
+        self._notify_fd = fd
 
     def read_frame(self) -> Optional[tuple]:
         """Read a frame from shared memory (consumer side).
 
+        The pixels are a read-only view into shared memory, not a copy;
+        they reflect later frames and keep the mapping alive, so copy
+        them to keep a frame.
+
         Returns:
             Tuple of (width, height, frame_number, timestamp_ns, pixels) or None
         """
@@ -172,11 +279,7 @@ class SharedMemoryDisplay:
             return None
 
         with self._lock:
-            # Read header
-            header = struct.unpack(
-                self.HEADER_FORMAT,
-                self._mmap[:self.HEADER_SIZE]
-            )
+            header = self._HEADER_STRUCT.unpack_from(self._mmap, 0)
 
             if header[0] != SHM_MAGIC:
                 return None
@@ -192,17 +295,70 @@ class SharedMemoryDisplay:
 
             self._last_frame_number = frame_number
 
-            # Read pixels
-            pixel_offset = self.HEADER_SIZE
-            pixel_size = width * height * 4
-            pixels = bytes(self._mmap[pixel_offset:pixel_offset + pixel_size])
-
+            pixels = self.pixel_rows(0, height, header[4])
             return (width, height, frame_number, timestamp_ns, pixels)
 
+    def peek_frame_number(self) -> Optional[int]:
+        """Read only the frame number, to cheaply check for a new frame."""
+        if not self._mmap:
+            return None
+        return self._FRAME_NUMBER_STRUCT.unpack_from(
+            self._mmap, self.FRAME_NUMBER_OFFSET
+        )[0]
+
+    def read_frame_state(self) -> Optional[Tuple[int, int, int, int, int, int]]:
+        """Read the per-frame header fields in one unpack.
+
+        Returns:
+            (frame_number, dirty_x, dirty_y, dirty_width, dirty_height,
+            geometry_generation), or None if not open
+        """
+        if not self._mmap:
+            return None
+        return self._FRAME_STATE_STRUCT.unpack_from(
+            self._mmap, self.FRAME_NUMBER_OFFSET
+        )
+
+    def read_header(self) -> Optional[ShmHeader]:
+        """Read the frame header without touching pixel memory.
+
+        Returns:
+            The header, or None if the region is not a display region
+        """
+        if not self._mmap:
+            return None
+        header = ShmHeader(*self._HEADER_STRUCT.unpack_from(self._mmap, 0))
+        if header.magic != SHM_MAGIC:
+            return None
+        self._last_frame_number = header.frame_number
+        return header
+
+    def pixel_rows(self, y: int, count: int, stride: int) -> memoryview:
+        """Return a read-only view of count pixel rows starting at row y.
+
+        The view points into shared memory; it reflects later frames.
+        """
+        start = self.HEADER_SIZE + y * stride
+        return memoryview(self._mmap)[start:start + count * stride].toreadonly()
+
     def get_dimensions(self) -> tuple:
         """Get current display dimensions."""
         return (self._width, self._height)
 
+    def is_replaced(self) -> bool:
+        """Check whether the region was recreated (e.g. resized) since open()."""
+        if self._fd is None:
+            return False
+        try:
+            return os.stat(f"/dev/shm{self._name}").st_ino != os.fstat(self._fd).st_ino
+        except FileNotFoundError:
+            return False  # between unlink and re-create; look again later
+
+    def reopen(self) -> None:
+        """Map the region now under this name (consumer side)."""
+        self.cleanup()
+        self.open()
+
     def resize(self, width: int, height: int) -> None:
         """Resize the shared memory region."""
         self.cleanup()
@@ -213,16 +369,24 @@ class SharedMemoryDisplay:
         self._frame_callback = callback
 
     def cleanup(self) -> None:
-        """Clean up shared memory resources."""
+        """Clean up shared memory resources.
+
+        The region itself is removed only by the side that created it.
+        """
         if self._mmap:
-            self._mmap.close()
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # a pixel_rows() view is still alive; unmapped with it
             self._mmap = None
 
         if self._fd is not None:
             os.close(self._fd)
             self._fd = None
 
-        try:
-            os.unlink(f"/dev/shm{self._name}")
-        except FileNotFoundError:
-            pass
+        if self._owner:
+            self._owner = False
+            try:
+                os.unlink(f"/dev/shm{self._name}")
+            except FileNotFoundError:
+                pass
@@ -21,7 +21,7 @@ class TestSharedMemoryFrameSourceUnit:
             from src.modules.emulation.gpu_renderer.gtk_integration import SharedMemoryFrameSource
             source = SharedMemoryFrameSource("/test_shm")
             assert source._target_fps == 60
-            assert source._poll_interval_ms == 16  # ~60fps
+            assert source._period_ns == 16_666_666  # 60fps
 
     def test_init_custom_fps(self):
         """Frame source accepts custom FPS."""
@@ -29,7 +29,7 @@ class TestSharedMemoryFrameSourceUnit:
             from src.modules.emulation.gpu_renderer.gtk_integration import SharedMemoryFrameSource
             source = SharedMemoryFrameSource("/test_shm", target_fps=30)
             assert source._target_fps == 30
-            assert source._poll_interval_ms == 33  # ~30fps
+            assert source._period_ns == 33_333_333  # 30fps
 
     def test_get_shm_name(self):
         """Frame source returns shm name."""
@@ -38,6 +38,30 @@ class TestSharedMemoryFrameSourceUnit:
             source = SharedMemoryFrameSource("/linblock_display_123")
             assert source.get_shm_name() == "/linblock_display_123"
 
+    def test_poll_timeouts_track_deadlines(self):
+        """Each poll timeout is aimed at the next absolute deadline."""
+        with patch.dict('sys.modules', {'gi': MagicMock(), 'gi.repository': MagicMock()}):
+            from src.modules.emulation.gpu_renderer.gtk_integration import SharedMemoryFrameSource
+            source = SharedMemoryFrameSource("/test_shm", target_fps=60)
+
+        glib = MagicMock()
+        with patch('src.modules.emulation.gpu_renderer.gtk_integration.GLib', glib), \
+                patch('time.monotonic_ns') as monotonic_ns, \
+                patch.object(source, '_poll_frame', return_value=True):
+            source._next_deadline_ns = 0
+            delays = []
+            # Timeouts fire up to a millisecond late; the error must not add up
+            for now_ns in (0, 17_000_000, 34_000_000, 50_500_000):
+                monotonic_ns.return_value = now_ns
+                if now_ns:
+                    assert source._on_poll_timeout() is False
+                else:
+                    source._schedule_poll()
+                delays.append(glib.timeout_add.call_args[0][0])
+
+        assert delays == [16, 16, 15, 16]
+        assert source._next_deadline_ns == 4 * source._period_ns
+
     def test_initial_state(self):
         """Frame source starts not running."""
         with patch.dict('sys.modules', {'gi': MagicMock(), 'gi.repository': MagicMock()}):
@@ -141,6 +165,191 @@ class TestSharedMemoryIntegration:
 
         consumer.cleanup()
 
+    def test_dirty_rect_write_copies_only_changed_rows(self, shm_display):
+        """Producer copies only the dirty rows and records the rectangle."""
+        from src.modules.emulation.gpu_renderer.internal.shm_display import SharedMemoryDisplay
+
+        shm_display.write_frame(bytes(100 * 100 * 4), 1, 1000)
+        shm_display.write_frame(b"\xff" * (100 * 100 * 4), 2, 2000,
+                                dirty=(10, 20, 30, 5))
+
+        consumer = SharedMemoryDisplay(shm_display._name)
+        consumer.open()
+
+        assert consumer.peek_frame_number() == 2
+        header = consumer.read_header()
+        assert (header.dirty_x, header.dirty_y,
+                header.dirty_width, header.dirty_height) == (10, 20, 30, 5)
+        stride = header.stride
+        assert bytes(consumer.pixel_rows(19, 1, stride)) == bytes(stride)
+        assert bytes(consumer.pixel_rows(20, 5, stride)) == b"\xff" * (5 * stride)
+        assert bytes(consumer.pixel_rows(25, 1, stride)) == bytes(stride)
+
+    def test_frame_source_delivers_dirty_region(self, shm_display):
+        """Frame source skips unchanged frames and sends only the dirty rows."""
+        from src.modules.emulation.gpu_renderer.internal.shm_display import SharedMemoryDisplay
+
+        with patch.dict('sys.modules', {'gi': MagicMock(), 'gi.repository': MagicMock()}):
+            from src.modules.emulation.gpu_renderer.gtk_integration import SharedMemoryFrameSource
+            source = SharedMemoryFrameSource(shm_display._name)
+
+        consumer = SharedMemoryDisplay(shm_display._name)
+        consumer.open()
+        widget = Mock()
+        source.attach(widget)
+        source._shm = consumer
+        source._running = True
+
+        pixels = bytes(100 * 100 * 4)
+        shm_display.write_frame(pixels, 1, 1000)
+        assert source._poll_frame()
+        widget.set_framebuffer.assert_called_once()
+        assert len(widget.set_framebuffer.call_args[0][0]) == len(pixels)
+
+        # Unchanged frame number: nothing delivered
+        assert source._poll_frame()
+        assert widget.set_framebuffer.call_count == 1
+        widget.set_framebuffer_region.assert_not_called()
+
+        shm_display.write_frame(pixels, 2, 2000, dirty=(0, 50, 100, 2))
+        source._poll_frame()
+        rows, x, y, width, height = widget.set_framebuffer_region.call_args[0]
+        assert (x, y, width, height) == (0, 50, 100, 2)
+        assert len(rows) == 2 * 100 * 4
+
+        # Frames written between polls are coalesced into one full update
+        shm_display.write_frame(pixels, 3, 3000, dirty=(0, 0, 1, 1))
+        shm_display.write_frame(pixels, 4, 4000, dirty=(0, 0, 1, 1))
+        source._poll_frame()
+        assert widget.set_framebuffer.call_count == 2
+        assert source.get_dropped_frames() == 1
+
+    def test_fps_counts_frames_per_window(self, shm_display):
+        """FPS is measured over one-second monotonic windows."""
+        from src.modules.emulation.gpu_renderer.internal.shm_display import SharedMemoryDisplay
+
+        with patch.dict('sys.modules', {'gi': MagicMock(), 'gi.repository': MagicMock()}):
+            from src.modules.emulation.gpu_renderer.gtk_integration import SharedMemoryFrameSource
+            source = SharedMemoryFrameSource(shm_display._name)
+
+        consumer = SharedMemoryDisplay(shm_display._name)
+        consumer.open()
+        source.attach(Mock())
+        source._shm = consumer
+        source._running = True
+
+        pixels = bytes(100 * 100 * 4)
+        with patch('time.monotonic_ns') as monotonic_ns:
+            source._window_start_ns = 0
+            for frame_number, now_ns in enumerate((250_000_000, 500_000_000,
+                                                   1_000_000_000), start=1):
+                monotonic_ns.return_value = now_ns
+                shm_display.write_frame(pixels, frame_number)
+                source._poll_frame()
+                if now_ns < 1_000_000_000:
+                    assert source.get_fps() == 0.0
+
+        assert source.get_fps() == pytest.approx(3.0)
+        assert source._frame_count == 0
+
+    def test_frame_source_caches_geometry(self, shm_display):
+        """Frame source re-reads the full header only when the geometry generation changes."""
+        from src.modules.emulation.gpu_renderer.internal.shm_display import SharedMemoryDisplay
+
+        with patch.dict('sys.modules', {'gi': MagicMock(), 'gi.repository': MagicMock()}):
+            from src.modules.emulation.gpu_renderer.gtk_integration import SharedMemoryFrameSource
+            source = SharedMemoryFrameSource(shm_display._name)
+
+        consumer = SharedMemoryDisplay(shm_display._name)
+        consumer.open()
+        source.attach(Mock())
+        source._shm = consumer
+        source._running = True
+
+        pixels = bytes(100 * 100 * 4)
+        with patch.object(consumer, 'read_header', wraps=consumer.read_header) as read_header:
+            for frame_number in (1, 2, 3):
+                shm_display.write_frame(pixels, frame_number, dirty=(0, 0, 100, 1))
+                source._poll_frame()
+            assert read_header.call_count == 1
+        assert source._cached_geom == (shm_display._geometry_generation, 100, 100, 400)
+
+    def test_frame_source_follows_resize(self, shm_display):
+        """After the producer resizes (recreating the region) the source remaps it."""
+        from src.modules.emulation.gpu_renderer.internal.shm_display import SharedMemoryDisplay
+
+        with patch.dict('sys.modules', {'gi': MagicMock(), 'gi.repository': MagicMock()}):
+            from src.modules.emulation.gpu_renderer.gtk_integration import SharedMemoryFrameSource
+            source = SharedMemoryFrameSource(shm_display._name)
+
+        consumer = SharedMemoryDisplay(shm_display._name)
+        consumer.open()
+        widget = Mock()
+        source.attach(widget)
+        source._shm = consumer
+        source._running = True
+
+        shm_display.write_frame(bytes(100 * 100 * 4), 1)
+        source._poll_frame()
+
+        shm_display.resize(50, 40)
+        shm_display.write_frame(bytes(50 * 40 * 4), 1, dirty=(0, 0, 1, 1))
+        assert consumer.is_replaced()
+        source._next_replaced_check_ns = 0
+        source._poll_frame()
+
+        args = widget.set_framebuffer.call_args[0]
+        assert args[1:3] == (50, 40)
+        assert len(args[0]) == 50 * 40 * 4
+        assert source._cached_geom == (shm_display._geometry_generation, 50, 40, 200)
+        assert not consumer.is_replaced()
+        consumer.cleanup()
+
+    def test_frame_source_copies_frames_off_main_loop(self, shm_display):
+        """With a frame fd, a copy thread snapshots frames and hands them over via idle_add."""
+        from src.modules.emulation.gpu_renderer.internal.shm_display import create_frame_notifier
+
+        frame_fd = create_frame_notifier()
+        if frame_fd is None:
+            pytest.skip("eventfd not available")
+
+        glib = MagicMock()
+        idle_calls = []
+        glib.idle_add.side_effect = lambda func, *args: idle_calls.append((func, args))
+        try:
+            with patch.dict('sys.modules', {'gi': MagicMock(), 'gi.repository': MagicMock()}):
+                from src.modules.emulation.gpu_renderer.gtk_integration import (
+                    SharedMemoryFrameSource,
+                )
+                source = SharedMemoryFrameSource(shm_display._name, frame_fd=frame_fd)
+                with patch('src.modules.emulation.gpu_renderer.gtk_integration.GLib', glib):
+                    widget = Mock()
+                    source.attach(widget)
+                    assert source.start()
+                    glib.timeout_add.assert_not_called()
+
+                    shm_display.set_frame_notifier(frame_fd)
+                    pixels = bytes(i % 256 for i in range(100 * 100 * 4))
+                    shm_display.write_frame(pixels, 1, 1000)
+
+                    deadline = time.monotonic() + 2.0
+                    while not idle_calls and time.monotonic() < deadline:
+                        time.sleep(0.01)
+                    assert len(idle_calls) == 1
+
+                    # The GTK side receives a snapshot, not shared memory
+                    func, args = idle_calls.pop()
+                    assert func(*args) is False
+                    snapshot = widget.set_framebuffer.call_args[0][0]
+                    assert isinstance(snapshot, memoryview)
+                    assert bytes(snapshot) == pixels
+                    assert snapshot.obj in source._buffers
+
+                    source.stop()
+                    assert source._copy_thread is None
+        finally:
+            os.close(frame_fd)
+
 
 class TestFactoryFunction:
     """Test factory function for GTK integration."""
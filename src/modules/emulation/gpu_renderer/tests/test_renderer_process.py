@@ -15,7 +15,11 @@ from ..internal.renderer_process import (
     RendererProcessError,
     ProcessState,
 )
-from ..internal.shm_display import SharedMemoryDisplay
+from ..internal.shm_display import (
+    SharedMemoryDisplay,
+    create_frame_notifier,
+    drain_frame_notifier,
+)
 
 
 class TestRendererProcessConfig:
@@ -207,6 +211,18 @@ class TestRendererProcessIntegration:
 
         shm.cleanup()
 
+    def test_worker_signals_frame_fd(self, running_process):
+        """Worker signals the frame eventfd after writing a frame."""
+        frame_fd = running_process.get_frame_fd()
+        if frame_fd is None:
+            pytest.skip("eventfd not available")
+
+        drain_frame_notifier(frame_fd)
+        running_process.process_commands(b"\x00" * 100)
+
+        count = int.from_bytes(os.read(frame_fd, 8), "little")
+        assert count >= 1
+
 
 class TestSharedMemoryDisplay:
     """Tests for shared memory display transport."""
@@ -244,10 +260,42 @@ class TestSharedMemoryDisplay:
         assert height == 100
         assert frame_num == 1
         assert timestamp == 12345
+        assert isinstance(read_pixels, memoryview)
         assert read_pixels == pixels
 
         shm2.cleanup()
 
+    def test_consumer_cleanup_keeps_region(self, shm):
+        """Only the creating side removes the shared memory file."""
+        shm.create(10, 10)
+        shm.write_frame(bytes(10 * 10 * 4), 1)
+        shm_path = f"/dev/shm{shm._name}"
+
+        consumer = SharedMemoryDisplay(shm._name)
+        consumer.open()
+        pixels = consumer.read_frame()[4]
+        consumer.cleanup()
+        del pixels
+
+        assert os.path.exists(shm_path)
+
+    def test_write_frame_signals_notifier(self, shm):
+        """Writing a frame signals the frame notifier once per frame."""
+        frame_fd = create_frame_notifier()
+        if frame_fd is None:
+            pytest.skip("eventfd not available")
+        try:
+            shm.create(10, 10)
+            shm.set_frame_notifier(frame_fd)
+            with pytest.raises(BlockingIOError):
+                os.read(frame_fd, 8)
+
+            shm.write_frame(bytes(10 * 10 * 4), 1)
+            shm.write_frame(bytes(10 * 10 * 4), 2)
+            assert int.from_bytes(os.read(frame_fd, 8), "little") == 2
+        finally:
+            os.close(frame_fd)
+
     def test_resize_recreates_memory(self, shm):
         """Resize recreates shared memory."""
         shm.create(100, 100)
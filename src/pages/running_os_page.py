@@ -198,7 +198,13 @@ class RunningOSPage(Gtk.Box):
         try:
             from modules.emulation.gpu_renderer.gtk_integration import SharedMemoryFrameSource
 
-            self._frame_source = SharedMemoryFrameSource(shm_name, target_fps=60)
+            frame_fd = None
+            if hasattr(self._gpu_renderer, 'get_frame_fd'):
+                frame_fd = self._gpu_renderer.get_frame_fd()
+
+            self._frame_source = SharedMemoryFrameSource(
+                shm_name, target_fps=60, frame_fd=frame_fd
+            )
             self._frame_source.attach(self.display)
             self._frame_source.set_frame_callback(self._on_shm_frame)
 
@@ -1,11 +1,46 @@
 """Emulator display widget - renders Android framebuffer."""
 
+import sys
+
 import gi
 gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, GdkPixbuf, GLib
+from gi.repository import Gtk, Gdk, GLib
 import cairo
 
 
+# Byte offsets of R, G and B within a source pixel, and its size
+_RGB_LAYOUTS = {
+    "bgra": (2, 1, 0, 4),
+    "rgba": (0, 1, 2, 4),
+    "bgr": (2, 1, 0, 3),
+    "rgb": (0, 1, 2, 3),
+}
+
+# Cairo RGB24 pixels are native-endian 32-bit xRGB words
+if sys.byteorder == "little":
+    _SURFACE_LAYOUT = (2, 1, 0, 4)
+else:
+    _SURFACE_LAYOUT = (1, 2, 3, 4)
+
+
+def _swizzle_to_surface(dst, offset, src, layout):
+    """Convert src pixels to cairo RGB24 in dst starting at offset.
+
+    Each channel moves with one strided slice assignment, so the copy
+    runs in C rather than a Python loop per pixel. Sources already in
+    the surface layout are copied straight across.
+    """
+    r, g, b, bpp = layout
+    end = offset + len(src) // bpp * 4
+    if layout == _SURFACE_LAYOUT:
+        dst[offset:end] = src[:end - offset]
+        return
+    dr, dg, db, _ = _SURFACE_LAYOUT
+    dst[offset + dr:end:4] = src[r::bpp]
+    dst[offset + dg:end:4] = src[g::bpp]
+    dst[offset + db:end:4] = src[b::bpp]
+
+
 class EmulatorDisplay(Gtk.DrawingArea):
     """Widget that displays the Android emulator screen.
 
@@ -31,8 +66,8 @@ class EmulatorDisplay(Gtk.DrawingArea):
         self.connect("key-press-event", self._on_key_press)
         self.connect("key-release-event", self._on_key_release)
 
-        self._framebuffer = None
-        self._pixbuf = None
+        self._surface = None
+        self._pixels = None  # RGB24 copy of the current frame, behind _surface
         self._display_width = 1080
         self._display_height = 1920
         self._scale = 0.5  # Default scale for better legibility
@@ -71,12 +106,19 @@ class EmulatorDisplay(Gtk.DrawingArea):
         # Store for coordinate translation
         self._phone_rect = (x, y, phone_w, phone_h)
 
-        if self._pixbuf is not None:
-            # Draw actual framebuffer
-            scaled = self._pixbuf.scale_simple(phone_w, phone_h, GdkPixbuf.InterpType.BILINEAR)
-            Gdk.cairo_set_source_pixbuf(cr, scaled, x, y)
-            cr.rectangle(x, y, phone_w, phone_h)
+        if self._surface is not None:
+            # Draw actual framebuffer, scaled by cairo straight from _pixels
+            cr.save()
+            cr.translate(x, y)
+            cr.scale(
+                phone_w / self._surface.get_width(),
+                phone_h / self._surface.get_height(),
+            )
+            cr.set_source_surface(self._surface, 0, 0)
+            cr.get_source().set_filter(cairo.FILTER_BILINEAR)
+            cr.rectangle(0, 0, self._surface.get_width(), self._surface.get_height())
             cr.fill()
+            cr.restore()
         else:
             # Phone screen area placeholder (#181825 - sidebar color)
             cr.set_source_rgb(0.094, 0.094, 0.145)
@@ -90,7 +132,7 @@ class EmulatorDisplay(Gtk.DrawingArea):
         cr.stroke()
 
         # Status or placeholder text
-        if self._status_text or self._pixbuf is None:
+        if self._status_text or self._surface is None:
             cr.set_source_rgb(0.651, 0.706, 0.957)  # #a6adc8 dim-label color
             cr.select_font_face("sans-serif", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
             cr.set_font_size(14)
@@ -165,65 +207,91 @@ class EmulatorDisplay(Gtk.DrawingArea):
             height: Frame height in pixels
             format: Pixel format - "bgra", "rgba", "rgb", or "bgr"
         """
-        self._framebuffer = data
         self._display_width = width
         self._display_height = height
         self._format = format
 
         if data and len(data) > 0:
             try:
-                # Convert to RGB for GdkPixbuf
-                if format == "bgra":
-                    # BGRA to RGB conversion
-                    rgb_data = bytearray(width * height * 3)
-                    for i in range(width * height):
-                        src_idx = i * 4
-                        dst_idx = i * 3
-                        rgb_data[dst_idx] = data[src_idx + 2]      # R
-                        rgb_data[dst_idx + 1] = data[src_idx + 1]  # G
-                        rgb_data[dst_idx + 2] = data[src_idx]      # B
-                    rgb_data = bytes(rgb_data)
-                elif format == "rgba":
-                    # RGBA to RGB conversion
-                    rgb_data = bytearray(width * height * 3)
-                    for i in range(width * height):
-                        src_idx = i * 4
-                        dst_idx = i * 3
-                        rgb_data[dst_idx] = data[src_idx]          # R
-                        rgb_data[dst_idx + 1] = data[src_idx + 1]  # G
-                        rgb_data[dst_idx + 2] = data[src_idx + 2]  # B
-                    rgb_data = bytes(rgb_data)
-                elif format == "bgr":
-                    # BGR to RGB conversion
-                    rgb_data = bytearray(width * height * 3)
-                    for i in range(width * height):
-                        src_idx = i * 3
-                        dst_idx = i * 3
-                        rgb_data[dst_idx] = data[src_idx + 2]      # R
-                        rgb_data[dst_idx + 1] = data[src_idx + 1]  # G
-                        rgb_data[dst_idx + 2] = data[src_idx]      # B
-                    rgb_data = bytes(rgb_data)
-                else:
-                    # Assume RGB
-                    rgb_data = data
-
-                # Create pixbuf from RGB data
-                self._pixbuf = GdkPixbuf.Pixbuf.new_from_data(
-                    rgb_data,
-                    GdkPixbuf.Colorspace.RGB,
-                    False,  # no alpha
-                    8,      # bits per sample
-                    width,
-                    height,
-                    width * 3,  # rowstride
+                # Unknown formats are assumed to be RGB
+                layout = _RGB_LAYOUTS.get(format, _RGB_LAYOUTS["rgb"])
+                self._ensure_surface(width, height)
+                self._surface.flush()
+                _swizzle_to_surface(
+                    self._pixels, 0, memoryview(data)[:width * height * layout[3]], layout
                 )
+                self._surface.mark_dirty()
 
             except Exception as e:
                 print(f"Framebuffer conversion error: {e}")
-                self._pixbuf = None
+                self._surface = None
+                self._pixels = None
 
         self.queue_draw()
 
+    def set_framebuffer_region(self, rows, x, y, width, height, format="bgra"):
+        """Update only the part of the display that changed.
+
+        Needs a full frame of the same size from set_framebuffer() first;
+        without one the update is ignored.
+
+        Args:
+            rows: Raw pixel data for the full-width frame rows
+                y to y + height
+            x: Left edge of the changed rectangle
+            y: Top edge of the changed rectangle
+            width: Rectangle width in pixels
+            height: Rectangle height in pixels
+            format: Pixel format of rows - "bgra", "rgba", or "bgr"
+        """
+        layout = _RGB_LAYOUTS.get(format)
+        if self._surface is None or layout is None or width <= 0 or height <= 0:
+            return
+        pixels = self._pixels
+        bpp = layout[3]
+
+        frame_width = self._display_width
+        rows = memoryview(rows)
+        try:
+            self._surface.flush()
+            if x == 0 and width == frame_width:
+                # Whole rows in one go
+                _swizzle_to_surface(
+                    pixels, y * frame_width * 4, rows[:width * height * bpp], layout
+                )
+            else:
+                src_stride = frame_width * bpp
+                for row in range(height):
+                    src = row * src_stride + x * bpp
+                    _swizzle_to_surface(
+                        pixels, ((y + row) * frame_width + x) * 4,
+                        rows[src:src + width * bpp], layout
+                    )
+            self._surface.mark_dirty_rectangle(x, y, width, height)
+        except Exception as e:
+            print(f"Framebuffer conversion error: {e}")
+            return
+
+        self.queue_draw()
+
+    def _ensure_surface(self, width, height):
+        """Keep one image surface per frame size, over our own pixel buffer.
+
+        Updates write into _pixels in place; cairo reads it directly when
+        drawing, so no per-frame image object is built.
+        """
+        surface = self._surface
+        if surface is not None and (
+            surface.get_width() == width and surface.get_height() == height
+        ):
+            return
+        stride = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_RGB24, width)
+        self._surface = None
+        self._pixels = bytearray(stride * height)
+        self._surface = cairo.ImageSurface.create_for_data(
+            self._pixels, cairo.FORMAT_RGB24, width, height, stride
+        )
+
     def set_touch_callback(self, callback):
         """Set callback for touch/mouse events.
 
@@ -241,7 +309,7 @@ class EmulatorDisplay(Gtk.DrawingArea):
 
     def clear(self):
         """Clear the display."""
-        self._framebuffer = None
-        self._pixbuf = None
+        self._surface = None
+        self._pixels = None
         self._status_text = ""
         self.queue_draw()